@@ -4,8 +4,10 @@
 # isort: skip_file
 
 from __future__ import annotations
+import importlib
 import sys
 import warnings
+from typing import TYPE_CHECKING, Any
 from functools import partial
 from toolz import compose
 from aenum import constant
@@ -27,7 +29,6 @@ from gdsfactory.component import (
 )
 from gdsfactory.config import CONF, PATH, __version__
 from gdsfactory.port import Port
-from gdsfactory.read.import_gds import import_gds
 from gdsfactory.cross_section import (
     ComponentAlongPath,
     CrossSection,
@@ -40,20 +41,10 @@ from gdsfactory.boolean import boolean
 
 from gdsfactory import cross_section
 from gdsfactory import port
-from gdsfactory import components
-from gdsfactory import containers
-from gdsfactory import labels
 from gdsfactory import typings
 from gdsfactory import path
 from gdsfactory import snap
-from gdsfactory import read
-from gdsfactory import add_ports
-from gdsfactory import write_cells
-from gdsfactory import add_pins
 from gdsfactory import technology
-from gdsfactory import routing
-from gdsfactory import export
-from gdsfactory import functions
 
 from gdsfactory.add_padding import (
     add_padding,
@@ -76,9 +67,56 @@ from gdsfactory.pdk import (
 from gdsfactory.get_factories import get_cells
 from gdsfactory.grid import grid, grid_with_text
 
-c = components
+if TYPE_CHECKING:
+    from gdsfactory import components
+    from gdsfactory import containers
+    from gdsfactory import labels
+    from gdsfactory import read
+    from gdsfactory import add_ports
+    from gdsfactory import write_cells
+    from gdsfactory import add_pins
+    from gdsfactory import routing
+    from gdsfactory import export
+    from gdsfactory import functions
+    from gdsfactory.read.import_gds import import_gds
+
+    c = components
+
 Region = kdb.Region
 
+# Heavy subpackages are imported on first attribute access (PEP 562).
+_lazy_imports: dict[str, tuple[str, str | None]] = {
+    "components": ("gdsfactory.components", None),
+    "c": ("gdsfactory.components", None),
+    "containers": ("gdsfactory.containers", None),
+    "labels": ("gdsfactory.labels", None),
+    "read": ("gdsfactory.read", None),
+    "add_ports": ("gdsfactory.add_ports", None),
+    "write_cells": ("gdsfactory.write_cells", None),
+    "add_pins": ("gdsfactory.add_pins", None),
+    "routing": ("gdsfactory.routing", None),
+    "export": ("gdsfactory.export", None),
+    "functions": ("gdsfactory.functions", None),
+    "import_gds": ("gdsfactory.read.import_gds", "import_gds"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    """Imports lazy subpackages and attributes on first access."""
+    if name not in _lazy_imports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _lazy_imports[name]
+    value = importlib.import_module(module_name)
+    if attribute is not None:
+        value = getattr(value, attribute)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
 # Check Python version and issue a warning if using Python 3.10
 if sys.version_info[:2] == (3, 10):
     warnings.warn(
@@ -11,6 +11,9 @@ from kfactory.conf import CheckInstances
 from kfactory.serialization import clean_name
 from kfactory.typings import MetaData
 
+from gdsfactory.cell_cache import with_cell_cache
+from gdsfactory.config import CONF
+
 if TYPE_CHECKING:
     from gdsfactory.component import Component, ComponentAllAngle
 
@@ -51,6 +54,7 @@ def cell(
     debug_names: bool | None = None,
     tags: list[str] | None = None,
     with_module_name: bool = False,
+    persistent_cache: bool | None = None,
 ) -> Callable[[ComponentFunc[ComponentParams]], ComponentFunc[ComponentParams]]: ...
 
 
@@ -75,11 +79,18 @@ def cell(
     debug_names: bool | None = None,
     tags: list[str] | None = None,
     with_module_name: bool = False,
+    persistent_cache: bool | None = None,
 ) -> (
     ComponentFunc[ComponentParams]
     | Callable[[ComponentFunc[ComponentParams]], ComponentFunc[ComponentParams]]
 ):
-    """Decorator to convert a function into a Component."""
+    """Decorator to convert a function into a Component.
+
+    Set persistent_cache (or CONF.cell_persistent_cache when None) to load
+    and store the cells from the on-disk cache in gdsfactory.cell_cache.
+    CONF.cell_persistent_cache only applies to cell functions decorated after
+    it is enabled.
+    """
     from gdsfactory import component
 
     if with_module_name and _func is not None:
@@ -92,8 +103,35 @@ def cell(
         drop_params = ["self", "cls"]
     if post_process is None:
         post_process = []
+
+    if _func is None:
+        return partial(
+            cell,
+            set_settings=set_settings,
+            set_name=set_name,
+            check_ports=check_ports,
+            check_instances=check_instances,
+            snap_ports=snap_ports,
+            add_port_layers=add_port_layers,
+            cache=cache,
+            basename=basename,
+            drop_params=drop_params,
+            register_factory=register_factory,
+            overwrite_existing=overwrite_existing,
+            layout_cache=layout_cache,
+            info=info,
+            post_process=post_process,
+            debug_names=debug_names,
+            tags=tags,
+            persistent_cache=persistent_cache,
+        )
+
+    if persistent_cache is None:
+        persistent_cache = CONF.cell_persistent_cache
+    # cached cells are stored unnamed and renamed by the decorator when loaded
+    func = with_cell_cache(_func) if persistent_cache and set_name else _func
     c = _cell(  # type: ignore[call-overload,misc]
-        _func,
+        func,
         output_type=component.Component,
         set_settings=set_settings,
         set_name=set_name,
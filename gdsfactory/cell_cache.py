@@ -0,0 +1,417 @@
+"""Persistent on-disk cache for cells built with @gf.cell.
+
+The cache is opt-in. Enable it for a single cell function with
+``@gf.cell(persistent_cache=True)``, or for every cell function decorated after
+setting ``CONF.cell_persistent_cache = True``.
+
+The cache key includes the source of the cell function and of the cell functions
+it references through module globals, such as ``gf.components.straight``.
+Cell functions it only reaches indirectly, for example through component specs,
+``gf.get_component`` or helper functions, are not part of the key, so editing
+them can serve stale cells. Clear the cache with ``cell_cache.clear()`` after
+such edits.
+"""
+
+from __future__ import annotations
+
+import dis
+import functools
+import hashlib
+import inspect
+import json
+import os
+import pathlib
+import tempfile
+import types
+from collections.abc import Callable, Iterator
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import kfactory as kf
+import klayout.db as kdb
+from kfactory.utilities import save_layout_options
+
+from gdsfactory.config import CONF, PATH, __version__
+
+if TYPE_CHECKING:
+    from gdsfactory.component import Component
+    from gdsfactory.typings import PathType
+
+
+class CellCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+    entries: int
+
+
+def _get_source(func: Callable[..., Any]) -> bytes:
+    """Returns the source code of func, or its bytecode if the source is missing."""
+    try:
+        return inspect.getsource(func).encode()
+    except (OSError, TypeError):
+        return func.__code__.co_code  # type: ignore[no-any-return]
+
+
+def _get_global_references(
+    code: types.CodeType, namespace: dict[str, Any]
+) -> Iterator[Any]:
+    """Yields the globals that code references, following module attributes.
+
+    ``gf.components.straight`` yields the gdsfactory module and the straight cell.
+
+    Args:
+        code: code object, including its nested functions and lambdas.
+        namespace: globals of the function that owns code.
+    """
+    obj: Any = None
+    for instruction in dis.get_instructions(code):
+        if instruction.opname == "LOAD_GLOBAL":
+            if obj is not None:
+                yield obj
+            obj = namespace.get(instruction.argval)
+        elif instruction.opname in {"LOAD_ATTR", "LOAD_METHOD"} and isinstance(
+            obj, types.ModuleType
+        ):
+            yield obj
+            obj = getattr(obj, instruction.argval, None)
+        elif obj is not None:
+            yield obj
+            obj = None
+    if obj is not None:
+        yield obj
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            yield from _get_global_references(const, namespace)
+
+
+def _get_called_cells(func: Callable[..., Any]) -> list[Callable[..., Any]]:
+    """Returns the undecorated cell functions that func references."""
+    code = getattr(func, "__code__", None)
+    if code is None:
+        return []
+    cells = []
+    for obj in _get_global_references(code, getattr(func, "__globals__", {})):
+        if isinstance(obj, functools.partial):
+            obj = obj.func
+        if getattr(obj, "is_gf_cell", False):
+            cells.append(inspect.unwrap(obj))
+    return cells
+
+
+@functools.cache
+def _get_source_hash(func: Callable[..., Any]) -> str:
+    """Returns a hash of the source code of func and of the cells it calls."""
+    sha = hashlib.sha256()
+    seen = set()
+    pending = [func]
+    while pending:
+        f = pending.pop()
+        if f in seen:
+            continue
+        seen.add(f)
+        sha.update(_get_source(f))
+        pending.extend(_get_called_cells(f))
+    return sha.hexdigest()
+
+
+def _is_reproducible_name(name: str) -> bool:
+    """Returns True if name comes from the cell settings, not from a counter."""
+    return "$" not in name and not name.startswith("Unnamed")
+
+
+def write_cell_bytes(component: Component, name: str | None = None) -> bytes:
+    """Returns a cell and its child cells as OASIS bytes.
+
+    The bytes include the kfactory meta info (ports, info and settings) of every
+    cell, so read_cell_bytes restores them.
+
+    Args:
+        component: cell to serialize.
+        name: optional top cell name in the serialized layout. Requires an unlocked cell.
+    """
+    kcl = component.kcl
+    kcl.set_meta_data()
+    for ci in component.called_cells():
+        kcl[ci].set_meta_data()
+    component.set_meta_data()
+
+    options = save_layout_options()
+    options.format = "OASIS"
+    options.clear_cells()
+    options.select_cell(component.cell_index())
+
+    old_name = component.name
+    if name is not None:
+        component.name = name
+    try:
+        return kcl.layout.write_bytes(options)  # type: ignore[no-any-return]
+    finally:
+        if name is not None:
+            component.name = old_name
+
+
+def read_cell_bytes(
+    data: bytes, kcl: kf.KCLayout | None = None, lock: bool = True
+) -> Component:
+    """Loads a cell serialized with write_cell_bytes into kcl.
+
+    Cells with settings-based names that already exist in kcl are reused
+    instead of duplicated. Cells with counter-based names (Unnamed, $1)
+    are always loaded as new cells.
+
+    Args:
+        data: OASIS or GDS bytes with a single top cell.
+        kcl: layout to load the cell into. Defaults to the default KCLayout.
+        lock: lock the top cell. Child cells are always locked.
+    """
+    from gdsfactory.component import Component
+
+    kcl = kcl or kf.kcl
+    layout = kdb.Layout()
+    layout.read_bytes(data)
+
+    taken = {cell.name for cell in layout.each_cell()}
+    unnamed: set[str] = set()
+    renamed = False
+    for cell in layout.each_cell():
+        if not _is_reproducible_name(cell.name):
+            basename = cell.name.split("$")[0]
+            i = 1
+            while f"{basename}${i}" in taken or kcl.layout_cell(f"{basename}${i}"):
+                i += 1
+            cell.name = f"{basename}${i}"
+            taken.add(cell.name)
+            if basename.startswith("Unnamed"):
+                unnamed.add(cell.name)
+            renamed = True
+    if renamed:
+        options = save_layout_options()
+        options.format = "OASIS"
+        data = layout.write_bytes(options)
+    top_name = layout.top_cell().name
+
+    new_names = [
+        cell.name for cell in layout.each_cell() if kcl.layout_cell(cell.name) is None
+    ]
+    options = kdb.LoadLayoutOptions()
+    options.cell_conflict_resolution = (
+        kdb.LoadLayoutOptions.CellConflictResolution.SkipNewCell
+    )
+    with kcl.thread_lock:
+        kcl.layout.read_bytes(data, options)
+        kcl.get_meta_data()
+        top_cell = kcl.layout_cell(top_name)
+        assert top_cell is not None
+        top_index = top_cell.cell_index()
+        new_cells = [kcl.layout_cell(name) for name in new_names]
+        for cell in sorted(new_cells, key=lambda c: c.hierarchy_levels()):  # type: ignore[union-attr]
+            kcell = kf.KCell(kdb_cell=cell, kcl=kcl)
+            kcell.get_meta_data()
+            if kcell.name in unnamed:
+                # same naming as kfactory, so it does not depend on the source layout
+                kcell.name = f"Unnamed_{kcell.cell_index()}"
+            if lock or kcell.cell_index() != top_index:
+                kcell.base.lock()
+        return Component(base=kcl[top_index].base)
+
+
+class CellCache:
+    """Bounded LRU cache of cells stored as OASIS files in a local directory.
+
+    Each entry holds the cell returned by the cell function, before the @cell
+    decorator names it and runs its post-processing. The file also holds its
+    hierarchy and the kfactory meta info (ports, info and settings).
+    On a hit the cell is loaded into the KCLayout and the decorator finishes
+    it as usual, without running the Python geometry code.
+
+    Args:
+        dirpath: directory for the cache entries.
+        maxsize: maximum total size of the entries in bytes.
+    """
+
+    suffix = ".oas"
+
+    def __init__(self, dirpath: PathType, maxsize: int) -> None:
+        """Creates the cache. The directory is created on the first save."""
+        self.dirpath = pathlib.Path(dirpath)
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+    def get_key(self, func: Callable[..., Any], params: dict[str, Any]) -> str | None:
+        """Returns the cache key for func(**params).
+
+        The key combines the function qualified name, the hash of its source and
+        of the sources of the cell functions it references, the active PDK name and version, the gdsfactory version and the serialized
+        settings. Returns None if the settings cannot be serialized.
+
+        Args:
+            func: cell function.
+            params: cell settings.
+        """
+        from gdsfactory.pdk import get_active_pdk
+        from gdsfactory.serialization import clean_value_json
+
+        try:
+            settings = json.dumps(clean_value_json(params), sort_keys=True)
+        except (TypeError, ValueError):
+            return None
+
+        pdk = get_active_pdk()
+        data = [
+            func.__module__,
+            func.__qualname__,
+            _get_source_hash(func),
+            pdk.name,
+            pdk.version,
+            __version__,
+            settings,
+        ]
+        return hashlib.sha256(json.dumps(data).encode()).hexdigest()
+
+    def get_filepath(self, key: str) -> pathlib.Path:
+        return self.dirpath / f"{key}{self.suffix}"
+
+    def load(self, key: str, kcl: kf.KCLayout | None = None) -> Component | None:
+        """Loads a cached cell into kcl. Returns None on a miss.
+
+        Args:
+            key: cache key.
+            kcl: layout to load the cell into. Defaults to the default KCLayout.
+        """
+        filepath = self.get_filepath(key)
+        try:
+            component = read_cell_bytes(filepath.read_bytes(), kcl=kcl, lock=False)
+        except (OSError, RuntimeError):
+            component = None
+        if component is None or component.locked:
+            self.misses += 1
+            return None
+
+        os.utime(filepath)
+        self.hits += 1
+        return component
+
+    def save(self, key: str, component: Component) -> bool:
+        """Stores a cell. Returns False if the cell cannot be cached.
+
+        Cells that are locked, contain virtual instances or instantiate child
+        cells that were not built by @cell are not cached. Such child cells can
+        still change after saving or have counter-based names (Unnamed, $1).
+        Library cells are not cached either.
+
+        Args:
+            key: cache key.
+            component: cell returned by the cell function.
+        """
+        if component.locked or component.vinsts:
+            return False
+        kcl = component.kcl
+        if any(
+            not child.locked
+            or child.is_library_cell()
+            or not _is_reproducible_name(child.name)
+            for child in (kcl[ci] for ci in component.called_cells())
+        ):
+            return False
+
+        data = write_cell_bytes(component, name=f"cell_cache_{key[:16]}")
+        self.dirpath.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=self.dirpath, suffix=self.suffix)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self.get_filepath(key))
+        finally:
+            pathlib.Path(tmp).unlink(missing_ok=True)
+
+        self._evict()
+        return True
+
+    def _get_entries(self) -> list[tuple[float, int, pathlib.Path]]:
+        """Returns (access time, size, path) for each entry, oldest first."""
+        entries = []
+        for filepath in self.dirpath.glob(f"*{self.suffix}"):
+            try:
+                stat = filepath.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, filepath))
+        return sorted(entries)
+
+    def _evict(self) -> None:
+        """Deletes the least recently used entries until the cache fits maxsize."""
+        entries = self._get_entries()
+        currsize = sum(size for _, size, _ in entries)
+        for _, size, filepath in entries:
+            if currsize <= self.maxsize:
+                break
+            filepath.unlink(missing_ok=True)
+            currsize -= size
+
+    def info(self) -> CellCacheInfo:
+        """Returns the hit and miss counters and the cache size in bytes."""
+        entries = self._get_entries()
+        return CellCacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            maxsize=self.maxsize,
+            currsize=sum(size for _, size, _ in entries),
+            entries=len(entries),
+        )
+
+    def clear(self, maxsize: int | None = None) -> None:
+        """Deletes all entries and resets the counters.
+
+        Args:
+            maxsize: optional new maximum size in bytes.
+        """
+        for _, _, filepath in self._get_entries():
+            filepath.unlink(missing_ok=True)
+        if maxsize is not None:
+            self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+
+
+cell_cache = CellCache(dirpath=PATH.cell_cache, maxsize=CONF.cell_cache_maxsize)
+
+
+class CachedCellFunction:
+    """Cell function whose results are loaded from or saved to cell_cache.
+
+    Args:
+        func: cell function.
+    """
+
+    def __init__(self, func: Callable[..., Component]) -> None:
+        """Wraps func, keeping its name, docstring and signature."""
+        functools.update_wrapper(self, func)
+        self.func = func
+
+    @property
+    def __code__(self) -> types.CodeType:
+        """Code of the cell function, so kfactory finds the file that defines it."""
+        return self.func.__code__
+
+    def __call__(self, **kwargs: Any) -> Component:
+        """Returns the cached cell for kwargs, building and saving it on a miss."""
+        key = cell_cache.get_key(self.func, kwargs)
+        if key is None:
+            return self.func(**kwargs)
+
+        component = cell_cache.load(key)
+        if component is None:
+            component = self.func(**kwargs)
+            cell_cache.save(key, component)
+        return component
+
+
+def with_cell_cache(func: Callable[..., Component]) -> CachedCellFunction:
+    """Wraps a cell function so its result is loaded from or saved to cell_cache.
+
+    Args:
+        func: cell function.
+    """
+    return CachedCellFunction(func)
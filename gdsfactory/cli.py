@@ -10,8 +10,6 @@ from gdsfactory import show as _show
 from gdsfactory.config import print_version_plugins
 from gdsfactory.difftest import diff
 from gdsfactory.install import install_gdsdiff, install_klayout_package
-from gdsfactory.read.from_updk import from_updk
-from gdsfactory.watch import watch as _watch
 
 app = typer.Typer()
 app.command()(build)
@@ -88,6 +86,8 @@ def watch(
         pre_run: build all cells on startup.
         overwrite: overwrite existing cells.
     """
+    from gdsfactory.watch import watch as _watch
+
     path_path = pathlib.Path(path)
     path_path = path_path if path_path.is_dir() else path_path.parent
     path = str(path_path.absolute())
@@ -131,6 +131,8 @@ def version() -> None:
 @app.command(name="from-updk")
 def from_updk_command(filepath: str, filepath_out: str = "") -> None:
     """Writes a PDK in python from uPDK YAML spec."""
+    from gdsfactory.read.from_updk import from_updk
+
     filepath_path = pathlib.Path(filepath)
     filepath_out_path = filepath_out or filepath_path.with_suffix(".py")
     from_updk(filepath, filepath_out=filepath_out_path)
@@ -9,12 +9,9 @@ from collections.abc import Callable, Iterable, Sequence
 from typing import TYPE_CHECKING, Any, Literal, Self, TypeAlias, cast, overload
 
 import kfactory as kf
-import klayout.lay as lay
-import networkx as nx
 import numpy as np
 import numpy.typing as npt
 import yaml
-from graphviz import Digraph
 from kfactory import (
     DInstance,
     DInstances,
@@ -28,15 +25,18 @@ from kfactory import (
 from kfactory.exceptions import LockedError
 from kfactory.kcell import BaseKCell, ProtoKCell
 from kfactory.port import ProtoPort
-from matplotlib.figure import Figure
 from pydantic import Field
-from trimesh.scene.scene import Scene
 
 from gdsfactory.config import CONF, GDSDIR_TEMP
 from gdsfactory.serialization import clean_value_json, convert_tuples_to_lists
 from gdsfactory.utils import to_kdb_dpoints
 
 if TYPE_CHECKING:
+    import networkx as nx
+    from graphviz import Digraph
+    from matplotlib.figure import Figure
+    from trimesh.scene.scene import Scene
+
     from gdsfactory.cross_section import CrossSection, CrossSectionSpec
     from gdsfactory.technology.layer_stack import LayerStack
     from gdsfactory.technology.layer_views import LayerViews
@@ -73,8 +73,6 @@ def points_to_polygon(
 ) -> kdb.Polygon | kdb.DPolygon | kdb.DSimplePolygon | kdb.Region:
     if isinstance(points, tuple | list | np.ndarray):
         points = ensure_tuple_of_tuples(points)
-        polygon = kdb.DPolygon()
-        polygon.assign_hull(to_kdb_dpoints(points))
     elif isinstance(
         points, kdb.Polygon | kdb.DPolygon | kdb.DSimplePolygon | kdb.Region
     ):
@@ -462,11 +460,9 @@ class Component(ComponentBase, kf.DKCell):
 
     @property
     def layers(self) -> list[Layer]:
-        return [
-            (info.layer, info.datatype)
-            for info in self.kcl.layout.layer_infos()
-            if not self.bbox(self.kcl.layout.layer(info)).empty()
-        ]
+        from gdsfactory.functions import get_layers
+
+        return get_layers(self)
 
     def add(self, instances: Iterable[ComponentReference] | ComponentReference) -> None:
         if self.locked:
@@ -960,36 +956,9 @@ class Component(ComponentBase, kf.DKCell):
 
         import matplotlib.pyplot as plt
 
-        from gdsfactory.pdk import get_layer_views
-
-        self.insert_vinsts()
-
-        lyp_path = GDSDIR_TEMP / "layer_properties.lyp"
-        layer_views = get_layer_views()
-        layer_views.to_lyp(filepath=lyp_path)
-
-        layout_view = lay.LayoutView()
-        cell_view_index = layout_view.create_layout(True)
-        layout_view.active_cellview_index = cell_view_index
-        cell_view = layout_view.cellview(cell_view_index)
-        layout = cell_view.layout()
-        layout.assign(kf.kcl.layout)
-
-        assert self.name is not None, "Component name is None"
-
-        cell_view.cell = layout.cell(self.name)
-
-        layout_view.max_hier()
-        layout_view.load_layer_props(str(lyp_path))
-
-        layout_view.add_missing_layers()
-        layout_view.zoom_fit()
-
-        layout_view.set_config("text-visible", "true" if show_labels else "false")
-        layout_view.set_config("grid-show-ruler", "true" if show_ruler else "false")
+        from gdsfactory.export.to_png import to_png
 
-        pixel_buffer = layout_view.get_pixels_with_options(800, 600)
-        png_data = pixel_buffer.to_png_data()
+        png_data = to_png(self, show_labels=show_labels, show_ruler=show_ruler)
 
         # Convert PNG data to NumPy array and display with matplotlib
         with BytesIO(png_data) as f:
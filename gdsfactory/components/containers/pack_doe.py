@@ -1,23 +1,80 @@
 from __future__ import annotations
 
 import itertools as it
+import multiprocessing
 from collections.abc import Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor
 from typing import Any, cast
 
 import kfactory as kf
 
 import gdsfactory as gf
+from gdsfactory.cell_cache import read_cell_bytes, write_cell_bytes
 from gdsfactory.component import Component
+from gdsfactory.config import CONF
 from gdsfactory.grid import grid, grid_with_text
 from gdsfactory.pack import pack
 from gdsfactory.typings import CellSpec, ComponentSpec
 
+_DoeJobs = tuple[ComponentSpec, list[dict[str, Any]], CellSpec | None]
+_worker_doe_jobs: _DoeJobs | None = None
+
+
+def _init_doe_worker(
+    doe: ComponentSpec, settings_list: list[dict[str, Any]], function: CellSpec | None
+) -> None:
+    """Stores the DOE jobs in a worker process, which runs one pool at a time."""
+    global _worker_doe_jobs
+    _worker_doe_jobs = (doe, settings_list, function)
+
+
+def _build_doe_variant(index: int) -> bytes:
+    """Builds one DOE variant in a worker process and returns it as layout bytes."""
+    assert _worker_doe_jobs is not None
+    doe, settings_list, function = _worker_doe_jobs
+    component = gf.get_component(doe, **settings_list[index])
+    if function:
+        component = gf.get_cell(function)(component)
+    return write_cell_bytes(component)
+
+
+def _generate_doe_parallel(
+    doe: ComponentSpec,
+    settings_list: list[dict[str, Any]],
+    function: CellSpec | None,
+    n_workers: int,
+) -> list[Component]:
+    """Builds the DOE variants in a pool of forked worker processes.
+
+    Each worker receives the jobs through the pool initializer, builds its
+    variants in its own copy of the layout and sends them back as OASIS bytes
+    with their ports, info and settings. The variants are loaded into the parent
+    layout in settings order, so cell names do not depend on which worker
+    finishes first. Cells that already exist in the parent layout, such as
+    shared subcells, are reused instead of duplicated.
+    """
+    n_workers = min(n_workers, len(settings_list))
+    chunksize = max(1, len(settings_list) // (4 * n_workers))
+    with ProcessPoolExecutor(
+        max_workers=n_workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_doe_worker,
+        initargs=(doe, settings_list, function),
+    ) as executor:
+        results = list(
+            executor.map(
+                _build_doe_variant, range(len(settings_list)), chunksize=chunksize
+            )
+        )
+    return [read_cell_bytes(data) for data in results]
+
 
 def generate_doe(
     doe: ComponentSpec,
     settings: Mapping[str, Sequence[Any]],
     do_permutations: bool = False,
     function: CellSpec | None = None,
+    n_workers: int | None = None,
 ) -> tuple[list[Component], list[dict[str, Any]]]:
     """Generates a component DOE (Design of Experiment).
 
@@ -28,13 +85,23 @@ def generate_doe(
         settings: component settings.
         do_permutations: for each setting.
         function: for the component (add padding, grating couplers ...)
+        n_workers: number of worker processes that build the variants.
+            Defaults to CONF.doe_n_workers. 1 builds them serially. Parallel builds
+            need the fork start method and fall back to serial without it.
     """
     if do_permutations:
         settings_list = [dict(zip(settings, t)) for t in it.product(*settings.values())]
     else:
         settings_list = [dict(zip(settings, t)) for t in zip(*settings.values())]
 
-    if function:
+    n_workers = CONF.doe_n_workers if n_workers is None else n_workers
+    if (
+        n_workers > 1
+        and len(settings_list) > 1
+        and "fork" in multiprocessing.get_all_start_methods()
+    ):
+        component_list = _generate_doe_parallel(doe, settings_list, function, n_workers)
+    elif function:
         function = gf.get_cell(function)
         component_list = [
             function(gf.get_component(doe, **settings)) for settings in settings_list
@@ -53,6 +120,7 @@ def pack_doe(
     settings: Mapping[str, Sequence[kf.typings.MetaData]],
     do_permutations: bool = False,
     function: CellSpec | None = None,
+    n_workers: int | None = None,
     **kwargs: Any,
 ) -> Component:
     """Packs a component DOE (Design of Experiment) using pack.
@@ -62,6 +130,8 @@ def pack_doe(
         settings: component settings.
         do_permutations: for each setting.
         function: to apply (add padding, grating couplers).
+        n_workers: number of worker processes that build the variants.
+            Defaults to CONF.doe_n_workers. 1 builds them serially.
         kwargs: for pack.
 
     Keyword Args:
@@ -80,9 +150,15 @@ def pack_doe(
         rotation: for each component in degrees.
         h_mirror: horizontal mirror in y axis (x, 1) (1, 0). This is the most common.
         v_mirror: vertical mirror using x axis (1, y) (0, y).
+        packer: rectpack or skyline (faster for large DOEs).
+        time_budget: optional time in seconds to shrink the bin (skyline only).
     """
     component_list, settings_list = generate_doe(
-        doe=doe, settings=settings, do_permutations=do_permutations, function=function
+        doe=doe,
+        settings=settings,
+        do_permutations=do_permutations,
+        function=function,
+        n_workers=n_workers,
     )
 
     components = pack(component_list, **kwargs)
@@ -105,6 +181,7 @@ def pack_doe_grid(
     do_permutations: bool = False,
     function: CellSpec | None = None,
     with_text: bool = False,
+    n_workers: int | None = None,
     **kwargs: Any,
 ) -> Component:
     """Packs a component DOE (Design of Experiment) using grid.
@@ -115,6 +192,8 @@ def pack_doe_grid(
         do_permutations: for each setting.
         function: to apply to component (add padding, grating couplers).
         with_text: includes text label.
+        n_workers: number of worker processes that build the variants.
+            Defaults to CONF.doe_n_workers. 1 builds them serially.
         kwargs: for grid.
 
     Keyword Args:
@@ -132,22 +211,13 @@ def pack_doe_grid(
         h_mirror: horizontal mirror y axis (x, 1) (1, 0). most common mirror.
         v_mirror: vertical mirror using x axis (1, y) (0, y).
     """
-    if do_permutations:
-        settings_list = [dict(zip(settings, t)) for t in it.product(*settings.values())]
-    else:
-        settings_list = [dict(zip(settings, t)) for t in zip(*settings.values())]
-
-    if function:
-        function = gf.get_cell(function)
-        component_list = [
-            function(gf.get_component(doe, settings=None, **settings))
-            for settings in settings_list
-        ]
-    else:
-        component_list = [
-            gf.get_component(doe, settings=None, **settings)
-            for settings in settings_list
-        ]
+    component_list, settings_list = generate_doe(
+        doe=doe,
+        settings=settings,
+        do_permutations=do_permutations,
+        function=function,
+        n_workers=n_workers,
+    )
 
     if with_text:
         c = grid_with_text(component_list, **kwargs)
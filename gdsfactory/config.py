@@ -112,6 +112,12 @@ class Config(Settings):
     layer_label: tuple[int, int]
     port_types: list[str]
     port_types_grating_couplers: list[str]
+    extrude_cache_size: int
+    cross_section_cache_size: int
+    netlist_cache_size: int
+    cell_persistent_cache: bool
+    cell_cache_maxsize: int
+    doe_n_workers: int
 
 
 CONF: Config = config  # type: ignore[assignment]
@@ -139,6 +145,12 @@ CONF.port_types = [
     "edge_coupler",  # for edge couplers
 ]
 CONF.port_types_grating_couplers = ["vertical_te", "vertical_tm", "vertical_dual"]
+CONF.extrude_cache_size = 256
+CONF.cross_section_cache_size = 1024
+CONF.netlist_cache_size = 128
+CONF.cell_persistent_cache = False
+CONF.cell_cache_maxsize = 1024**3
+CONF.doe_n_workers = 1
 
 
 class Paths:
@@ -157,6 +169,7 @@ class Paths:
     gdslib = home / ".gdsfactory"
     modes = gdslib / "modes"
     sparameters = gdslib / "sp"
+    cell_cache = gdslib / "cell_cache"
     capacitance = gdslib / "capacitance"
     interconnect = gdslib / "interconnect"
     optimiser = repo_path / "tune"
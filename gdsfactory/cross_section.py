@@ -7,8 +7,8 @@ from __future__ import annotations
 
 import hashlib
 import warnings
-from collections.abc import Callable, Sequence
-from functools import partial, wraps
+from collections.abc import Callable, Mapping, Sequence
+from functools import cached_property, partial, wraps
 from inspect import getmembers, signature
 from types import ModuleType
 from typing import Any, ParamSpec, Protocol, Self, TypeAlias
@@ -247,8 +247,7 @@ class CrossSection(BaseModel):
     def name(self) -> str:
         if self._name:
             return self._name
-        h = hashlib.md5(str(self).encode()).hexdigest()[:8]
-        return f"xs_{h}"
+        return f"xs_{self.hash[:8]}"
 
     @property
     def width(self) -> float:
@@ -271,11 +270,20 @@ class CrossSection(BaseModel):
         else:
             raise KeyError(f"{key} not in {list(key_to_section.keys())}")
 
-    @property
+    @cached_property
     def hash(self) -> str:
-        """Returns a hash of the cross_section."""
+        """Returns a hash of the cross_section, computed once per instance."""
         return hashlib.md5(str(self).encode()).hexdigest()
 
+    def model_copy(
+        self, *, update: Mapping[str, Any] | None = None, deep: bool = False
+    ) -> Self:
+        """Returns a copy of the cross_section without a stale cached hash."""
+        xs = super().model_copy(update=update, deep=deep)
+        if update:
+            xs.__dict__.pop("hash", None)
+        return xs
+
     def copy(
         self,
         width: float | None = None,
@@ -3,6 +3,7 @@ from __future__ import annotations
 from gdsfactory.export.to_3d import to_3d
 from gdsfactory.export.to_gerber import to_gerber
 from gdsfactory.export.to_np import to_np
+from gdsfactory.export.to_png import plot_many, to_png
 from gdsfactory.export.to_stl import to_stl
 
-__all__ = ("to_3d", "to_gerber", "to_np", "to_stl")
+__all__ = ("plot_many", "to_3d", "to_gerber", "to_np", "to_png", "to_stl")
@@ -1,24 +1,166 @@
 from __future__ import annotations
 
-from typing import cast
+import itertools
+import time
+from typing import TYPE_CHECKING, cast
 
-import shapely
+import kfactory as kf
+import numpy as np
+import numpy.typing as npt
 from kfactory import LayerEnum
-from trimesh.scene.scene import Scene
 
 from gdsfactory.component import Component
 from gdsfactory.technology import DerivedLayer, LayerStack, LayerViews, LogicalLayer
 from gdsfactory.typings import LayerSpecs
 
+if TYPE_CHECKING:
+    from trimesh import Trimesh
+    from trimesh.scene import Scene
+
+    from gdsfactory.functions import PolygonBuffer
+
+
+def _extrude_buffer(
+    buffer: PolygonBuffer, zmin: float, height: float, scale: float = 1
+) -> tuple[npt.NDArray[np.float64], npt.NDArray[np.int64]]:
+    """Returns the vertices and faces of the extruded polygons of a buffer.
+
+    Each polygon is triangulated with earcut and the side walls of all rings are
+    built at once. Top faces point to +z, bottom faces to -z and side walls away
+    from the solid, so each polygon is a closed mesh.
+
+    Args:
+        buffer: polygons with holes as separate rings.
+        zmin: bottom of the extrusion.
+        height: thickness of the extrusion.
+        scale: um per buffer unit, for example the dbu for buffers in dbu.
+    """
+    import mapbox_earcut as earcut
+
+    points = buffer.points * float(scale)
+    offsets = buffer.offsets
+    polygon_offsets = buffer.polygon_offsets
+    n = len(points)
+
+    triangles = []
+    for r0, r1 in itertools.pairwise(polygon_offsets):
+        start = offsets[r0]
+        ring_ends = (offsets[r0 + 1 : r1 + 1] - start).astype(np.uint32)
+        indices = earcut.triangulate_float64(points[start : offsets[r1]], ring_ends)
+        triangles.append(indices.astype(np.int64) + start)
+    caps = np.concatenate(triangles).reshape(-1, 3)
+    # earcut does not guarantee an orientation, make all cap triangles counterclockwise
+    a, b, c = points[caps[:, 0]], points[caps[:, 1]], points[caps[:, 2]]
+    cross = (b[:, 0] - a[:, 0]) * (c[:, 1] - a[:, 1]) - (b[:, 1] - a[:, 1]) * (
+        c[:, 0] - a[:, 0]
+    )
+    caps[cross < 0] = caps[cross < 0][:, ::-1]
+
+    # the next point of each ring, wrapping around to the first one
+    i = np.arange(n)
+    next_index = i + 1
+    next_index[offsets[1:] - 1] = offsets[:-1]
+    x, y = points[:, 0], points[:, 1]
+    ring_areas = np.add.reduceat(x * y[next_index] - x[next_index] * y, offsets[:-1])
+    is_hull = np.zeros(len(offsets) - 1, dtype=bool)
+    is_hull[polygon_offsets[:-1]] = True
+    # hulls are clockwise and holes counterclockwise, but do not rely on it
+    solid_on_left = np.repeat(is_hull == (ring_areas > 0), np.diff(offsets))
+    walls = np.concatenate(
+        [
+            np.stack([i, next_index, next_index + n], axis=1),
+            np.stack([i, next_index + n, i + n], axis=1),
+        ]
+    )
+    flip = np.concatenate([~solid_on_left, ~solid_on_left])
+    walls[flip] = walls[flip][:, ::-1]
+
+    vertices = np.empty((2 * n, 3))
+    vertices[:n, :2] = points
+    vertices[n:, :2] = points
+    vertices[:n, 2] = zmin
+    vertices[n:, 2] = zmin + height
+    faces = np.concatenate([caps[:, ::-1], caps + n, walls])
+    return vertices, faces
+
+
+def _get_mesh(
+    buffer: PolygonBuffer,
+    zmin: float,
+    height: float,
+    color: tuple[float, ...],
+    scale: float = 1,
+) -> Trimesh:
+    from trimesh import Trimesh
+
+    vertices, faces = _extrude_buffer(buffer, zmin=zmin, height=height, scale=scale)
+    mesh = Trimesh(vertices=vertices, faces=faces, process=False)
+    mesh.visual.face_colors = color
+    return mesh
+
+
+def _get_matrix(trans: kf.kdb.DCplxTrans) -> npt.NDArray[np.float64]:
+    """Returns the 4x4 homogeneous matrix of a planar transformation."""
+    angle = np.deg2rad(trans.angle)
+    m = trans.mag
+    s = -1 if trans.is_mirror() else 1
+    matrix = np.eye(4)
+    matrix[:2, :2] = [
+        [m * np.cos(angle), -m * np.sin(angle) * s],
+        [m * np.sin(angle), m * np.cos(angle) * s],
+    ]
+    matrix[:2, 3] = trans.disp.x, trans.disp.y
+    return matrix
+
+
+def _get_placements(
+    layout: kf.kdb.Layout,
+) -> dict[int, list[kf.kdb.DCplxTrans]]:
+    """Returns the transformations in um from each cell to the top cell of a layout."""
+    top_cell = layout.top_cell()
+    placements: dict[int, list[kf.kdb.ICplxTrans]] = {
+        top_cell.cell_index(): [kf.kdb.ICplxTrans()]
+    }
+    for cell_index in layout.each_cell_top_down():
+        parent_placements = placements.get(cell_index)
+        if not parent_placements:
+            continue
+        for inst in layout.cell(cell_index).each_inst():
+            trans = inst.cplx_trans
+            if inst.is_regular_array():
+                members = [
+                    kf.kdb.ICplxTrans(inst.a * ia + inst.b * ib) * trans
+                    for ia in range(inst.na)
+                    for ib in range(inst.nb)
+                ]
+            else:
+                members = [trans]
+            child_placements = placements.setdefault(inst.cell_index, [])
+            child_placements.extend(
+                parent * member for parent in parent_placements for member in members
+            )
+    return {
+        cell_index: [
+            kf.kdb.DCplxTrans(t.mag, t.angle, t.is_mirror(), t.disp * layout.dbu)
+            for t in cell_placements
+        ]
+        for cell_index, cell_placements in placements.items()
+    }
+
 
 def to_3d(
     component: Component,
     layer_views: LayerViews | None = None,
     layer_stack: LayerStack | None = None,
     exclude_layers: LayerSpecs | None = None,
+    instance_cells: bool = False,
 ) -> Scene:
     """Return Component 3D trimesh Scene.
 
+    Each LayerLevel is one mesh named after the level. With instance_cells the
+    layer stack is evaluated on the cell hierarchy, each cell with shapes is meshed
+    once per level and placed as a transformed copy in the scene graph.
+
     Args:
         component: to extrude in 3D.
         layer_views: layer colors from Klayout Layer Properties file.
@@ -26,17 +168,20 @@ def to_3d(
         layer_stack: contains thickness and zmin for each layer.
             Defaults to active PDK.layer_stack.
         exclude_layers: list of layer index to exclude.
+        instance_cells: if True, meshes each cell once and instances it,
+            which is smaller and faster for layouts with repeated cells.
 
     """
+    from gdsfactory.functions import get_polygon_buffer, get_polygons_buffers
     from gdsfactory.pdk import (
         get_active_pdk,
         get_layer,
         get_layer_stack,
         get_layer_views,
     )
+    from gdsfactory.technology.layer_stack import get_layout_with_derived_layers
 
     try:
-        from trimesh.creation import extrude_polygon
         from trimesh.scene import Scene
     except ImportError as e:
         print("you need to `pip install trimesh`")
@@ -49,13 +194,9 @@ def to_3d(
     exclude_layers = exclude_layers or ()
     exclude_layers = [get_layer(layer) for layer in exclude_layers]
 
-    component_with_booleans = layer_stack.get_component_with_derived_layers(component)
-    polygons_per_layer = component_with_booleans.get_polygons_points(
-        merge=True,
-    )
-    has_polygons = False
-
-    for level in layer_stack.layers.values():
+    # (level name, layer tuple, zmin, thickness, color) of each level to draw
+    levels = []
+    for name, level in layer_stack.layers.items():
         layer = level.layer
 
         if isinstance(layer, LogicalLayer):
@@ -68,28 +209,68 @@ def to_3d(
         else:
             raise ValueError(f"Layer {layer!r} is not a DerivedLayer or LogicalLayer")
 
-        layer_index = int(get_layer(layer_tuple))
-
-        if layer_index in exclude_layers:
+        if int(get_layer(layer_tuple)) in exclude_layers:
             continue
 
-        if layer_index not in polygons_per_layer:
-            continue
-
-        zmin = level.zmin
         layer_view = layer_views.get_from_tuple(layer_tuple)
         assert layer_view.fill_color is not None
         color_rgb = [c / 255 for c in layer_view.fill_color.as_rgb_tuple(alpha=False)]
-        if zmin is not None and layer_view.visible:
+        if level.zmin is not None and layer_view.visible:
+            levels.append(
+                (name, layer_tuple, level.zmin, level.thickness, (*color_rgb, 0.5))
+            )
+
+    names = [name for name, *_ in levels]
+    has_polygons = False
+    if instance_cells:
+        component.insert_vinsts()
+        layout = get_layout_with_derived_layers(component, layer_stack.filtered(names))
+        placements = _get_placements(layout)
+        dbu = layout.dbu
+        for name, layer_tuple, zmin, height, color in levels:
+            layer_index = layout.find_layer(*layer_tuple)
+            if layer_index is None:
+                continue
+            for cell_index, cell_placements in placements.items():
+                shapes = layout.cell(cell_index).shapes(layer_index)
+                if shapes.is_empty() or not cell_placements:
+                    continue
+                buffer = get_polygon_buffer(
+                    list(kf.kdb.Region(shapes).each()), holes=True
+                )
+                mesh = _get_mesh(
+                    buffer, zmin=zmin, height=height, color=color, scale=dbu
+                )
+                geom_name = f"{name}_{layout.cell(cell_index).name}"
+                scene.add_geometry(mesh, geom_name=geom_name)
+                scene.graph.update(
+                    frame_to=geom_name,
+                    matrix=_get_matrix(cell_placements[0]),
+                    geometry=geom_name,
+                )
+                for i, trans in enumerate(cell_placements[1:], start=1):
+                    scene.graph.update(
+                        frame_to=f"{geom_name}_{i}",
+                        frame_from=scene.graph.base_frame,
+                        matrix=_get_matrix(trans),
+                        geometry=geom_name,
+                    )
+                has_polygons = True
+    else:
+        component_with_booleans = layer_stack.filtered(
+            names
+        ).get_component_with_derived_layers(component)
+        buffers = get_polygons_buffers(
+            component_with_booleans, merge=True, by="tuple", holes=True
+        )
+        for name, layer_tuple, zmin, height, color in levels:
+            buffer = buffers.get(layer_tuple)
+            if buffer is None or len(buffer.points) == 0:
+                continue
+            mesh = _get_mesh(buffer, zmin=zmin, height=height, color=color)
+            scene.add_geometry(mesh, geom_name=name)
             has_polygons = True
-            polygons = polygons_per_layer[layer_index]
-            height = level.thickness
-            for polygon in polygons:
-                p = shapely.geometry.Polygon(polygon)
-                mesh = extrude_polygon(p, height=height)
-                mesh.apply_translation((0, 0, zmin))
-                mesh.visual.face_colors = (*color_rgb, 0.5)
-                scene.add_geometry(mesh)
+
     if not has_polygons:
         raise ValueError(
             f"{component.name!r} does not have polygons defined in the "
@@ -98,6 +279,52 @@ def to_3d(
     return scene
 
 
+def _demo_to_3d_benchmark() -> None:
+    """Prints the to_3d runtime against one extrude_polygon mesh per polygon."""
+    import shapely
+    from trimesh.creation import extrude_polygon
+
+    import gdsfactory as gf
+    from gdsfactory.pdk import get_layer_stack
+
+    c = gf.Component()
+    pad = gf.components.pad()
+    c.add_ref(pad, columns=20, rows=20, column_pitch=150, row_pitch=150)
+    c.add_ref(gf.components.grating_coupler_elliptical_trenches())
+
+    t0 = time.perf_counter()
+    scene = to_3d(c)
+    t_merged = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    scene_instanced = to_3d(c, instance_cells=True)
+    t_instanced = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    layer_stack = get_layer_stack()
+    polygons_per_layer = layer_stack.get_component_with_derived_layers(
+        c
+    ).get_polygons_points(merge=True, by="tuple")
+    n_meshes = 0
+    for level in layer_stack.layers.values():
+        if level.derived_layer is not None:
+            layer_tuple = tuple(level.derived_layer.layer)
+        else:
+            layer_tuple = tuple(level.layer.layer)  # type: ignore[union-attr]
+        for polygon in polygons_per_layer.get(layer_tuple, []):
+            mesh = extrude_polygon(shapely.Polygon(polygon), height=level.thickness)
+            mesh.apply_translation((0, 0, level.zmin))
+            n_meshes += 1
+    t_per_polygon = time.perf_counter() - t0
+
+    print(f"merged: {t_merged:.3f}s, {len(scene.geometry)} meshes")
+    print(
+        f"instanced: {t_instanced:.3f}s, {len(scene_instanced.geometry)} meshes, "
+        f"{len(scene_instanced.graph.nodes_geometry)} nodes"
+    )
+    print(f"per polygon: {t_per_polygon:.3f}s, {n_meshes} meshes")
+
+
 if __name__ == "__main__":
     from gdsfactory.components import (
         grating_coupler_elliptical_trenches,
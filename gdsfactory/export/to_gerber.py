@@ -7,13 +7,19 @@ See Also:
 - https://github.com/jamesbowman/cuflow/blob/master/gerber.py
 """
 
-from pathlib import Path
-from typing import Literal
+from __future__ import annotations
 
-from pydantic import BaseModel, Field
+import io
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Literal
+
+import numpy as np
+import numpy.typing as npt
+from pydantic import BaseModel
 
 from gdsfactory import Component
-from gdsfactory.typings import Size
+from gdsfactory.typings import PathType, Size
 
 
 class GerberLayer(BaseModel):
@@ -23,10 +29,24 @@ class GerberLayer(BaseModel):
 
 
 class GerberOptions(BaseModel):
+    """Gerber file options.
+
+    Attributes:
+        header: comment lines. Defaults to the generator and Component name.
+        mode: file units. Component coordinates are written as is in these units.
+        resolution: coordinate resolution in file units.
+        int_size: number of integer digits in the coordinate format.
+        flash_min_count: polygons with the same shape repeated at least this many
+            times on a layer are defined once as an aperture macro and flashed.
+            Polygons with more than 5000 vertices are always written as regions.
+            None writes every polygon as a region.
+    """
+
     header: list[str] | None = None
     mode: Literal["mm", "in"] = "mm"
     resolution: float = 1e-6
     int_size: int = 4
+    flash_min_count: int | None = 2
 
 
 # For generating a gerber job json file
@@ -37,6 +57,11 @@ class BoardOptions(BaseModel):
 
 resolutions = {1e-3: 3, 1e-4: 4, 1e-5: 5, 1e-6: 6}
 
+_BUFFER_SIZE = 1 << 20
+_CHUNK_SIZE = 10_000  # polygons formatted per write
+_APERTURE_START = 11  # D10 is the default circle aperture
+_MAX_OUTLINE_VERTICES = 5000  # limit of the outline macro primitive
+
 
 def number(n: float) -> str:
     """Formats a floating-point number by scaling it to an integer (multiplied by 10,000).
@@ -56,15 +81,10 @@ def number(n: float) -> str:
 def points(pp: list[tuple[float, float]]) -> str:
     if not pp:
         return ""
-    # Use a list to collect the formatted strings for better performance
-    parts = []
-    # First point uses D02
+    # First point uses D02, the rest D01
     x0, y0 = pp[0]
-    parts.append(f"X{number(x0)}Y{number(y0)}D02*\n")
-    # Rest use D01 (if any)
-    if len(pp) > 1:
-        for x, y in pp[1:]:
-            parts.append(f"X{number(x)}Y{number(y)}D01*\n")
+    parts = [f"X{number(x0)}Y{number(y0)}D02*\n"]
+    parts.extend(f"X{number(x)}Y{number(y)}D01*\n" for x, y in pp[1:])
     return "".join(parts)
 
 
@@ -77,71 +97,210 @@ def linestring(pp: list[tuple[float, float]]) -> str:
 
 
 def polygon(pp: list[tuple[float, float]]) -> str:
-    return "G36*\n" + points(pp) + "G37*\n\n"  # fixed to have only one newline at end
+    return "G36*\n" + points(pp) + "G37*\n\n"
+
+
+def _group_shapes(
+    points: npt.NDArray[np.int64], offsets: npt.NDArray[np.int64]
+) -> list[npt.NDArray[np.int64]]:
+    """Returns the indices of the polygons of each distinct shape.
+
+    Two polygons have the same shape if they are equal up to a translation.
+    KLayout normalizes polygons, so equal shapes start at the same vertex.
+
+    Args:
+        points: integer coordinates of all the polygons.
+        offsets: polygon i is points[offsets[i]:offsets[i + 1]].
+    """
+    sizes = np.diff(offsets)
+    groups = []
+    for size in np.unique(sizes):
+        polygons = np.flatnonzero(sizes == size)
+        index = offsets[polygons, None] + np.arange(size)
+        shapes = points[index] - points[offsets[polygons], None]
+        shapes = np.ascontiguousarray(shapes.reshape(len(polygons), -1))
+        # one opaque bytes value per polygon, which np.unique sorts faster than rows
+        keys = shapes.view(np.dtype((np.void, shapes.itemsize * shapes.shape[1])))
+        _, inverse = np.unique(keys.ravel(), return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        splits = np.flatnonzero(np.diff(inverse[order])) + 1
+        groups.extend(np.split(polygons[order], splits))
+    return groups
+
+
+def _write_regions(
+    f: io.TextIOBase,
+    points: npt.NDArray[np.int64],
+    offsets: npt.NDArray[np.int64],
+    polygons: npt.NDArray[np.int64],
+) -> None:
+    """Writes polygons as closed G36/G37 regions.
+
+    Args:
+        f: file to write to.
+        points: integer coordinates of all the polygons.
+        offsets: polygon i is points[offsets[i]:offsets[i + 1]].
+        polygons: indices of the polygons to write.
+    """
+    templates: dict[int, str] = {}
+    for start in range(0, len(polygons), _CHUNK_SIZE):
+        chunk = polygons[start : start + _CHUNK_SIZE]
+        sizes = offsets[chunk + 1] - offsets[chunk]
+        for size in np.unique(sizes).tolist():
+            if size not in templates:
+                templates[size] = (
+                    "G36*\nX%dY%dD02*\n" + "X%dY%dD01*\n" * size + "G37*\n"
+                )
+
+        # the vertices of each polygon followed by its first vertex
+        closed_sizes = sizes + 1
+        starts = np.cumsum(closed_sizes) - closed_sizes
+        local = np.arange(closed_sizes.sum()) - np.repeat(starts, closed_sizes)
+        local[local == np.repeat(sizes, closed_sizes)] = 0
+        index = np.repeat(offsets[chunk], closed_sizes) + local
+
+        text = "".join([templates[size] for size in sizes.tolist()])
+        f.write(text % tuple(points[index].ravel().tolist()))
+
+
+def _write_flashes(
+    f: io.TextIOBase, aperture: int, anchors: npt.NDArray[np.int64]
+) -> None:
+    """Selects an aperture and flashes it at each anchor point."""
+    f.write(f"D{aperture}*\n")
+    for start in range(0, len(anchors), _CHUNK_SIZE):
+        chunk = anchors[start : start + _CHUNK_SIZE]
+        f.write("X%dY%dD03*\n" * len(chunk) % tuple(chunk.ravel().tolist()))
+
+
+def _write_layer(
+    filepath: pathlib.Path,
+    layer: GerberLayer,
+    points: npt.NDArray[np.int64],
+    offsets: npt.NDArray[np.int64],
+    options: GerberOptions,
+    header: list[str],
+) -> None:
+    """Writes one Gerber file.
+
+    Args:
+        filepath: to write.
+        layer: Gerber layer attributes.
+        points: integer coordinates of all the polygons on the layer.
+        offsets: polygon i is points[offsets[i]:offsets[i + 1]].
+        options: to save.
+        header: comment lines.
+    """
+    digits = resolutions[options.resolution]
+
+    regions = np.arange(len(offsets) - 1)
+    flashed: list[npt.NDArray[np.int64]] = []
+    if options.flash_min_count is not None:
+        min_count = max(options.flash_min_count, 1)
+        sizes = np.diff(offsets)
+        flashed, others = [], []
+        for group in _group_shapes(points, offsets):
+            if len(group) >= min_count and sizes[group[0]] <= _MAX_OUTLINE_VERTICES:
+                flashed.append(group)
+            else:
+                others.append(group)
+        regions = np.sort(np.concatenate(others)) if others else regions[:0]
+
+    with open(filepath, "w", buffering=_BUFFER_SIZE) as f:
+        # Write file spec info
+        f.write("%TF.FileFunction," + ",".join(layer.function) + "*%\n")
+        f.write(f"%TF.FilePolarity,{layer.polarity}*%\n")
+        f.write(f"%FSLA{options.int_size}{digits}Y{options.int_size}{digits}X*%\n")
+
+        # Write header comments
+        f.writelines([f"G04 {line}*\n" for line in header])
+
+        # Setup units/mode
+        f.write(f"%MO{options.mode.upper()}*%\n")
+        f.write("%LPD*%\n")
+        f.write("G01*\n")
+
+        # Aperture definitions
+        f.write("%ADD10C,0.050000*%\n")
+        for n, polygons in enumerate(flashed):
+            polygon = points[offsets[polygons[0]] : offsets[polygons[0] + 1]]
+            outline = np.concatenate([polygon, polygon[:1]]) - polygon[0]
+            vertices = ",".join(f"{v / 10**digits:.{digits}f}" for v in outline.ravel())
+            f.write(f"%AMSHAPE{n}*4,1,{len(polygon)},{vertices},0*%\n")
+            f.write(f"%ADD{_APERTURE_START + n}SHAPE{n}*%\n")
+
+        for n, polygons in enumerate(flashed):
+            anchors = points[offsets[polygons]]
+            _write_flashes(f, _APERTURE_START + n, anchors)
+        if len(regions):
+            _write_regions(f, points, offsets, regions)
+
+        # File end
+        f.write("M02*\n")
 
 
 def to_gerber(
     component: Component,
-    dirpath: Path,
+    dirpath: PathType,
     layermap_to_gerber_layer: dict[tuple[int, int], GerberLayer],
-    options: GerberOptions = Field(default_factory=GerberOptions),
+    options: GerberOptions | None = None,
+    n_workers: int | None = None,
 ) -> None:
     """Writes each layer to a different Gerber file.
 
+    Repeated shapes are written once as aperture macros and flashed,
+    other polygons as regions. Layers are written in parallel threads.
+
     Args:
         component: to export.
         dirpath: directory path.
         layermap_to_gerber_layer: map of GDS layer to GerberLayer.
-        options: to save.
-            header: List[str] | None = None
-            mode: Literal["mm", "in"] = "mm"
-            resolution: float = 1e-6
-            int_size: int = 4
+        options: to save. Defaults to GerberOptions().
+        n_workers: number of threads writing layers. Defaults to one per layer.
     """
-    # Split references into polygons and circles (components will need to be recursively iterated through)
-    # for ref in component.references:
-    #     if ref.parent_cell.name.startswith("circle"):
-    #         radius = ref.parent_cell.settings["radius"]
-    #         center = ref.center
-    # Each layer and a list of the polygons (as lists of points) on that layer
-    layer_to_polygons = component.get_polygons_points()
-
-    for layer_tup, layer in layermap_to_gerber_layer.items():
-        filename = (dirpath / layer.name.replace(" ", "_")).with_suffix(".gbr")
-
-        with open(filename, "w+") as f:
-            header = options.header or [
-                "Gerber file generated by gdsfactory",
-                f"Component: {component.name}",
-            ]
-
-            # Write file spec info
-            f.write("%TF.FileFunction," + ",".join(layer.function) + "*%\n")
-            f.write(f"%TF.FilePolarity,{layer.polarity}*%\n")
+    from gdsfactory.functions import get_polygons_buffers
 
-            digits = resolutions[options.resolution]
-            f.write(f"%FSLA{options.int_size}{digits}Y{options.int_size}{digits}X*%\n")
-
-            # Write header comments
-            f.writelines([f"G04 {line}*\n" for line in header])
-
-            # Setup units/mode
-            units = options.mode.upper()
-            f.write(f"%MO{units}*%\n")
-            f.write("%LPD*%")
-
-            f.write("G01*\n")
-
-            # Aperture definition
-            f.write("%ADD10C,0.050000*%\n")
+    options = options or GerberOptions()
+    if options.resolution not in resolutions:
+        raise ValueError(
+            f"resolution={options.resolution} must be one of {list(resolutions)}"
+        )
+    dirpath = pathlib.Path(dirpath)
+    dirpath.mkdir(parents=True, exist_ok=True)
+    header = options.header or [
+        "Gerber file generated by gdsfactory",
+        f"Component: {component.name}",
+    ]
+
+    # Each layer and the vertices of its polygons in integer file coordinates
+    buffers = get_polygons_buffers(
+        component, by="tuple", layers=list(layermap_to_gerber_layer), in_dbu=True
+    )
+    scale = component.kcl.dbu * 10 ** resolutions[options.resolution]
 
-            # Only supports polygons for now
-            if layer_tup in layer_to_polygons.keys():
-                for poly in layer_to_polygons[layer_tup]:
-                    f.write(polygon(poly))  # type: ignore[arg-type]
+    jobs: list[dict[str, Any]] = []
+    for layer_tup, layer in layermap_to_gerber_layer.items():
+        buffer = buffers.get(tuple(layer_tup))  # type: ignore[arg-type]
+        if buffer is None:
+            points = np.empty((0, 2), dtype=np.int64)
+            offsets = np.zeros(1, dtype=np.int64)
+        else:
+            points = np.rint(buffer.points * scale).astype(np.int64)
+            offsets = buffer.offsets
+        jobs.append(
+            dict(
+                filepath=(dirpath / layer.name.replace(" ", "_")).with_suffix(".gbr"),
+                layer=layer,
+                points=points,
+                offsets=offsets,
+                options=options,
+                header=header,
+            )
+        )
 
-            # File end
-            f.write("M02*\n")
+    with ThreadPoolExecutor(max_workers=n_workers or len(jobs) or 1) as executor:
+        for future in [executor.submit(_write_layer, **job) for job in jobs]:
+            future.result()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,178 @@
+"""Renders Components to PNG images with KLayout."""
+
+from __future__ import annotations
+
+import hashlib
+import pathlib
+import threading
+from collections.abc import Sequence
+
+import klayout.db as kdb
+import klayout.lay as lay
+
+from gdsfactory.component import Component
+from gdsfactory.config import GDSDIR_TEMP
+from gdsfactory.technology import LayerViews
+from gdsfactory.typings import PathType
+
+
+class Renderer:
+    """Renders cells with one reusable headless LayoutView.
+
+    Each render copies only the hierarchy of the rendered cells into the view
+    layout, instead of the whole KCLayout. The layer properties file is written
+    and loaded once per LayerViews content.
+    """
+
+    def __init__(self) -> None:
+        """Creates the renderer. The LayoutView is created on the first render."""
+        self.lock = threading.Lock()
+        self.layout_view: lay.LayoutView | None = None
+        self.layer_views_hash: str | None = None
+
+    def _get_layout_view(self) -> lay.LayoutView:
+        if self.layout_view is None:
+            layout_view = lay.LayoutView()
+            layout_view.active_cellview_index = layout_view.create_layout(True)
+            self.layout_view = layout_view
+        return self.layout_view
+
+    def _load_layer_views(self, layer_views: LayerViews) -> None:
+        """Loads the layer properties into the view if they changed."""
+        layer_views_hash = hashlib.sha256(
+            layer_views.model_dump_json().encode()
+        ).hexdigest()
+        if layer_views_hash == self.layer_views_hash:
+            return
+        lyp_path = GDSDIR_TEMP / f"layer_properties_{layer_views_hash[:16]}.lyp"
+        if not lyp_path.exists():
+            layer_views.to_lyp(filepath=lyp_path)
+        self._get_layout_view().load_layer_props(str(lyp_path))
+        self.layer_views_hash = layer_views_hash
+
+    def render(
+        self,
+        components: Sequence[Component],
+        width: int = 800,
+        height: int = 600,
+        show_labels: bool = True,
+        show_ruler: bool = True,
+    ) -> list[bytes]:
+        """Returns a PNG image of each component.
+
+        The cells are copied into the view layout in one pass, so subcells
+        shared between components are copied once.
+
+        Args:
+            components: to render.
+            width: image width in pixels.
+            height: image height in pixels.
+            show_labels: if True, shows labels.
+            show_ruler: if True, shows ruler.
+        """
+        from gdsfactory.pdk import get_layer_views
+
+        with self.lock:
+            layout_view = self._get_layout_view()
+            cell_view = layout_view.cellview(layout_view.active_cellview_index)
+            layout = cell_view.layout()
+            layout.clear()
+
+            top_cells: list[int] = []
+            by_layout: dict[int, tuple[kdb.Layout, list[int], list[int]]] = {}
+            for component in components:
+                component.insert_vinsts()
+                source = component.kcl.layout
+                layout.dbu = source.dbu
+                top_cell = layout.add_cell(component.name)
+                top_cells.append(top_cell)
+                _, targets, sources = by_layout.setdefault(id(source), (source, [], []))
+                targets.append(top_cell)
+                sources.append(component.cell_index())
+            for source, targets, sources in by_layout.values():
+                cell_mapping = kdb.CellMapping()
+                cell_mapping.for_multi_cells_full(layout, targets, source, sources)
+                layout.copy_tree_shapes(source, cell_mapping)
+
+            self._load_layer_views(get_layer_views())
+            layout_view.set_config("text-visible", "true" if show_labels else "false")
+            layout_view.set_config("grid-show-ruler", "true" if show_ruler else "false")
+
+            images = []
+            for top_cell in top_cells:
+                cell_view.cell = layout.cell(top_cell)
+                layout_view.max_hier()
+                layout_view.add_missing_layers()
+                layout_view.zoom_fit()
+                pixel_buffer = layout_view.get_pixels_with_options(width, height)
+                images.append(pixel_buffer.to_png_data())
+            layout.clear()
+            return images
+
+
+renderer = Renderer()
+
+
+def to_png(
+    component: Component,
+    width: int = 800,
+    height: int = 600,
+    show_labels: bool = True,
+    show_ruler: bool = True,
+) -> bytes:
+    """Returns a PNG image of the Component.
+
+    Args:
+        component: to render.
+        width: image width in pixels.
+        height: image height in pixels.
+        show_labels: if True, shows labels.
+        show_ruler: if True, shows ruler.
+    """
+    return renderer.render(
+        [component],
+        width=width,
+        height=height,
+        show_labels=show_labels,
+        show_ruler=show_ruler,
+    )[0]
+
+
+def plot_many(
+    components: Sequence[Component],
+    dirpath: PathType | None = None,
+    width: int = 400,
+    height: int = 300,
+    show_labels: bool = True,
+    show_ruler: bool = False,
+) -> list[bytes]:
+    """Returns PNG thumbnails of the Components, rendered in one pass.
+
+    Args:
+        components: to render.
+        dirpath: optional directory to write one {component.name}.png per Component.
+        width: image width in pixels.
+        height: image height in pixels.
+        show_labels: if True, shows labels.
+        show_ruler: if True, shows ruler.
+    """
+    images = renderer.render(
+        components,
+        width=width,
+        height=height,
+        show_labels=show_labels,
+        show_ruler=show_ruler,
+    )
+    if dirpath is not None:
+        dirpath = pathlib.Path(dirpath)
+        dirpath.mkdir(parents=True, exist_ok=True)
+        for component, image in zip(components, images):
+            (dirpath / f"{component.name}.png").write_bytes(image)
+    return images
+
+
+if __name__ == "__main__":
+    import gdsfactory as gf
+
+    images = plot_many([gf.components.mzi(), gf.components.ring_single()])
+    print([len(image) for image in images])
@@ -1,13 +1,179 @@
 from __future__ import annotations
 
+import io
+import math
+from collections.abc import Iterable
 from typing import cast
 
+import kfactory as kf
+import numpy as np
 from kfactory import LayerEnum
 
 from gdsfactory.component import Component
-from gdsfactory.technology import DerivedLayer, LayerStack, LayerViews, LogicalLayer
+from gdsfactory.functions import PolygonBuffer, get_polygon_buffer
+from gdsfactory.technology import (
+    DerivedLayer,
+    LayerLevel,
+    LayerStack,
+    LayerViews,
+    LogicalLayer,
+)
+from gdsfactory.technology.layer_stack import get_layout_with_derived_layers
 from gdsfactory.typings import LayerSpecs
 
+_CHUNK_SIZE = 10_000  # polygons or instances formatted per write
+# path commands for the first vertex of a ring, a horizontal, vertical or
+# diagonal relative line to the other vertices, closing the ring after the last one
+_PATH_TEMPLATES = np.array(
+    ["M%d %d", "h%d", "v%d", "l%d %d", "M%d %dz", "h%dz", "v%dz", "l%d %dz"],
+    dtype=object,
+)
+
+
+def _get_path_data(buffer: PolygonBuffer) -> str:
+    """Returns compact SVG path data for all rings of a buffer.
+
+    Each ring starts with an absolute move followed by relative lines in dbu.
+
+    Args:
+        buffer: integer vertices in dbu. Holes must wind opposite to hulls.
+    """
+    points = buffer.points
+    offsets = buffer.offsets
+    if len(points) == 0:
+        return ""
+    deltas = np.diff(points, axis=0, prepend=points[:1])
+    first = np.zeros(len(points), dtype=bool)
+    first[offsets[:-1]] = True
+    last = np.zeros(len(points), dtype=bool)
+    last[offsets[1:] - 1] = True
+
+    dx_zero = deltas[:, 0] == 0
+    dy_zero = deltas[:, 1] == 0
+    kind = np.where(dy_zero, 1, np.where(dx_zero, 2, 3))
+    kind[first] = 0
+    values = np.where(first[:, None], points, deltas)
+    keep = np.ones(points.shape, dtype=bool)
+    keep[kind == 1, 1] = False
+    keep[kind == 2, 0] = False
+
+    text = "".join(_PATH_TEMPLATES[kind + 4 * last].tolist())
+    return text % tuple(values[keep].tolist())
+
+
+def _get_transform(trans: kf.kdb.ICplxTrans) -> str:
+    """Returns the SVG transform attribute of an instance transformation in dbu."""
+    if trans.is_complex() or trans.is_mirror() or trans.angle:
+        angle = math.radians(trans.angle)
+        mag = trans.mag
+        sign = -1 if trans.is_mirror() else 1
+        a = mag * math.cos(angle)
+        b = mag * math.sin(angle)
+        matrix = (a, b, -b * sign, a * sign, trans.disp.x, trans.disp.y)
+        return 'transform="matrix({})"'.format(" ".join(f"{v:.12g}" for v in matrix))
+    return f'x="{trans.disp.x}" y="{trans.disp.y}"'
+
+
+def _write_uses(
+    f: io.TextIOBase, href: str, instances: Iterable[kf.kdb.Instance]
+) -> None:
+    """Writes one <use> element per instance and array member.
+
+    Args:
+        f: file to write to.
+        href: id of the element to place.
+        instances: of the referenced cell.
+    """
+    for inst in instances:
+        trans = inst.cplx_trans
+        if not inst.is_regular_array():
+            f.write(f'<use xlink:href="#{href}" {_get_transform(trans)}/>\n')
+            continue
+
+        i, j = np.meshgrid(np.arange(inst.na), np.arange(inst.nb), indexing="ij")
+        i, j = i.ravel(), j.ravel()
+        disp = np.stack(
+            [
+                trans.disp.x + i * inst.a.x + j * inst.b.x,
+                trans.disp.y + i * inst.a.y + j * inst.b.y,
+            ],
+            axis=1,
+        )
+        if trans.is_complex() or trans.is_mirror() or trans.angle:
+            for x, y in disp.tolist():
+                trans.disp = kf.kdb.Vector(x, y)
+                f.write(f'<use xlink:href="#{href}" {_get_transform(trans)}/>\n')
+            continue
+        template = f'<use xlink:href="#{href}" x="%d" y="%d"/>\n'
+        for start in range(0, len(disp), _CHUNK_SIZE):
+            chunk = disp[start : start + _CHUNK_SIZE]
+            f.write(template * len(chunk) % tuple(chunk.ravel().tolist()))
+
+
+def _write_paths(f: io.TextIOBase, region: kf.kdb.Region) -> None:
+    """Writes the polygons of a region as <path> elements, a chunk at a time."""
+    polygons: list[kf.kdb.Polygon] = []
+    for polygon in region.each():
+        polygons.append(polygon)
+        if len(polygons) == _CHUNK_SIZE:
+            buffer = get_polygon_buffer(polygons, holes=True)
+            f.write(f'<path d="{_get_path_data(buffer)}"/>\n')
+            polygons = []
+    if polygons:
+        buffer = get_polygon_buffer(polygons, holes=True)
+        f.write(f'<path d="{_get_path_data(buffer)}"/>\n')
+
+
+def _get_cell_id(cell_index: int, layer: tuple[int, int]) -> str:
+    return f"c{cell_index}_{layer[0]}_{layer[1]}"
+
+
+def _write_defs(
+    f: io.TextIOBase, top_cell: kf.kdb.Cell, layers: list[tuple[int, int]]
+) -> None:
+    """Writes each cell once per layer into <defs>, children first.
+
+    A definition holds the polygons of the cell and <use> elements for the
+    child cells with shapes on the same layer.
+
+    Args:
+        f: file to write to.
+        top_cell: cell to write with its hierarchy.
+        layers: to write.
+    """
+    layout = top_cell.layout()
+    cell_indexes = set(top_cell.called_cells()) | {top_cell.cell_index()}
+    layer_indexes = [layout.layer(*layer) for layer in layers]
+    defined: set[tuple[int, int]] = set()
+
+    f.write("<defs>\n")
+    for cell_index in layout.each_cell_bottom_up():
+        if cell_index not in cell_indexes:
+            continue
+        cell = layout.cell(cell_index)
+        for layer, layer_index in zip(layers, layer_indexes):
+            region = kf.kdb.Region(cell.shapes(layer_index))
+            instances: dict[int, list[kf.kdb.Instance]] = {}
+            for inst in cell.each_inst():
+                if (inst.cell_index, layer_index) in defined:
+                    instances.setdefault(inst.cell_index, []).append(inst)
+            if region.is_empty() and not instances:
+                continue
+
+            cell_id = _get_cell_id(cell_index, layer)
+            defined.add((cell_index, layer_index))
+            if not instances:
+                buffer = get_polygon_buffer(list(region.each()), holes=True)
+                f.write(f'<path id="{cell_id}" d="{_get_path_data(buffer)}"/>\n')
+                continue
+            f.write(f'<g id="{cell_id}">\n')
+            if not region.is_empty():
+                _write_paths(f, region)
+            for child_index, child_instances in instances.items():
+                _write_uses(f, _get_cell_id(child_index, layer), child_instances)
+            f.write("</g>\n")
+    f.write("</defs>\n")
+
 
 def to_svg(
     component: Component,
@@ -16,9 +182,13 @@ def to_svg(
     exclude_layers: LayerSpecs | None = None,
     filename: str = "component.svg",
     scale: float = 1.0,
+    hierarchical: bool = True,
 ) -> None:
     """Write a 2D SVG file from a component.
 
+    Coordinates are written as integers in database units with relative path
+    commands. The file is written incrementally.
+
     Args:
         component: The component to render.
         layer_views: Layer colors from Klayout Layer Properties file.
@@ -28,6 +198,9 @@ def to_svg(
         exclude_layers: Layers to exclude from the SVG.
         filename: Output SVG filename.
         scale: Scaling factor for the SVG dimensions.
+        hierarchical: if True, writes each cell once per layer in <defs> and
+            places its instances with <use>. Derived layers are evaluated per cell.
+            If False, writes the flattened polygons.
     """
     from gdsfactory.pdk import (
         get_active_pdk,
@@ -36,12 +209,6 @@ def to_svg(
         get_layer_views,
     )
 
-    try:
-        from shapely.geometry import Polygon
-    except ImportError as e:
-        print("You need to `pip install shapely` to use the `to_svg` function.")
-        raise e
-
     layer_views = layer_views or get_layer_views()
     layer_stack = layer_stack or get_layer_stack()
 
@@ -49,108 +216,128 @@ def to_svg(
     exclude_layers = exclude_layers or ()
     exclude_layer_indices = [get_layer(layer) for layer in exclude_layers]
 
-    # Prepare the component with boolean operations applied
-    component_with_booleans = layer_stack.get_component_with_derived_layers(component)
-    polygons_per_layer = component_with_booleans.get_polygons_points(merge=True)
+    # Levels adding shapes to each layer
+    target_to_levels: dict[tuple[int, int], list[tuple[str, LayerLevel]]] = {}
+    for name, level in layer_stack.layers.items():
+        target = level.derived_layer or level.layer
+        if not isinstance(target, LogicalLayer):
+            raise ValueError(
+                "If derived_layer is not provided, the LayerLevel layer must be a LogicalLayer"
+            )
+        assert isinstance(target.layer, tuple | LayerEnum)
+        target_tuple = cast(tuple[int, int], tuple(target.layer))
+        target_to_levels.setdefault(target_tuple, []).append((name, level))
+
+    # Layers to write, in the order of the layer stack
+    layer_to_levels: dict[tuple[int, int], list[tuple[str, LayerLevel]]] = {}
+    for level in layer_stack.layers.values():
+        layer = level.layer
+
+        # Determine the layer tuple based on its type
+        if isinstance(layer, LogicalLayer):
+            assert isinstance(layer.layer, tuple | LayerEnum)
+            layer_tuple = cast(tuple[int, int], tuple(layer.layer))
+        elif isinstance(layer, DerivedLayer):
+            assert level.derived_layer is not None
+            assert isinstance(level.derived_layer.layer, tuple | LayerEnum)
+            layer_tuple = cast(tuple[int, int], tuple(level.derived_layer.layer))
+        else:
+            raise ValueError(f"Layer {layer!r} is not a DerivedLayer or LogicalLayer")
+
+        # Skip excluded layers and layers without levels
+        if get_layer(layer_tuple) in exclude_layer_indices:
+            continue
+        if layer_tuple in target_to_levels:
+            layer_to_levels[layer_tuple] = target_to_levels[layer_tuple]
+
+    # Prepare the layer shapes with boolean operations applied
+    names = [name for levels in layer_to_levels.values() for name, _ in levels]
+    if hierarchical:
+        component.insert_vinsts()
+        layout = get_layout_with_derived_layers(component, layer_stack.filtered(names))
+        top_cell = layout.top_cell()
+    else:
+        component_with_booleans = layer_stack.filtered(
+            names
+        ).get_component_with_derived_layers(component)
+        layout = component_with_booleans.kcl.layout
+        top_cell = component_with_booleans.kdb_cell
+
+    # Retrieve layer view properties, skipping empty and hidden layers
+    colors: dict[tuple[int, int], str] = {}
+    bbox = kf.kdb.Box()
+    for layer_tuple in layer_to_levels:
+        layer_bbox = top_cell.bbox(layout.layer(*layer_tuple))
+        if layer_bbox.empty():
+            continue
+        layer_view = layer_views.get_from_tuple(layer_tuple)
+        if not layer_view.visible or layer_view.fill_color is None:
+            continue
+        colors[layer_tuple] = layer_view.fill_color.as_hex(format="short")
+        bbox += layer_bbox
+
+    if not colors:
+        raise ValueError(
+            f"The component '{component.name}' does not contain any polygons in the specified layers "
+            f"or the layers are excluded based on the active PDK '{get_active_pdk().name}'."
+        )
 
     # Initialize SVG parameters
-    xsize = component_with_booleans.xsize
-    ysize = component_with_booleans.ysize
-    dcx = component_with_booleans.center[0]
-    dcy = component_with_booleans.center[1]
-    dx, dy = dcx - xsize / 2, dcy - ysize / 2
-
-    has_polygons = False
+    dbu = layout.dbu
+    xsize = bbox.width() * dbu
+    ysize = bbox.height() * dbu
+    transform = (
+        f"matrix({scale * dbu:.12g} 0 0 {-scale * dbu:.12g} "
+        f"{-bbox.left * dbu * scale:.12g} {bbox.top * dbu * scale:.12g})"
+    )
 
-    with open(filename, "w") as f:
+    with open(filename, "w", buffering=1 << 20) as f:
         # Write SVG header
         f.write('<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n')
         f.write(
             f'<svg width="{xsize * scale}" height="{ysize * scale}" '
-            'version="1.1" xmlns="http://www.w3.org/2000/svg">\n'
+            'version="1.1" xmlns="http://www.w3.org/2000/svg" '
+            'xmlns:xlink="http://www.w3.org/1999/xlink">\n'
         )
+        if hierarchical:
+            _write_defs(f, top_cell, list(colors))
 
-        # Iterate through each layer in the stack
-        for level in layer_stack.layers.values():
-            layer = level.layer
-
-            # Determine the layer tuple based on its type
-            if isinstance(layer, LogicalLayer):
-                assert isinstance(layer.layer, tuple | LayerEnum)
-                layer_tuple = cast(tuple[int, int], tuple(layer.layer))
-            elif isinstance(layer, DerivedLayer):
-                assert level.derived_layer is not None
-                assert isinstance(level.derived_layer.layer, tuple | LayerEnum)
-                layer_tuple = cast(tuple[int, int], tuple(level.derived_layer.layer))
-            else:
-                raise ValueError(
-                    f"Layer {layer!r} is not a DerivedLayer or LogicalLayer"
-                )
-
-            layer_index = get_layer(layer_tuple)
-
-            # Skip excluded layers
-            if layer_index in exclude_layer_indices:
-                continue
-
-            # Skip layers without polygons
-            if layer_index not in polygons_per_layer:
-                continue
-
-            # Retrieve layer view properties
-            layer_view = layer_views.get_from_tuple(layer_tuple)
-            if not layer_view.visible or layer_view.fill_color is None:
-                continue
-
-            # Convert color to hex
-            color_hex = layer_view.fill_color.as_hex(format="short")
-
-            # Retrieve polygons for the current layer
-            polygons = polygons_per_layer[layer_index]
-            if not polygons:
-                continue
-
-            # Start SVG group for the layer
+        f.write(f'<g transform="{transform}">\n')
+        for layer_tuple, color_hex in colors.items():
             f.write(
-                f'  <g id="layer{layer_tuple[0]:03d}_datatype{layer_tuple[1]:03d}">\n'
+                f'<g id="layer{layer_tuple[0]:03d}_datatype{layer_tuple[1]:03d}" '
+                f'style="fill:{color_hex};stroke:none;">\n'
             )
-
-            for polygon_points in polygons:
-                # Create a Shapely polygon for validation and processing
-                polygon = Polygon(polygon_points)
-                if not polygon.is_valid:
-                    polygon = polygon.buffer(0)  # Attempt to fix invalid polygons
-
-                if not polygon.is_valid or polygon.is_empty:
-                    continue  # Skip invalid or empty polygons
-
-                # Construct the SVG path string
-                path_d = (
-                    "M "
-                    + " L ".join(
-                        f"{(x - dx) * scale:.6f} {(ysize - (y - dy)) * scale:.6f}"
-                        for x, y in polygon.exterior.coords
-                    )
-                    + " Z"
-                )
-
-                # Write the path to SVG
-                f.write(
-                    f'    <path style="fill:{color_hex};stroke:none;" d="{path_d}"/>\n'
-                )
-                has_polygons = True
-
-            # Close SVG group
-            f.write("  </g>\n")
+            if hierarchical:
+                cell_id = _get_cell_id(top_cell.cell_index(), layer_tuple)
+                f.write(f'<use xlink:href="#{cell_id}"/>\n')
+            else:
+                region = kf.kdb.Region(top_cell.shapes(layout.layer(*layer_tuple)))
+                _write_paths(f, region)
+            f.write("</g>\n")
+        f.write("</g>\n")
 
         # Close SVG tag
         f.write("</svg>\n")
 
-    if not has_polygons:
-        raise ValueError(
-            f"The component '{component.name}' does not contain any polygons in the specified layers "
-            f"or the layers are excluded based on the active PDK '{get_active_pdk().name}'."
-        )
+
+def _demo_to_svg_benchmark() -> None:
+    """Prints the time and size of the hierarchical and flat SVG of the sample reticle."""
+    import os
+    import tempfile
+    import time
+
+    from gdsfactory.samples.sample_reticle import sample_reticle
+
+    component = sample_reticle()
+    with tempfile.TemporaryDirectory() as dirpath:
+        for hierarchical in (True, False):
+            filename = os.path.join(dirpath, "reticle.svg")
+            t0 = time.perf_counter()
+            to_svg(component, filename=filename, hierarchical=hierarchical)
+            t = time.perf_counter() - t0
+            size = os.path.getsize(filename) / 1e6
+            print(f"{hierarchical=}: {t:.2f} s, {size:.2f} MB")
 
 
 if __name__ == "__main__":
@@ -1,6 +1,10 @@
 from __future__ import annotations
 
+import dataclasses
+import hashlib
+import struct
 import warnings
+import weakref
 from collections.abc import Callable, Sequence
 from functools import partial
 from typing import TYPE_CHECKING, Any, Literal, TypeAlias
@@ -8,6 +12,7 @@ from typing import TYPE_CHECKING, Any, Literal, TypeAlias
 import kfactory as kf
 import numpy as np
 import numpy.typing as npt
+from cachetools import LRUCache
 from numpy import cos, float64, sin
 
 import gdsfactory as gf
@@ -48,16 +53,58 @@ def move_port_to_zero(
     return c
 
 
+# one LRU cache per layout, dropped with its layout, keyed on cell index
+_layer_indexes_cache: weakref.WeakKeyDictionary[
+    kf.kdb.Layout, LRUCache[int, tuple[str, kf.kdb.Box, list[int]]]
+] = weakref.WeakKeyDictionary()
+_LAYER_INDEXES_CACHE_MAXSIZE = 10_000
+
+
+def get_layer_indexes(component: kf.ProtoTKCell[Any]) -> list[int]:
+    """Returns the indexes of the layers with shapes in a component or its children.
+
+    Locked components can no longer gain shapes, so their result is cached.
+
+    Args:
+        component: to get the layer indexes from.
+    """
+    kdb_cell = component.kdb_cell
+    layout = component.kcl.layout
+    if not component.locked:
+        return [
+            layer_index
+            for layer_index in layout.layer_indexes()
+            if not kdb_cell.bbox(layer_index).empty()
+        ]
+
+    cache = _layer_indexes_cache.get(layout)
+    if cache is None:
+        cache = _layer_indexes_cache[layout] = LRUCache(
+            maxsize=_LAYER_INDEXES_CACHE_MAXSIZE
+        )
+    key = kdb_cell.cell_index()
+    name, bbox = kdb_cell.name, kdb_cell.bbox()
+    cached = cache.get(key)
+    if cached is None or cached[0] != name or cached[1] != bbox:
+        layer_indexes = [
+            layer_index
+            for layer_index in layout.layer_indexes()
+            if not kdb_cell.bbox(layer_index).empty()
+        ]
+        cached = cache[key] = (name, bbox, layer_indexes)
+    return list(cached[2])
+
+
 def get_layers(component: Component) -> list[tuple[int, int]]:
     """Returns the layers of a component.
 
     Args:
         component: to get the layers from.
     """
+    layout = component.kcl.layout
     return [
         (info.layer, info.datatype)
-        for info in component.kcl.layer_infos()
-        if not component.bbox(component.kcl.layer(info)).empty()
+        for info in map(layout.get_info, get_layer_indexes(component))
     ]
 
 
@@ -156,17 +203,19 @@ def get_polygons(
     polygons: GetPolygonsResult = {}
 
     c = component_or_instance
+    cell = c if isinstance(c, gf.Component) else c.cell
+    populated_layer_indexes = get_layer_indexes(cell)
+    populated = set(populated_layer_indexes)
     if layers is None:
-        layers = [
-            (info.layer, info.datatype)
-            for info in c.kcl.layer_infos()
-            if not c.bbox(c.kcl.layer(info)).empty()
-        ]
-
-    layer_indexes = [get_layer(layer) for layer in layers]
+        layer_indexes = populated_layer_indexes
+    else:
+        layer_indexes = [get_layer(layer) for layer in layers]
 
     for layer_index in layer_indexes:
         layer_key = get_key(layer_index)
+        if layer_index not in populated:
+            polygons.setdefault(layer_key, [])
+            continue
         if isinstance(component_or_instance, gf.Component):
             r = gf.Region(c.begin_shapes_rec(layer_index))
         else:
@@ -184,14 +233,116 @@ def get_polygons(
     return polygons
 
 
-def get_polygons_points(
+_POLYGON_STRING_TO_NUMBERS = str.maketrans("(),;/", "     ")
+# Polygon.to_bytes is only available in klayout>=0.30.9. Its layout is a header
+# (uint16 version, uint64 number of contours), then per contour a uint64 number
+# of points followed by the int64 x, y of each point.
+_POLYGON_BYTES_VERSION = 1
+_POLYGON_BYTES_HEADER = struct.Struct("<HQ")
+_POLYGON_BYTES_CONTOUR_HEADER = struct.Struct("<Q")
+_HAS_POLYGON_TO_BYTES = hasattr(kf.kdb.Polygon, "to_bytes") and hasattr(
+    kf.kdb.SimplePolygon, "to_bytes"
+)
+
+
+def _get_points_dbu_from_text(
+    polygons: "Sequence[kf.kdb.Polygon | kf.kdb.SimplePolygon]",
+) -> npt.NDArray[np.int64]:
+    """Returns the vertices of all polygons in dbu, parsed from the polygon strings.
+
+    Args:
+        polygons: polygons without properties.
+    """
+    text = " ".join(str(polygon) for polygon in polygons)
+    text = text.translate(_POLYGON_STRING_TO_NUMBERS)
+    return np.array(text.split(), dtype=np.int64).reshape(-1, 2)
+
+
+def _get_points_dbu(
+    polygons: "Sequence[kf.kdb.Polygon | kf.kdb.SimplePolygon]",
+    ring_sizes: Sequence[Sequence[int]],
+) -> npt.NDArray[np.int64]:
+    """Returns the vertices of all polygons in dbu as one (n, 2) int64 array.
+
+    Reads the points straight from the binary serialization of each polygon.
+    Parses the polygon strings instead on klayout versions without
+    Polygon.to_bytes.
+
+    Args:
+        polygons: polygons without properties.
+        ring_sizes: number of points of each contour per polygon (hull first, then holes).
+
+    Raises:
+        ValueError: if the binary serialization does not have the expected version,
+            number of contours or number of points.
+    """
+    if not _HAS_POLYGON_TO_BYTES:
+        return _get_points_dbu_from_text(polygons)
+
+    chunks: list[bytes] = []
+    for polygon, sizes in zip(polygons, ring_sizes):
+        data = polygon.to_bytes()
+        version, n_contours = _POLYGON_BYTES_HEADER.unpack_from(data)
+        if version != _POLYGON_BYTES_VERSION or n_contours != len(sizes):
+            raise ValueError(
+                f"Unsupported Polygon.to_bytes layout (version {version}, "
+                f"{n_contours} contours for {len(sizes)} rings) in klayout "
+                f"{kf.kdb.__version__}"
+            )
+        start = _POLYGON_BYTES_HEADER.size
+        for n in sizes:
+            (n_points,) = _POLYGON_BYTES_CONTOUR_HEADER.unpack_from(data, start)
+            if n_points != n:
+                raise ValueError(
+                    f"Unsupported Polygon.to_bytes layout ({n_points} points for a "
+                    f"ring of {n}) in klayout {kf.kdb.__version__}"
+                )
+            start += _POLYGON_BYTES_CONTOUR_HEADER.size
+            chunks.append(data[start : start + 16 * n])
+            start += 16 * n
+        if start != len(data):
+            raise ValueError(
+                f"Unsupported Polygon.to_bytes layout ({len(data)} bytes, expected "
+                f"{start}) in klayout {kf.kdb.__version__}"
+            )
+    return np.frombuffer(bytearray(b"".join(chunks)), dtype=np.int64).reshape(-1, 2)
+
+
+@dataclasses.dataclass(frozen=True)
+class PolygonBuffer:
+    """Vertices of all polygons on a layer in one contiguous array (CSR layout).
+
+    Ring i is points[offsets[i]:offsets[i + 1]].
+    Polygon j is rings polygon_offsets[j] to polygon_offsets[j + 1]: its hull, then its holes.
+    """
+
+    points: npt.NDArray[np.int64] | npt.NDArray[np.float64]
+    offsets: npt.NDArray[np.int64]
+    polygon_offsets: npt.NDArray[np.int64]
+
+    def __len__(self) -> int:
+        """Returns the number of polygons."""
+        return len(self.polygon_offsets) - 1
+
+    def rings(self) -> list[npt.NDArray[Any]]:
+        """Returns one (n, 2) view into points per ring."""
+        if len(self.offsets) < 2:
+            return []
+        return np.split(self.points, self.offsets[1:-1])
+
+
+def get_polygons_buffers(
     component_or_instance: "Component | ComponentReference",
     merge: bool = False,
     scale: float | None = None,
     by: Literal["index", "name", "tuple"] = "index",
     layers: LayerSpecs | None = None,
-) -> dict[int | str | tuple[int, int], list[npt.NDArray[np.floating[Any]]]]:
-    """Returns a dict with list of points per layer.
+    holes: bool = False,
+    in_dbu: bool = False,
+) -> dict[int | str | tuple[int, int], PolygonBuffer]:
+    """Returns a dict with one contiguous vertex buffer per layer.
+
+    Points are read in bulk from the binary form of each polygon, with no Python loop per point.
 
     Args:
         component_or_instance: to extract the polygons.
@@ -199,37 +350,90 @@ def get_polygons_points(
         scale: if True, scales the points.
         by: the format of the resulting keys in the dictionary ('index', 'name', 'tuple').
         layers: list of layer specs to extract the polygons from. If None, extracts all layers.
+        holes: if True, returns holes as separate rings.
+            Otherwise each polygon is one ring, with holes joined through cut lines.
+        in_dbu: if True, returns int64 points in dbu and ignores scale.
+            Otherwise returns float64 points in um.
     """
     polygons_dict = get_polygons(
         component_or_instance=component_or_instance, merge=merge, by=by, layers=layers
     )
-    polygons_points: dict[
-        tuple[int, int] | str | int, list[npt.NDArray[np.floating[Any]]]
-    ] = {}
+    dbu = component_or_instance.kcl.dbu
+    buffers: dict[int | str | tuple[int, int], PolygonBuffer] = {}
+
     for layer, polygons in polygons_dict.items():
-        all_points: list[npt.NDArray[np.floating[Any]]] = []
-        for polygon in polygons:
+        buffer = get_polygon_buffer(polygons, holes=holes)
+        if not in_dbu:
+            points = buffer.points * dbu
             if scale:
-                points = np.array(
-                    [
-                        (point.x * scale, point.y * scale)
-                        for point in polygon.to_simple_polygon()
-                        .to_dtype(component_or_instance.kcl.dbu)
-                        .each_point()
-                    ]
-                )
-            else:
-                points = np.array(
-                    [
-                        (point.x, point.y)
-                        for point in polygon.to_simple_polygon()
-                        .to_dtype(component_or_instance.kcl.dbu)
-                        .each_point()
-                    ]
-                )
-            all_points.append(points)
-        polygons_points[layer] = all_points
-    return polygons_points
+                points *= scale
+            buffer = dataclasses.replace(buffer, points=points)
+        buffers[layer] = buffer
+    return buffers
+
+
+def get_polygon_buffer(
+    polygons: "Sequence[kf.kdb.Polygon | kf.kdb.SimplePolygon]", holes: bool = False
+) -> PolygonBuffer:
+    """Returns the vertices of polygons in dbu as one contiguous buffer.
+
+    Args:
+        polygons: KLayout polygons.
+        holes: if True, returns holes as separate rings.
+            Otherwise each polygon is one ring, with holes joined through cut lines.
+    """
+    if holes:
+        plain_polygons = [kf.kdb.Polygon(polygon) for polygon in polygons]
+        sizes = [
+            [
+                polygon.num_points_hull(),
+                *(polygon.num_points_hole(i) for i in range(polygon.holes())),
+            ]
+            for polygon in plain_polygons
+        ]
+        points = _get_points_dbu(plain_polygons, sizes)
+    else:
+        simple_polygons = [polygon.to_simple_polygon() for polygon in polygons]
+        sizes = [[polygon.num_points()] for polygon in simple_polygons]
+        points = _get_points_dbu(simple_polygons, sizes)
+
+    ring_sizes = [n for polygon_sizes in sizes for n in polygon_sizes]
+    rings_per_polygon = [len(polygon_sizes) for polygon_sizes in sizes]
+    offsets = np.zeros(len(ring_sizes) + 1, dtype=np.int64)
+    np.cumsum(ring_sizes, out=offsets[1:])
+    polygon_offsets = np.zeros(len(rings_per_polygon) + 1, dtype=np.int64)
+    np.cumsum(rings_per_polygon, out=polygon_offsets[1:])
+    return PolygonBuffer(
+        points=points, offsets=offsets, polygon_offsets=polygon_offsets
+    )
+
+
+def get_polygons_points(
+    component_or_instance: "Component | ComponentReference",
+    merge: bool = False,
+    scale: float | None = None,
+    by: Literal["index", "name", "tuple"] = "index",
+    layers: LayerSpecs | None = None,
+) -> dict[int | str | tuple[int, int], list[npt.NDArray[np.floating[Any]]]]:
+    """Returns a dict with list of points per layer.
+
+    The arrays are views into one buffer per layer, see get_polygons_buffers.
+
+    Args:
+        component_or_instance: to extract the polygons.
+        merge: if True, merges the polygons.
+        scale: if True, scales the points.
+        by: the format of the resulting keys in the dictionary ('index', 'name', 'tuple').
+        layers: list of layer specs to extract the polygons from. If None, extracts all layers.
+    """
+    buffers = get_polygons_buffers(
+        component_or_instance=component_or_instance,
+        merge=merge,
+        scale=scale,
+        by=by,
+        layers=layers,
+    )
+    return {layer: buffer.rings() for layer, buffer in buffers.items()}
 
 
 def get_point_inside(
@@ -375,6 +579,8 @@ def extrude_path(
     Returns:
         numpy 2D array of shape (2*N, 2).
     """
+    from gdsfactory.path import extrude_cache
+
     grid = grid or gf.kcl.dbu
 
     assert grid is not None
@@ -382,6 +588,22 @@ def extrude_path(
     if isinstance(points, list):
         points = np.stack([(p[0], p[1]) for p in points], axis=0)
 
+    key = (
+        "extrude_path",
+        hashlib.sha1(np.ascontiguousarray(points).tobytes()).hexdigest(),
+        points.shape,
+        points.dtype.str,
+        width,
+        with_manhattan_facing_angles,
+        spike_length,
+        start_angle,
+        end_angle,
+        grid,
+    )
+    cached = extrude_cache.get(key)
+    if cached is not None:
+        return np.array(cached)
+
     a = angles_deg(points)
     if with_manhattan_facing_angles:
         _start_angle = snap_angle(a[0] + 180)
@@ -420,7 +642,9 @@ def extrude_path(
     else:
         pts = np.vstack((points + offsets, points_back))
 
-    return np.array(np.round(pts / grid) * grid)
+    pts = np.array(np.round(pts / grid) * grid)
+    extrude_cache.set(key, pts.copy())
+    return pts
 
 
 def trim(
@@ -18,6 +18,7 @@ Assumes two ports are connected when they have same width, x, y
 
 from __future__ import annotations
 
+import copy
 from collections import defaultdict
 from collections.abc import Callable, Sequence
 from pprint import pprint
@@ -25,6 +26,7 @@ from typing import Any, Protocol
 from warnings import warn
 
 import numpy as np
+import numpy.typing as npt
 from kfactory import DKCell, LayerEnum
 
 from gdsfactory import Port, typings
@@ -34,7 +36,7 @@ from gdsfactory.component import (
     ComponentReferences,
 )
 from gdsfactory.name import clean_name
-from gdsfactory.serialization import clean_dict, clean_value_json
+from gdsfactory.serialization import clean_dict, clean_value_json, get_hash
 from gdsfactory.typings import LayerSpec
 
 
@@ -175,6 +177,22 @@ def _has_ports_on_same_location(reference: ComponentReference) -> bool:
     return False
 
 
+def _cell_has_ports_on_same_location(cell: DKCell) -> bool:
+    """Check if a cell has any ports on the same location.
+
+    For references with a simple transformation this matches
+    _has_ports_on_same_location, as it preserves coincident ports.
+    """
+    port_locations = set()
+    for port in cell.ports:
+        disp = port.trans.disp
+        port_loc = (disp.x, disp.y)
+        if port_loc in port_locations:
+            return True
+        port_locations.add(port_loc)
+    return False
+
+
 def get_netlist(
     component: DKCell,
     exclude_port_types: Sequence[str] | None = ("placement", "pad", "bump"),
@@ -224,11 +242,21 @@ def get_netlist(
     top_ports_list: set[str] = set()
 
     references = _get_references_to_netlist(component)
+    cells_with_ports_on_same_location: dict[int, bool] = {}
 
     for reference in references:
         # Skip references with ports on the same location
-        if _has_ports_on_same_location(reference):
-            continue
+        if reference.is_complex():
+            if _has_ports_on_same_location(reference):
+                continue
+        else:
+            cell_index = reference.cell_index
+            if cell_index not in cells_with_ports_on_same_location:
+                cells_with_ports_on_same_location[cell_index] = (
+                    _cell_has_ports_on_same_location(reference.cell)
+                )
+            if cells_with_ports_on_same_location[cell_index]:
+                continue
 
         c = reference.cell
         origin = reference.dtrans.disp
@@ -276,7 +304,6 @@ def get_netlist(
                     "pitch_a": (reference.instance.da.x, reference.instance.da.y),
                     "pitch_b": (reference.instance.db.x, reference.instance.db.y),
                 }
-            reference_name = get_instance_name(reference)
             for ia in range(reference.na):
                 for ib in range(reference.nb):
                     for port in reference.cell.ports:
@@ -287,7 +314,6 @@ def get_netlist(
         else:
             # lower level ports
             for port_ in reference.ports:
-                reference_name = get_instance_name(reference)
                 src = f"{reference_name},{port_.name}"
                 name2port[src] = port_
                 ports_by_type[port_.port_type].append(src)
@@ -390,30 +416,37 @@ def _extract_connections(
     if raise_error_for_warnings is None:
         raise_error_for_warnings = connection_error_types.get(port_type, [])
 
-    unconnected_port_names: list[str] = list(port_names)
+    port_names = list(port_names)
+    unconnected_port_names: list[str] = []
     connections: list[list[str]] = []
 
-    by_xy: dict[tuple[float, float], list[str]] = defaultdict(list)
+    xy, angles, widths, is_complex = _get_port_table(port_names, ports)
+    groups = _group_ports_by_xy(xy)
 
-    for port_name in unconnected_port_names:
-        port = ports[port_name]
-        by_xy[port.to_itype().center].append(port_name)
+    # pairs that the batched check proves clean skip the per-pair optical validator
+    needs_validation: dict[int, bool] = {}
+    if connection_validator is validate_optical_connection:
+        needs_validation = _get_optical_pairs_to_validate(
+            groups, port_names, angles, widths, is_complex
+        )
 
-    unconnected_port_names = []
+    for group in groups:
+        ports_at_xy = [port_names[i] for i in group]
 
-    for xy, ports_at_xy in by_xy.items():
         if len(ports_at_xy) == 1:
             unconnected_port_names.append(ports_at_xy[0])
 
         elif len(ports_at_xy) == 2:
-            port1 = ports[ports_at_xy[0]]
-            port2 = ports[ports_at_xy[1]]
-            connection_validator(port1, port2, ports_at_xy, warnings)
+            if needs_validation.get(group[0], True):
+                port1 = ports[ports_at_xy[0]]
+                port2 = ports[ports_at_xy[1]]
+                connection_validator(port1, port2, ports_at_xy, warnings)
             connections.append(ports_at_xy)
 
         elif not allow_multiple:
             warnings["multiple_connections"].append(ports_at_xy)
-            warn(f"Found multiple connections at {xy}:{ports_at_xy}", stacklevel=3)
+            center = tuple(int(v) for v in xy[group[0]])
+            warn(f"Found multiple connections at {center}:{ports_at_xy}", stacklevel=3)
 
         else:
             # Iterates over the list of multiple ports to create related two-port connectivity
@@ -452,6 +485,99 @@ def _extract_connections(
     return connections, dict(warnings)
 
 
+def _get_port_table(
+    port_names: Sequence[str], ports: dict[str, typings.Port]
+) -> tuple[
+    npt.NDArray[np.int64],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.int64],
+    npt.NDArray[np.bool_],
+]:
+    """Returns port centers, angles and widths as arrays in one pass.
+
+    Centers and widths are in dbu, angles in multiples of 90 degrees.
+    is_complex flags ports with a complex transformation (off-grid or all-angle),
+    whose angle is only approximated by the simple transformation.
+
+    Args:
+        port_names: list of port names.
+        ports: dict of port names to Port objects.
+    """
+    # ports are Python objects, so reading them is the only per-port Python step
+    rows = []
+    for port_name in port_names:
+        port = ports[port_name]
+        base = port.base
+        trans = port.trans
+        disp = trans.disp
+        rows.append(
+            (
+                disp.x,
+                disp.y,
+                trans.angle,
+                base.cross_section.width,
+                base.dcplx_trans is not None,
+            )
+        )
+    table = np.array(rows, dtype=np.int64).reshape(-1, 5)
+    return table[:, :2], table[:, 2], table[:, 3], table[:, 4].astype(np.bool_)
+
+
+def _group_ports_by_xy(xy: npt.NDArray[np.int64]) -> list[list[int]]:
+    """Returns port indices grouped by center.
+
+    Groups are ordered by first occurrence and keep the port order within each group.
+
+    Args:
+        xy: (n, 2) array of integer port centers.
+    """
+    if not len(xy):
+        return []
+
+    _, first, inverse, counts = np.unique(
+        xy, axis=0, return_index=True, return_inverse=True, return_counts=True
+    )
+    members = np.argsort(inverse.ravel(), kind="stable")
+    groups = np.split(members, np.cumsum(counts)[:-1])
+    return [groups[i].tolist() for i in np.argsort(first)]
+
+
+def _get_optical_pairs_to_validate(
+    groups: list[list[int]],
+    port_names: Sequence[str],
+    angles: npt.NDArray[np.int64],
+    widths: npt.NDArray[np.int64],
+    is_complex: npt.NDArray[np.bool_],
+) -> dict[int, bool]:
+    """Returns whether each two-port group needs the full optical validator.
+
+    Batched over all pairs. A pair is skipped only if it cannot raise or warn:
+    two instance ports on a simple transformation, same width and facing each other.
+
+    Args:
+        groups: port indices grouped by center.
+        port_names: list of port names.
+        angles: port angles in multiples of 90 degrees.
+        widths: port widths in dbu.
+        is_complex: True for ports with a complex transformation.
+    """
+    pairs = np.array([group for group in groups if len(group) == 2], dtype=np.int64)
+    if not len(pairs):
+        return {}
+
+    is_top_level = np.array(["," not in port_name for port_name in port_names])
+    i1, i2 = pairs[:, 0], pairs[:, 1]
+    needs_validation = (
+        is_top_level[i1]
+        | is_top_level[i2]
+        | is_complex[i1]
+        | is_complex[i2]
+        | (widths[i1] != widths[i2])
+        | ((angles[i1] - angles[i2]) % 4 != 2)
+    )
+    return dict(zip(i1.tolist(), needs_validation.tolist()))
+
+
 def _make_warning(ports: list[str], values: Any, message: str) -> dict[str, Any]:
     w = {
         "ports": ports,
@@ -559,16 +685,23 @@ def get_netlist_recursive(
     component_suffix: str = "",
     get_netlist_func: GetNetlistFunc = get_netlist,  # type: ignore[assignment]
     get_instance_name: Callable[..., str] = get_instance_name_from_alias,
+    cache: dict[tuple[str, ...], dict[str, Any]] | None = None,
     **kwargs: Any,
 ) -> dict[str, Any]:
     """Returns recursive netlist for a component and subcomponents.
 
+    Each unique cell is extracted once, no matter how many times it is referenced.
+
     Args:
         component: to extract netlist.
         component_suffix: suffix to append to each component name.
             useful if to save and reload a back-annotated netlist.
         get_netlist_func: function to extract individual netlists.
         get_instance_name: function to get instance name.
+        cache: optional dict to reuse netlists across calls.
+            Keyed on cell name, settings hash, get_netlist_func, get_instance_name
+            and extraction kwargs. Only reuse it while the cells it was filled from
+            are unchanged. Netlists are copied in and out of the cache.
         kwargs: additional keyword arguments to pass to get_netlist_func.
 
     Keyword Args:
@@ -580,6 +713,59 @@ def get_netlist_recursive(
         Dictionary of netlists, keyed by the name of each component.
 
     """
+    return _get_netlist_recursive(
+        component=component,
+        component_suffix=component_suffix,
+        get_netlist_func=get_netlist_func,
+        get_instance_name=get_instance_name,
+        kwargs=kwargs,
+        visited={},
+        cache=cache,
+    )
+
+
+def _get_netlist_cache_key(
+    component: DKCell,
+    component_suffix: str,
+    get_netlist_func: GetNetlistFunc,
+    get_instance_name: Callable[..., str],
+    kwargs: dict[str, Any],
+) -> tuple[str, ...]:
+    settings = component.settings.model_dump() if component.settings else {}
+    return (
+        component.name,
+        f"{component.function_name}",
+        get_hash(settings),
+        component_suffix,
+        get_hash(clean_value_json(get_netlist_func)),
+        get_hash(clean_value_json(get_instance_name)),
+        get_hash(kwargs),
+    )
+
+
+def _get_netlist_recursive(
+    component: DKCell,
+    component_suffix: str,
+    get_netlist_func: GetNetlistFunc,
+    get_instance_name: Callable[..., str],
+    kwargs: dict[str, Any],
+    visited: dict[int, dict[str, Any]],
+    cache: dict[tuple[str, ...], dict[str, Any]] | None,
+) -> dict[str, Any]:
+    """Returns recursive netlist, memoized per cell index in visited."""
+    cell_index = component.cell_index()
+    if cell_index in visited:
+        return visited[cell_index]
+
+    cache_key = None
+    if cache is not None:
+        cache_key = _get_netlist_cache_key(
+            component, component_suffix, get_netlist_func, get_instance_name, kwargs
+        )
+        if cache_key in cache:
+            visited[cell_index] = copy.deepcopy(cache[cache_key])
+            return visited[cell_index]
+
     all_netlists: dict[str, Any] = {}
 
     # only components with references (subcomponents) warrant a netlist
@@ -589,30 +775,43 @@ def get_netlist_recursive(
         netlist = get_netlist_func(component, **kwargs)
         all_netlists[f"{component.name}{component_suffix}"] = netlist
 
+        # child cell index -> instance entry, or None for leaf cells
+        children: dict[int, dict[str, Any] | None] = {}
+
         # for each reference, expand the netlist
         for ref in references:
             rcell = ref.cell
-            grandchildren = get_netlist_recursive(
-                component=rcell,
-                component_suffix=component_suffix,
-                get_netlist_func=get_netlist_func,
-                **kwargs,
-            )
-            all_netlists |= grandchildren
-
-            child_references = _get_references_to_netlist(ref.cell)
-
-            if child_references:
+            rcell_index = rcell.cell_index()
+
+            if rcell_index not in children:
+                grandchildren = _get_netlist_recursive(
+                    component=rcell,
+                    component_suffix=component_suffix,
+                    get_netlist_func=get_netlist_func,
+                    get_instance_name=get_instance_name,
+                    kwargs=kwargs,
+                    visited=visited,
+                    cache=cache,
+                )
+                all_netlists |= grandchildren
+
+                netlist_dict: dict[str, Any] | None = None
+                if _get_references_to_netlist(rcell):
+                    netlist_dict = {"component": f"{rcell.name}{component_suffix}"}
+                    if hasattr(rcell, "settings"):
+                        netlist_dict.update(settings=rcell.settings.model_dump())
+                    if hasattr(rcell, "info"):
+                        netlist_dict.update(info=rcell.info.model_dump())
+                children[rcell_index] = netlist_dict
+
+            netlist_dict = children[rcell_index]
+            if netlist_dict is not None:
                 inst_name = get_instance_name(ref)
-                netlist_dict: dict[str, Any] = {
-                    "component": f"{rcell.name}{component_suffix}"
-                }
-                if hasattr(rcell, "settings"):
-                    netlist_dict.update(settings=rcell.settings.model_dump())
-                if hasattr(rcell, "info"):
-                    netlist_dict.update(info=rcell.info.model_dump())
-                netlist["instances"][inst_name] = netlist_dict
+                netlist["instances"][inst_name] = dict(netlist_dict)
 
+    visited[cell_index] = all_netlists
+    if cache is not None and cache_key is not None:
+        cache[cache_key] = copy.deepcopy(all_netlists)
     return all_netlists
 
 
@@ -638,6 +837,43 @@ def _demo_mzi_lattice() -> None:
     c.get_netlist()
 
 
+def _demo_get_netlist_scaling(
+    sizes: Sequence[int] = (1_000, 10_000, 100_000),
+) -> None:
+    """Times get_netlist on flat chains of abutted straights."""
+    import time
+
+    import gdsfactory as gf
+
+    s = gf.components.straight(length=10)
+    for n in sizes:
+        c = gf.Component()
+        for i in range(n):
+            ref = c << s
+            ref.dmove((i * 10, 0))
+        t0 = time.perf_counter()
+        get_netlist(c)
+        print(f"{n} instances: {time.perf_counter() - t0:.3f} s")
+
+
+def _demo_get_netlist_recursive_reticle(copies: Sequence[int] = (1, 10, 100)) -> None:
+    """Times recursive netlist extraction versus number of duplicate instances."""
+    import time
+
+    import gdsfactory as gf
+    from gdsfactory.samples.sample_reticle import sample_reticle
+
+    reticle = sample_reticle()
+    for n in copies:
+        c = gf.Component()
+        for i in range(n):
+            ref = c << reticle
+            ref.x = i * (reticle.xsize + 100)
+        t0 = time.perf_counter()
+        get_netlist_recursive(c, allow_multiple=False)
+        print(f"{n} copies: {time.perf_counter() - t0:.3f} s")
+
+
 DEFAULT_CONNECTION_VALIDATORS = get_default_connection_validators()
 
 DEFAULT_CRITICAL_CONNECTION_ERROR_TYPES = {
@@ -7,8 +7,9 @@ from __future__ import annotations
 
 import os
 import pathlib
+import time
 from collections.abc import Sequence
-from typing import Any, Protocol, cast
+from typing import Any, Literal, Protocol, cast
 
 import numpy as np
 import numpy.typing as npt
@@ -90,6 +91,141 @@ def _pack_single_bin(
     return packed_rect_dict, unpacked_rect_dict
 
 
+def _skyline_pack(
+    sizes: npt.NDArray[np.int64],
+    order: npt.NDArray[np.intp],
+    bin_size: tuple[int, int],
+) -> npt.NDArray[np.int64]:
+    """Packs rectangles bottom-left on a skyline. Returns (x, y) per rectangle.
+
+    The skyline is stored as the start x and height of each segment.
+    Rectangles that do not fit get position (-1, -1).
+
+    Args:
+        sizes: (n, 2) array of rectangle widths and heights.
+        order: indices of the rectangles in placement order.
+        bin_size: bin width and height.
+    """
+    bin_w, bin_h = bin_size
+    positions = np.full((len(sizes), 2), -1, dtype=np.int64)
+    xs = np.zeros(1, dtype=np.int64)
+    ys = np.zeros(1, dtype=np.int64)
+
+    for i in order:
+        w, h = sizes[i]
+        candidates = np.flatnonzero(xs + w <= bin_w)
+        if not len(candidates):
+            continue
+        x = xs[candidates]
+        # last segment under each candidate rectangle
+        last = np.searchsorted(xs, x + w, side="left") - 1
+        bounds = np.empty(2 * len(candidates), dtype=np.intp)
+        bounds[0::2] = candidates
+        bounds[1::2] = last + 1
+        y = np.maximum.reduceat(np.append(ys, 0), bounds)[0::2]
+        fits = y + h <= bin_h
+        if not fits.any():
+            continue
+        best = np.lexsort((x[fits], y[fits] + h))[0]
+        first = candidates[fits][best]
+        last_ = last[fits][best]
+        x0, y0 = int(x[fits][best]), int(y[fits][best])
+        positions[i] = x0, y0
+
+        end = xs[last_ + 1] if last_ + 1 < len(xs) else bin_w
+        new_xs = [x0]
+        new_ys = [y0 + h]
+        if end > x0 + w:
+            new_xs.append(x0 + w)
+            new_ys.append(int(ys[last_]))
+        xs = np.concatenate((xs[:first], new_xs, xs[last_ + 1 :]))
+        ys = np.concatenate((ys[:first], new_ys, ys[last_ + 1 :]))
+        keep = np.ones(len(ys), dtype=bool)
+        keep[1:] = ys[1:] != ys[:-1]
+        xs, ys = xs[keep], ys[keep]
+
+    return positions
+
+
+def _pack_single_bin_skyline(
+    rect_dict: dict[int, tuple[float, float]],
+    aspect_ratio: tuple[float, float],
+    max_size: Size,
+    sort_by_area: bool,
+    density: float,
+    time_budget: float | None = None,
+) -> tuple[dict[int, tuple[float, float, float, float]], dict[Any, Any]]:
+    """Packs a dict of rectangles {id:(w,h)} with a NumPy skyline packer.
+
+    Searches the smallest bin with aspect ratio `aspect_ratio` that fits all
+    rectangles. The bin grows geometrically until everything fits or it reaches
+    `max_size`, then a bisection on the bin size shrinks it until two
+    consecutive sizes differ by less than `density`.
+    The rectangle arrays are sorted once and reused by every attempt.
+
+    Args:
+        rect_dict: dict of rectangles {id: (w, h)} to pack.
+        aspect_ratio: x, y.
+        max_size: tuple of max X, Y size.
+        sort_by_area: sorts rectangles tallest first, which packs a skyline best.
+        density: of packing, closer to 1 packs tighter (more compute heavy).
+        time_budget: optional time in seconds for the bisection. When it runs out
+            the smallest bin found so far is used.
+
+    Returns:
+        packed rectangles dict {id:(x,y,w,h)}. dict of remaining unpacked rectangles.
+    """
+    start = time.perf_counter()
+    ids = list(rect_dict)
+    sizes = np.array([rect_dict[rid] for rid in ids], dtype=np.int64).reshape(-1, 2)
+    areas = sizes[:, 0] * sizes[:, 1]
+    order = (
+        np.lexsort((-sizes[:, 0], -sizes[:, 1])).astype(np.intp)
+        if sort_by_area
+        else np.arange(len(ids), dtype=np.intp)
+    )
+    max_size_array = np.asarray(max_size, dtype=np.float64)
+    aspect_ratio = np.asarray(aspect_ratio) / np.linalg.norm(aspect_ratio)  # Normalize
+    base_size = aspect_ratio * np.sqrt(areas.sum())
+
+    def attempt(scale: float) -> tuple[npt.NDArray[np.int64], bool, bool]:
+        """Returns positions, whether all fit and whether the bin is at max_size."""
+        size = np.clip(base_size * scale, None, max_size_array)
+        bin_size = (int(min(size[0], 2**62)), int(min(size[1], 2**62)))
+        positions = _skyline_pack(sizes, order, bin_size)
+        return (
+            positions,
+            bool((positions[:, 0] >= 0).all()),
+            bool((size >= max_size_array).all()),
+        )
+
+    low = max(1.0, *(sizes.max(axis=0) / base_size))
+    positions, done, at_max_size = attempt(low)
+    high = low
+    while not done and not at_max_size:
+        low, high = high, high * 2
+        positions, done, at_max_size = attempt(high)
+
+    if done:
+        while high / low > density and (
+            time_budget is None or time.perf_counter() - start < time_budget
+        ):
+            middle = np.sqrt(low * high)
+            positions_middle, fits, _ = attempt(middle)
+            if fits:
+                high, positions = middle, positions_middle
+            else:
+                low = middle
+
+    packed_rect_dict = {
+        ids[i]: (*positions[i], *sizes[i]) for i in order if positions[i, 0] >= 0
+    }
+    unpacked_rect_dict = {
+        k: v for k, v in rect_dict.items() if k not in packed_rect_dict
+    }
+    return packed_rect_dict, unpacked_rect_dict
+
+
 class TextFunction(Protocol):
     def __call__(self, text: str) -> Component: ...
 
@@ -115,6 +251,8 @@ def pack(
     add_ports_prefix: bool = True,
     add_ports_suffix: bool = False,
     csvpath: str | None = None,
+    packer: Literal["rectpack", "skyline"] = "rectpack",
+    time_budget: float | None = None,
 ) -> list[Component]:
     """Pack a list of components into as few Components as possible.
 
@@ -140,6 +278,9 @@ def pack(
         add_ports_prefix: adds port names with prefix.
         add_ports_suffix: adds port names with suffix.
         csvpath: optional path to save the packed component list as a CSV file.
+        packer: rectpack (MaxRects) or skyline (NumPy skyline with a bisection on
+            the bin size, much faster for thousands of components).
+        time_budget: optional time in seconds to shrink each bin (skyline only).
 
     .. plot::
         :include-source:
@@ -212,13 +353,25 @@ def pack(
 
     packed_list: list[dict[int, tuple[float, float, float, float]]] = []
     while rect_dict:
-        (packed_rect_dict, rect_dict) = _pack_single_bin(
-            rect_dict,
-            aspect_ratio=aspect_ratio,
-            max_size=max_size_tuple,
-            sort_by_area=sort_by_area,
-            density=density,
-        )
+        if packer == "skyline":
+            (packed_rect_dict, rect_dict) = _pack_single_bin_skyline(
+                rect_dict,
+                aspect_ratio=aspect_ratio,
+                max_size=max_size_tuple,
+                sort_by_area=sort_by_area,
+                density=density,
+                time_budget=time_budget,
+            )
+        elif packer == "rectpack":
+            (packed_rect_dict, rect_dict) = _pack_single_bin(
+                rect_dict,
+                aspect_ratio=aspect_ratio,
+                max_size=max_size_tuple,
+                sort_by_area=sort_by_area,
+                density=density,
+            )
+        else:
+            raise ValueError(f"packer={packer!r} must be 'rectpack' or 'skyline'")
         packed_list.append(packed_rect_dict)
 
     components_packed_list: list[Component] = []
@@ -284,6 +437,43 @@ def pack(
     return components_packed_list
 
 
+def _demo_pack_benchmark(n: int = 500, density: float = 1.05) -> None:
+    """Compares speed and fill factor of the rectpack and skyline packers.
+
+    Packs n random rectangles and a DOE of ring resonators with both packers.
+    """
+    rng = np.random.default_rng(0)
+    random_sizes = rng.integers(100, 2000, size=(n, 2))
+    rings = [
+        gf.components.ring_single(radius=radius, length_x=length_x)
+        for radius in np.linspace(5, 20, 10)
+        for length_x in np.linspace(1, 20, 10)
+    ]
+    ring_sizes = [(int((c.xsize + 10) * 100), int((c.ysize + 10) * 100)) for c in rings]
+
+    for label, sizes in (("random", random_sizes), ("ring DOE", ring_sizes)):
+        rect_dict = {i: (int(w), int(h)) for i, (w, h) in enumerate(sizes)}
+        area = sum(w * h for w, h in rect_dict.values())
+        for packer, function in (
+            ("rectpack", _pack_single_bin),
+            ("skyline", _pack_single_bin_skyline),
+        ):
+            start = time.perf_counter()
+            packed, _ = function(
+                rect_dict,
+                aspect_ratio=(1, 1),
+                max_size=(np.inf, np.inf),
+                sort_by_area=True,
+                density=density,
+            )
+            elapsed = time.perf_counter() - start
+            xmax = max(x + w for x, _, w, _ in packed.values())
+            ymax = max(y + h for _, y, _, h in packed.values())
+            print(
+                f"{label:10s} {packer:8s} {elapsed:7.3f}s fill={area / (xmax * ymax):.3f}"
+            )
+
+
 @gf.cell
 def ellipse(number: int = 0) -> Component:
     """Example component to pack."""
@@ -10,14 +10,16 @@ from __future__ import annotations
 
 import hashlib
 import math
+import struct
 import warnings
-from collections.abc import Callable, Sequence
-from typing import Any, Literal, TypeVar, cast, overload
+from collections.abc import Callable, Hashable, Sequence
+from typing import Any, Literal, NamedTuple, TypeVar, cast, overload
 
 import kfactory as kf
 import klayout.db as kdb
 import numpy as np
 import numpy.typing as npt
+from cachetools import LRUCache
 from kfactory.geometry import UMGeometricObject
 from numpy import mod
 
@@ -26,6 +28,7 @@ from gdsfactory.component import Component, ComponentAllAngle
 from gdsfactory.component_layout import (
     rotate_points,
 )
+from gdsfactory.config import CONF
 from gdsfactory.cross_section import CrossSection, Section, Transition
 from gdsfactory.pdk import get_layer_name
 from gdsfactory.typings import (
@@ -319,31 +322,13 @@ class Path(UMGeometricObject):
             end_angle: float or None The angle at the end of the path.
 
         """
-        new_points = np.array(points, dtype=np.float64)
-        dx = np.diff(points[:, 0])
-        dy = np.diff(points[:, 1])
-        theta = np.arctan2(dy, dx)
-        theta = np.concatenate([theta[:1], theta, theta[-1:]])
-        theta_mid = (np.pi + theta[1:] + theta[:-1]) / 2  # Mean angle between segments
-        dtheta_int = np.pi + theta[:-1] - theta[1:]  # Internal angle between segments
-        offset_distance_array = np.array(offset_distance) / np.sin(dtheta_int / 2)
-
-        new_points[:, 0] -= offset_distance_array * np.cos(theta_mid)
-        new_points[:, 1] -= offset_distance_array * np.sin(theta_mid)
-
-        if start_angle is not None:
-            start_angle_rad = start_angle * np.pi / 180
-            new_points[0, :] = points[0, :] + (
-                np.sin(start_angle_rad) * offset_distance_array[0],
-                -np.cos(start_angle_rad) * offset_distance_array[0],
-            )
-        if end_angle is not None:
-            end_angle_rad = end_angle * np.pi / 180
-            new_points[-1, :] = points[-1, :] + (
-                np.sin(end_angle_rad) * offset_distance_array[-1],
-                -np.cos(end_angle_rad) * offset_distance_array[-1],
-            )
-        return new_points
+        offset_distances = np.atleast_1d(np.asarray(offset_distance, dtype=np.float64))
+        return _centerpoint_offset_curves(
+            points,
+            offset_distances=offset_distances[np.newaxis],
+            start_angle=start_angle,
+            end_angle=end_angle,
+        )[0]
 
     def _parametric_offset_curve(
         self,
@@ -798,36 +783,66 @@ def along_path(
 
     c = Component()
 
-    cum_dist = 0.0
     next_component = (length - (number - 1) * spacing) / 2
     stop = length - next_component
 
-    # Prepare in advance the rotation angle for each segment
-    angle_list = [
-        np.rad2deg(
-            np.arctan2(
-                (p.points[i + 1] - p.points[i])[1], (p.points[i + 1] - p.points[i])[0]
-            )
-        )
-        for i in range(len(p.points) - 1)
-    ]
-
-    for i, start_pt in enumerate(p.points[:-1]):
-        end_pt = p.points[i + 1]
-        segment_vector = end_pt - start_pt
-        segment_length = float(np.linalg.norm(segment_vector))
-        unit_vector = segment_vector / segment_length
-
-        # Get the pre-calculated angle for this segment
-        angle = angle_list[i]
+    points = p.points
+    segment_vectors = np.diff(points, axis=0)
+    # same dot product as np.linalg.norm on each segment vector
+    segment_lengths = np.sqrt(
+        np.matmul(segment_vectors[:, None, :], segment_vectors[:, :, None]).ravel()
+    )
+    cum_dists = np.concatenate([[0.0], np.cumsum(segment_lengths)])
+    angles = np.rad2deg(np.arctan2(segment_vectors[:, 1], segment_vectors[:, 0]))
 
-        while next_component <= cum_dist + segment_length and next_component <= stop:
-            added_dist = next_component - cum_dist
-            offset = added_dist * unit_vector
+    # Distance along the path of each copy, accumulated one spacing at a time
+    distances = np.cumsum(
+        np.concatenate([[next_component], np.full(max(int(number), 0), spacing)])
+    )
+    distances = distances[distances <= stop]
+    # A copy goes on the first segment that ends at or after its distance
+    segment_indices = np.searchsorted(cum_dists[1:], distances, side="left")
+    on_path = segment_indices < len(segment_lengths)
+    distances = distances[on_path]
+    segment_indices = segment_indices[on_path]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        unit_vectors = segment_vectors / segment_lengths[:, None]
+    offsets = (distances - cum_dists[segment_indices])[:, None]
+    positions = points[segment_indices] + offsets * unit_vectors[segment_indices]
+    copy_angles = angles[segment_indices].tolist()
+
+    # Consecutive copies with the same rotation and a constant step in dbu are placed
+    # as one regular array instead of one reference per copy
+    scaled = positions * (1 / c.kcl.dbu)
+    xy_dbu = np.trunc(scaled + np.copysign(0.5, scaled)).astype(np.int64).tolist()
+    runs: list[tuple[int, int, tuple[int, int] | None]] = []
+    first, step = 0, None
+    for k in range(1, len(xy_dbu)):
+        delta = (xy_dbu[k][0] - xy_dbu[k - 1][0], xy_dbu[k][1] - xy_dbu[k - 1][1])
+        if copy_angles[k] == copy_angles[first] and step in (None, delta):
+            step = delta
+            continue
+        runs.append((first, k - first, step))
+        first, step = k, None
+    if xy_dbu:
+        runs.append((first, len(xy_dbu) - first, step))
+
+    for first, n, step in runs:
+        component_ref = c << component
+        component_ref.rotate(copy_angles[first]).move(positions[first])
+        if step is None:
+            continue
+        disp = component_ref.instance.cell_inst.cplx_trans.disp
+        if (disp.x, disp.y) == tuple(xy_dbu[first]):
+            component_ref.instance.a = kdb.Vector(*step)
+            component_ref.instance.b = kdb.Vector(0, 0)
+            component_ref.instance.na = n
+            component_ref.instance.nb = 1
+            continue
+        for k in range(first + 1, first + n):
             component_ref = c << component
-            component_ref.rotate(angle).move(start_pt + offset)
-            next_component += spacing
-        cum_dist += segment_length
+            component_ref.rotate(copy_angles[k]).move(positions[k])
 
     return c
 
@@ -844,6 +859,126 @@ def _get_named_sections(sections: tuple[Section, ...]) -> dict[str, Section]:
     return named_sections
 
 
+class ExtrudeCacheInfo(NamedTuple):
+    hits: int
+    misses: int
+    maxsize: int
+    currsize: int
+
+
+class ExtrudeCache:
+    """Bounded LRU cache for the polygon and port data of extrusions.
+
+    Keys are built from the path geometry hash and the cross-section hash, so identical
+    extrusions (the same bend for every route, a via array along the same path) are
+    only computed once. The Component is still built fresh on every call.
+
+    Args:
+        maxsize: maximum number of cached extrusions. 0 disables the cache.
+    """
+
+    def __init__(self, maxsize: int) -> None:
+        self._cache: LRUCache[Hashable, Any] = LRUCache(maxsize=maxsize)
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable | None) -> Any:
+        """Returns the cached value for key or None.
+
+        A None key is never cached and is not counted as a miss.
+        """
+        if key is None:
+            return None
+        value = self._cache.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return value
+
+    def set(self, key: Hashable | None, value: Any) -> None:
+        if key is not None and self._cache.maxsize > 0:
+            self._cache[key] = value
+
+    def info(self) -> ExtrudeCacheInfo:
+        """Returns the hit and miss counters and the cache size."""
+        return ExtrudeCacheInfo(
+            hits=self.hits,
+            misses=self.misses,
+            maxsize=int(self._cache.maxsize),
+            currsize=int(self._cache.currsize),
+        )
+
+    def clear(self, maxsize: int | None = None) -> None:
+        """Empties the cache and resets the counters.
+
+        Args:
+            maxsize: optional new maximum number of cached extrusions.
+        """
+        if maxsize is None:
+            self._cache.clear()
+        else:
+            self._cache = LRUCache(maxsize=maxsize)
+        self.hits = 0
+        self.misses = 0
+
+
+extrude_cache = ExtrudeCache(maxsize=CONF.extrude_cache_size)
+
+
+class _Extrusion(NamedTuple):
+    polygons: list[tuple[npt.NDArray[np.floating[Any]], LayerSpec]]
+    ports: list[dict[str, Any]]
+    length: float
+    along_path_points: list[npt.NDArray[np.floating[Any]] | None]
+
+
+# DPolygon.from_bytes is only available in klayout>=0.30.9
+_HAS_DPOLYGON_FROM_BYTES = hasattr(kdb.DPolygon, "from_bytes")
+
+
+def _to_dpolygon(points: npt.NDArray[np.floating[Any]]) -> kdb.DPolygon:
+    """Returns the DPolygon that DPolygon(list of DPoints) builds from (N, 2) points.
+
+    Extruded polygons have up to hundreds of thousands of points, so on klayout
+    versions with DPolygon.from_bytes the hull is passed as one buffer instead of
+    one DPoint per point. The buffer is normalized in NumPy the way the DPoint
+    constructor does it: clockwise, starting at the lowest, then leftmost point.
+    Hulls without a unique starting point or with zero area use the DPoint
+    constructor.
+    """
+    xy = np.ascontiguousarray(points, dtype="<f8")
+    n = len(xy)
+    if _HAS_DPOLYGON_FROM_BYTES and n >= 3:
+        x, y = xy[:, 0], xy[:, 1]
+        area2 = float(np.dot(x, np.roll(y, -1)) - np.dot(np.roll(x, -1), y))
+        start = np.lexsort((x, y))[0]
+        if area2 != 0 and np.count_nonzero((x == x[start]) & (y == y[start])) == 1:
+            if area2 > 0:
+                xy = xy[::-1]
+                start = n - 1 - start
+            xy = np.ascontiguousarray(np.roll(xy, -start, axis=0))
+            # version, number of contours, number of points of the hull
+            header = struct.pack("<HQQ", 1, 1, n)
+            try:
+                polygon = kdb.DPolygon.from_bytes(header + xy.tobytes())
+            except RuntimeError:
+                pass
+            else:
+                if polygon.holes() == 0 and polygon.num_points_hull() == n:
+                    return polygon
+    return kdb.DPolygon([kdb.DPoint(x, y) for x, y in points.tolist()])
+
+
+def _add_extrusion(c: AnyComponent, extrusion: _Extrusion) -> None:
+    """Adds the polygons, ports and length of an extrusion to a Component."""
+    for points, layer in extrusion.polygons:
+        c.add_polygon(_to_dpolygon(points), layer=layer)
+    for port in extrusion.ports:
+        c.add_port(**port)
+    c.info["length"] = extrusion.length
+
+
 @overload
 def extrude(
     p: Path,
@@ -900,7 +1035,7 @@ def extrude(
                 by more than the value listed here will be removed.
         all_angle: if True, the bend is drawn with a single euler curve.
     """
-    from gdsfactory.pdk import get_cross_section, get_layer
+    from gdsfactory.pdk import get_cross_section
 
     if cross_section is None and layer is None:
         raise ValueError("CrossSection or layer needed")
@@ -920,18 +1055,78 @@ def extrude(
         )
         cross_section = CrossSection(sections=(s,))
 
-    xsection_points: list[list[float | npt.NDArray[np.floating[Any]]]] = []
-    c = ComponentAllAngle() if all_angle else Component()
-
     assert cross_section is not None
 
     x = get_cross_section(cross_section)
 
-    layer = layer or x.layer
-    layer = get_layer(layer)
+    if any(
+        callable(section.width_function) or callable(section.offset_function)
+        for section in x.sections
+    ):
+        key = None
+    else:
+        key = (
+            "extrude",
+            p.hash_geometry(precision=1e-9),
+            x.hash,
+            str(layer),
+            width,
+            simplify,
+            all_angle,
+        )
+    extrusion = extrude_cache.get(key)
+    if extrusion is None:
+        extrusion = _extrude(p, x, simplify=simplify)
+        extrude_cache.set(key, extrusion)
+
+    c = ComponentAllAngle() if all_angle else Component()
+    _add_extrusion(c, extrusion)
+
+    for via, via_points in zip(x.components_along_path, extrusion.along_path_points):
+        _p = p if via_points is None else Path(via_points)
+        _ = c << along_path(
+            p=_p, component=via.component, spacing=via.spacing, padding=via.padding
+        )
+    return c
+
+
+def _extrude(p: Path, x: CrossSection, simplify: float | None) -> _Extrusion:
+    """Returns the polygons and ports of a Path extruded with a CrossSection."""
+    xsection_points: list[list[float | npt.NDArray[np.floating[Any]]]] = []
+    polygons: list[tuple[npt.NDArray[np.floating[Any]], LayerSpec]] = []
+    ports: list[dict[str, Any]] = []
+
+    # Sections without insets or width/offset functions share the same path, so their
+    # edges are computed together from a single tangent frame
+    plain_section_indices = [
+        i
+        for i, section in enumerate(x.sections)
+        if not (section.insets and section.insets != (0, 0))
+        and not callable(section.offset_function)
+        and not callable(section.width_function)
+    ]
+    plain_edges: dict[int, npt.NDArray[np.float64]] = {}
+    if plain_section_indices:
+        edge_offsets = np.array(
+            [
+                [x.sections[i].offset + sign * x.sections[i].width / 2]
+                for i in plain_section_indices
+                for sign in (1, -1)
+            ]
+        )
+        edges = _centerpoint_offset_curves(
+            p.points,
+            offset_distances=edge_offsets,
+            start_angle=p.start_angle,
+            end_angle=p.end_angle,
+        )
+        plain_edges = {
+            i: edges[2 * j : 2 * j + 2] for j, i in enumerate(plain_section_indices)
+        }
+        path_length = p.length()
 
-    for section in x.sections:
-        p_sec = p.copy()
+    for i, section in enumerate(x.sections):
+        p_sec = p if i in plain_edges else p.copy()
         port_names = section.port_names
         port_types = section.port_types
         hidden = section.hidden
@@ -1075,22 +1270,25 @@ def extrude(
 
         assert width_value is not None
 
-        dy = offset_value + width_value / 2
+        if i in plain_edges:
+            points1, points2 = plain_edges[i]
+        else:
+            dy = offset_value + width_value / 2
 
-        points1 = p_sec.centerpoint_offset_curve(
-            points,
-            offset_distance=dy,
-            start_angle=start_angle,
-            end_angle=end_angle,
-        )
-        dy = offset_value - width_value / 2
+            points1 = p_sec.centerpoint_offset_curve(
+                points,
+                offset_distance=dy,
+                start_angle=start_angle,
+                end_angle=end_angle,
+            )
+            dy = offset_value - width_value / 2
 
-        points2 = p_sec.centerpoint_offset_curve(
-            points,
-            offset_distance=dy,
-            start_angle=start_angle,
-            end_angle=end_angle,
-        )
+            points2 = p_sec.centerpoint_offset_curve(
+                points,
+                offset_distance=dy,
+                start_angle=start_angle,
+                end_angle=end_angle,
+            )
         if isinstance(simplify, bool):
             raise ValueError("simplify argument must be a number (e.g. 1e-3) or None")
 
@@ -1103,8 +1301,9 @@ def extrude(
         # Join points together
         points_poly = np.concatenate([points1, points2[::-1, :]])
 
-        if not hidden and p_sec.length() > 1e-3:
-            c.add_polygon(points_poly, layer=layer)
+        length = path_length if i in plain_edges else p_sec.length()
+        if not hidden and length > 1e-3:
+            polygons.append((points_poly, layer))
 
         # Add port_names if they were specified
         if port_names[0]:
@@ -1116,14 +1315,16 @@ def extrude(
             face = [points1[0], points2[0]]
             face = [_rotated_delta(point, center, port_orientation) for point in face]
 
-            c.add_port(
-                name=port_names[0],
-                layer=layer,
-                port_type=port_types[0],
-                width=port_width,
-                orientation=port_orientation,
-                center=center,
-                cross_section=x,
+            ports.append(
+                {
+                    "name": port_names[0],
+                    "layer": layer,
+                    "port_type": port_types[0],
+                    "width": port_width,
+                    "orientation": port_orientation,
+                    "center": center,
+                    "cross_section": x,
+                }
             )
         if port_names[1]:
             port_width = (
@@ -1134,33 +1335,35 @@ def extrude(
             face = [points1[-1], points2[-1]]
             face = [_rotated_delta(point, center, port_orientation) for point in face]
 
-            c.add_port(
-                name=port_names[1],
-                layer=layer,
-                port_type=port_types[1],
-                width=port_width,
-                center=center,
-                orientation=port_orientation,
-                cross_section=x,
+            ports.append(
+                {
+                    "name": port_names[1],
+                    "layer": layer,
+                    "port_type": port_types[1],
+                    "width": port_width,
+                    "center": center,
+                    "orientation": port_orientation,
+                    "cross_section": x,
+                }
             )
 
-    c.info["length"] = float(np.round(p.length(), 3))
-
-    for via in x.components_along_path:
-        if via.offset:
-            points_offset = p.centerpoint_offset_curve(
-                points,
-                offset_distance=via.offset,
-                start_angle=start_angle,
-                end_angle=end_angle,
-            )
-            _p = Path(points_offset)
-        else:
-            _p = p
-        _ = c << along_path(
-            p=_p, component=via.component, spacing=via.spacing, padding=via.padding
+    along_path_points = [
+        p.centerpoint_offset_curve(
+            points,
+            offset_distance=via.offset,
+            start_angle=start_angle,
+            end_angle=end_angle,
         )
-    return c
+        if via.offset
+        else None
+        for via in x.components_along_path
+    ]
+    return _Extrusion(
+        polygons=polygons,
+        ports=ports,
+        length=float(np.round(p.length(), 3)),
+        along_path_points=along_path_points,
+    )
 
 
 def extrude_transition(p: Path, transition: Transition) -> Component:
@@ -1170,15 +1373,45 @@ def extrude_transition(p: Path, transition: Transition) -> Component:
         p: path to extrude.
         transition: transition to extrude along.
     """
-    from gdsfactory.pdk import get_cross_section, get_layer
-
-    c = Component()
+    from gdsfactory.pdk import get_cross_section
 
     x1 = get_cross_section(transition.cross_section1)
     x2 = get_cross_section(transition.cross_section2)
     width_type = transition.width_type
     offset_type = transition.offset_type
 
+    if callable(width_type) or callable(offset_type):
+        key = None
+    else:
+        key = (
+            "extrude_transition",
+            p.hash_geometry(precision=1e-9),
+            x1.hash,
+            x2.hash,
+            width_type,
+            offset_type,
+        )
+    extrusion = extrude_cache.get(key)
+    if extrusion is None:
+        extrusion = _extrude_transition(p, x1, x2, width_type, offset_type)
+        extrude_cache.set(key, extrusion)
+
+    c = Component()
+    _add_extrusion(c, extrusion)
+    return c
+
+
+def _extrude_transition(
+    p: Path,
+    x1: CrossSection,
+    x2: CrossSection,
+    width_type: WidthTypes | Callable[[float, float, float], float],
+    offset_type: WidthTypes | Callable[[float, float, float], float],
+) -> _Extrusion:
+    """Returns the polygons and ports of a Path extruded along a transition."""
+    polygons: list[tuple[npt.NDArray[np.floating[Any]], LayerSpec]] = []
+    ports: list[dict[str, Any]] = []
+
     # if named, prefer name over layer
     named_sections1 = _get_named_sections(x1.sections)
     named_sections2 = _get_named_sections(x2.sections)
@@ -1238,15 +1471,8 @@ def extrude_transition(p: Path, transition: Transition) -> Component:
         else:
             raise NotImplementedError()
 
-        if section1.layer != section2.layer:
-            hidden = True
-            layer1 = get_layer(section1.layer)
-            layer2 = get_layer(section2.layer)
-            layers = [layer1, layer2]
-        else:
-            hidden = False
-            layer = get_layer(section1.layer)
-            layers = [layer, layer]
+        hidden = section1.layer != section2.layer
+        layers = [section1.layer, section2.layer]
 
         end_angle = p.end_angle
         start_angle = p.start_angle
@@ -1277,7 +1503,7 @@ def extrude_transition(p: Path, transition: Transition) -> Component:
         points_poly = np.concatenate([points1, points2[::-1, :]])
 
         if not hidden and p.length() > 1e-3:
-            c.add_polygon(points_poly, layer=layer)
+            polygons.append((points_poly, layers[0]))
 
         # Add port_names if they were specified
         if port_names[0] is not None:
@@ -1291,14 +1517,16 @@ def extrude_transition(p: Path, transition: Transition) -> Component:
                 end_angle=None,
             )[0]
 
-            c.add_port(
-                name=port_names[0],
-                layer=get_layer(layers[0]),
-                port_type=port_types[0],
-                width=port_width,
-                orientation=port_orientation,
-                center=center,
-                cross_section=x1,
+            ports.append(
+                {
+                    "name": port_names[0],
+                    "layer": layers[0],
+                    "port_type": port_types[0],
+                    "width": port_width,
+                    "orientation": port_orientation,
+                    "center": center,
+                    "cross_section": x1,
+                }
             )
         if port_names[1] is not None:
             port_width = width2
@@ -1311,18 +1539,75 @@ def extrude_transition(p: Path, transition: Transition) -> Component:
                 end_angle=end_angle,
             )[-1]
 
-            c.add_port(
-                name=port_names[1],
-                layer=get_layer(layers[1]),
-                port_type=port_types[1],
-                width=port_width,
-                center=center,
-                orientation=port_orientation,
-                cross_section=x2,
+            ports.append(
+                {
+                    "name": port_names[1],
+                    "layer": layers[1],
+                    "port_type": port_types[1],
+                    "width": port_width,
+                    "center": center,
+                    "orientation": port_orientation,
+                    "cross_section": x2,
+                }
             )
 
-    c.info["length"] = float(np.round(p.length(), 3))
-    return c
+    return _Extrusion(
+        polygons=polygons,
+        ports=ports,
+        length=float(np.round(p.length(), 3)),
+        along_path_points=[],
+    )
+
+
+def _centerpoint_offset_curves(
+    points: npt.NDArray[np.floating[Any]],
+    offset_distances: npt.NDArray[np.floating[Any]],
+    start_angle: float | None = None,
+    end_angle: float | None = None,
+) -> npt.NDArray[np.float64]:
+    """Returns one centerpoint offset curve per row of offset_distances.
+
+    The tangent frame of the path is computed once and shared by all the curves.
+
+    Args:
+        points: array-like[N][2] The points to be offset.
+        offset_distances: array-like[M][1] or [M][N] The distances to offset the points.
+        start_angle: float or None The angle at the start of the path.
+        end_angle: float or None The angle at the end of the path.
+
+    Returns:
+        array[M][N][2] with the points of each offset curve.
+    """
+    points = np.asarray(points, dtype=np.float64)
+    dx = np.diff(points[:, 0])
+    dy = np.diff(points[:, 1])
+    theta = np.arctan2(dy, dx)
+    theta = np.concatenate([theta[:1], theta, theta[-1:]])
+    theta_mid = (np.pi + theta[1:] + theta[:-1]) / 2  # Mean angle between segments
+    dtheta_int = np.pi + theta[:-1] - theta[1:]  # Internal angle between segments
+    offset_distance_array = offset_distances / np.sin(dtheta_int / 2)
+
+    new_points = np.empty((len(offset_distance_array), len(points), 2))
+    new_points[:, :, 0] = points[:, 0] - offset_distance_array * np.cos(theta_mid)
+    new_points[:, :, 1] = points[:, 1] - offset_distance_array * np.sin(theta_mid)
+
+    if start_angle is not None:
+        start_angle_rad = start_angle * np.pi / 180
+        new_points[:, 0, 0] = (
+            points[0, 0] + np.sin(start_angle_rad) * offset_distance_array[:, 0]
+        )
+        new_points[:, 0, 1] = (
+            points[0, 1] - np.cos(start_angle_rad) * offset_distance_array[:, 0]
+        )
+    if end_angle is not None:
+        end_angle_rad = end_angle * np.pi / 180
+        new_points[:, -1, 0] = (
+            points[-1, 0] + np.sin(end_angle_rad) * offset_distance_array[:, -1]
+        )
+        new_points[:, -1, 1] = (
+            points[-1, 1] - np.cos(end_angle_rad) * offset_distance_array[:, -1]
+        )
+    return new_points
 
 
 def _rotated_delta(
@@ -1752,6 +2037,39 @@ def smooth(
     return path
 
 
+def _demo_along_path_via_stack(lengths: Sequence[float] = (1_000, 10_000)) -> None:
+    """Times extruding a rib heater lined with two via rows and writing it to GDS."""
+    import tempfile
+    import time
+
+    from gdsfactory.components.vias.via import via
+    from gdsfactory.cross_section import ComponentAlongPath, rib_heater_doped_via_stack
+
+    xs = rib_heater_doped_via_stack()
+    offset = xs.width / 2 + 0.8 + 1.0
+    xs = xs.copy(
+        components_along_path=tuple(
+            ComponentAlongPath(component=via(), spacing=2, padding=1, offset=offset)
+            for offset in (offset, -offset)
+        )
+    )
+    for length in lengths:
+        p = straight(length / 2) + arc(radius=50, angle=180) + straight(length / 2)
+        t0 = time.perf_counter()
+        c = extrude(p, cross_section=xs)
+        t1 = time.perf_counter()
+        with tempfile.TemporaryDirectory() as dirpath:
+            c.write_gds(f"{dirpath}/along_path.gds")
+        t2 = time.perf_counter()
+        vias = c.insts
+        n_instances = sum(len(ref.cell.insts) for ref in vias)
+        n_vias = sum(inst.instance.size() for ref in vias for inst in ref.cell.insts)
+        print(
+            f"{length} um: {n_instances} instances for {n_vias} vias, "
+            f"extrude {t1 - t0:.3f} s, write_gds {t2 - t1:.3f} s"
+        )
+
+
 __all__ = [
     "Path",
     "along_path",
@@ -2,17 +2,19 @@
 
 from __future__ import annotations
 
+import bisect
 import importlib
 import pathlib
 import warnings
-from collections.abc import Callable, Mapping, Sequence
+from collections.abc import Callable, Hashable, Iterator, Mapping, Sequence
 from functools import cached_property, partial
 from typing import Any, cast
 
 import kfactory as kf
 import yaml
+from cachetools import LRUCache
 from kfactory.layer import LayerEnum
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 
 from gdsfactory import logger
 from gdsfactory.component import Component, ComponentAllAngle
@@ -20,7 +22,6 @@ from gdsfactory.config import CONF
 from gdsfactory.cross_section import CrossSection, Section
 from gdsfactory.cross_section import xsection as cross_section_xsection
 from gdsfactory.generic_tech import get_generic_pdk
-from gdsfactory.read.from_yaml_template import cell_from_yaml_template
 from gdsfactory.serialization import clean_value_json, convert_tuples_to_lists
 from gdsfactory.symbols import floorplan_with_block_letters
 from gdsfactory.technology import LayerStack, LayerViews, klayout_tech
@@ -41,6 +42,9 @@ from gdsfactory.typings import (
 _ACTIVE_PDK: Pdk | None = None
 component_settings = ["function", "component", "settings"]
 cross_section_settings = ["function", "cross_section", "settings"]
+cross_section_cache: LRUCache[Hashable, CrossSection] = LRUCache(
+    maxsize=CONF.cross_section_cache_size
+)
 
 constants = {
     "fiber_input_to_output_spacing": 200.0,
@@ -106,6 +110,131 @@ def extract_args_from_docstring(docstring: str) -> dict[str, Any]:
     return args_dict
 
 
+def _get_cross_section_cached(
+    factory: Callable[..., CrossSection], kwargs: Mapping[str, Any]
+) -> CrossSection:
+    """Returns factory(**kwargs), interning frozen CrossSections in an LRU cache.
+
+    Args:
+        factory: cross_section factory.
+        kwargs: settings passed to the factory. Unhashable settings skip the cache.
+    """
+    try:
+        key = (factory, frozenset((k, type(v), v) for k, v in kwargs.items()))
+        xs = cross_section_cache.get(key)
+    except TypeError:
+        return factory(**kwargs)
+
+    if xs is None:
+        xs = factory(**kwargs)
+        if isinstance(xs, CrossSection):
+            cross_section_cache[key] = xs
+    return xs
+
+
+class CellRegistry(Mapping[str, ComponentFactory]):
+    """Merged read-only view of the cells and containers of a PDK.
+
+    Lookups go straight to the underlying dicts, so the success path does not
+    copy or scan them. The sorted name index used for "did you mean"
+    suggestions is built once per registry version.
+
+    Args:
+        cells: dict of cells.
+        containers: dict of containers.
+        pdk_name: PDK name for error messages.
+        version: registry version, bumped by the PDK every time cells change.
+    """
+
+    def __init__(
+        self,
+        cells: dict[str, ComponentFactory],
+        containers: dict[str, ComponentFactory],
+        pdk_name: str = "",
+        version: int = 0,
+    ) -> None:
+        """Indexes cells and containers. Raises ValueError if they share a name."""
+        conflicting_names = cells.keys() & containers.keys()
+        if conflicting_names:
+            raise ValueError(
+                f"PDK {pdk_name!r} has overlapping cell names between cells and containers: {list(conflicting_names)}. "
+            )
+        self.cells = cells
+        self.containers = containers
+        self.version = version
+        self.names = tuple(sorted(cells.keys() | containers.keys()))
+        self._signature = self._get_signature(cells, containers)
+
+    @staticmethod
+    def _get_signature(
+        cells: dict[str, ComponentFactory], containers: dict[str, ComponentFactory]
+    ) -> tuple[int, int, int, int]:
+        return id(cells), len(cells), id(containers), len(containers)
+
+    def is_current(
+        self,
+        cells: dict[str, ComponentFactory],
+        containers: dict[str, ComponentFactory],
+    ) -> bool:
+        """Returns True if cells and containers are the dicts that were indexed."""
+        return self._signature == self._get_signature(cells, containers)
+
+    def __getitem__(self, name: str) -> ComponentFactory:
+        """Returns the cell or container called name. Raises KeyError if missing."""
+        cell = self.cells.get(name)
+        if cell is None:
+            return self.containers[name]
+        return cell
+
+    def __contains__(self, name: object) -> bool:
+        """Returns True if name is a cell or a container."""
+        return name in self.cells or name in self.containers
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterates over the sorted cell and container names."""
+        return iter(self.names)
+
+    def __len__(self) -> int:
+        """Returns the number of cells and containers."""
+        return len(self.names)
+
+    def startswith(self, prefix: str) -> list[str]:
+        """Returns the sorted cell names that start with prefix."""
+        names = self.names
+        i = j = bisect.bisect_left(names, prefix)
+        while j < len(names) and names[j].startswith(prefix):
+            j += 1
+        return list(names[i:j])
+
+    def suggest(self, name: str) -> list[str]:
+        """Returns the cell names similar to name, for error messages.
+
+        Names starting with name are found with a binary search. Otherwise, the
+        names containing the longest possible leading part of name are returned.
+        """
+        matching_cells = self.startswith(name) if name else []
+        substring = name
+        while substring and not matching_cells:
+            matching_cells = [c for c in self.names if substring in c]
+            substring = substring[:-1]
+        return matching_cells
+
+
+def _suggest_cells(cells: Mapping[str, ComponentFactory], name: str) -> list[str]:
+    """Returns cell names similar to name, for error messages."""
+    if isinstance(cells, CellRegistry):
+        return cells.suggest(name)
+
+    substring = name
+    matching_cells: list[str] = []
+
+    # Reduce the length of the cell string until we find matches
+    while substring and not matching_cells:
+        matching_cells = [c for c in cells if substring in c]
+        substring = substring[:-1]
+    return matching_cells
+
+
 class Pdk(BaseModel):
     """Store layers, cross_sections, cell functions, simulation_settings ...
 
@@ -175,6 +304,8 @@ class Pdk(BaseModel):
         arbitrary_types_allowed=True,
         extra="forbid",
     )
+    _cell_registry: CellRegistry | None = PrivateAttr(default=None)
+    _cell_registry_version: int = PrivateAttr(default=0)
 
     def xsection(
         self, func: Callable[..., CrossSection]
@@ -214,7 +345,9 @@ class Pdk(BaseModel):
             self.cross_sections = cross_sections
             cells.update(self.cells)
             self.cells.update(cells)
+            pdk._invalidate_cell_registry()
 
+        self._invalidate_cell_registry()
         _set_active_pdk(self)
 
     def register_cells(self, **kwargs: Any) -> None:
@@ -229,6 +362,7 @@ class Pdk(BaseModel):
                 warnings.warn(f"Overwriting cell {name!r}", stacklevel=3)
 
             self.cells[name] = cell
+        self._invalidate_cell_registry()
 
     def register_cross_sections(self, **kwargs: Any) -> None:
         """Register cross_sections factories."""
@@ -259,6 +393,8 @@ class Pdk(BaseModel):
             cell_name: cell function. To update cells dict.
 
         """
+        from gdsfactory.read.from_yaml_template import cell_from_yaml_template
+
         message = "Updated" if update else "Registered"
 
         if dirpath:
@@ -282,22 +418,48 @@ class Pdk(BaseModel):
             self.cells[k] = v
             logger.info(f"{message} cell {k!r}")
 
+        self._invalidate_cell_registry()
+
     def remove_cell(self, name: str) -> None:
         """Removes cell from a PDK."""
         if name not in self.cells:
             raise ValueError(f"{name!r} not in {list(self.cells.keys())}")
         self.cells.pop(name)
+        self._invalidate_cell_registry()
         logger.info(f"Removed cell {name!r}")
 
+    def _invalidate_cell_registry(self) -> None:
+        """Drops the cell index so the next lookup rebuilds it."""
+        self._cell_registry = None
+        self._cell_registry_version += 1
+
+    def get_cell_registry(self) -> CellRegistry:
+        """Returns the indexed view of cells and containers.
+
+        The index is rebuilt after register_cells, register_cells_yaml,
+        remove_cell or activate, and when the cells or containers dicts are
+        replaced or resized directly.
+        """
+        registry = self._cell_registry
+        if registry is None or not registry.is_current(self.cells, self.containers):
+            registry = CellRegistry(
+                self.cells,
+                self.containers,
+                pdk_name=self.name,
+                version=self._cell_registry_version,
+            )
+            self._cell_registry = registry
+        return registry
+
     def get_cell(self, cell: CellSpec, **kwargs: Any) -> ComponentFactory:
         """Returns ComponentFactory from a cell spec."""
-        cells_and_containers = self._get_cells_and_containers()
-
         if callable(cell):
             return cell
-        elif isinstance(cell, str):
+
+        cells_and_containers = self.get_cell_registry()
+        if isinstance(cell, str):
             if cell not in cells_and_containers:
-                matching_cells = [c for c in cells_and_containers if cell in c]
+                matching_cells = cells_and_containers.suggest(cell)
                 raise ValueError(
                     f"{cell!r} from PDK {self.name!r} not in cells: Did you mean {matching_cells}?"
                 )
@@ -329,7 +491,7 @@ class Pdk(BaseModel):
     ) -> Component:
         """Returns component from a component spec."""
         if include_containers:
-            cells = self._get_cells_and_containers()
+            cells: Mapping[str, ComponentFactory] = self.get_cell_registry()
         else:
             cells = self.cells
 
@@ -337,16 +499,6 @@ class Pdk(BaseModel):
             component=component, cells=cells, settings=settings, **kwargs
         )
 
-    def _get_cells_and_containers(self) -> dict[str, ComponentFactory]:
-        """Returns a dictionary of cells and containers."""
-        cells_and_containers = {**self.cells, **self.containers}
-        conflicting_names = set(self.cells.keys()).intersection(self.containers.keys())
-        if conflicting_names:
-            raise ValueError(
-                f"PDK {self.name!r} has overlapping cell names between cells and containers: {list(conflicting_names)}. "
-            )
-        return cells_and_containers
-
     def get_symbol(self, component: ComponentSpec, **kwargs: Any) -> Component:
         """Returns a component's symbol from a component spec."""
         # this is a pretty rough first implementation
@@ -361,7 +513,7 @@ class Pdk(BaseModel):
     def _get_component(
         self,
         component: ComponentSpec,
-        cells: dict[str, ComponentFactory],
+        cells: Mapping[str, ComponentFactory],
         settings: Mapping[str, Any] | None = None,
         **kwargs: Any,
     ) -> Component:
@@ -373,8 +525,6 @@ class Pdk(BaseModel):
             settings: settings to override.
             kwargs: settings to override.
         """
-        cell_names = sorted(cells)
-
         settings = settings or {}
         kwargs = kwargs or {}
         kwargs.update(settings)
@@ -387,16 +537,8 @@ class Pdk(BaseModel):
             _component = component(**kwargs)
             return type(_component)(base=_component.base)  # type: ignore[call-overload,no-any-return]
         elif isinstance(component, str):
-            if component not in cell_names:
-                substring = component
-                matching_cells: list[str] = []
-
-                # Reduce the length of the cell string until we find matches
-                while substring and not matching_cells:
-                    matching_cells = [c for c in cells if substring in c]
-                    if not matching_cells:
-                        substring = substring[:-1]  # Remove the last character
-
+            if component not in cells:
+                matching_cells = _suggest_cells(cells, component)
                 raise ValueError(
                     f"{component!r} not in PDK {self.name!r}. Did you mean {matching_cells}?"
                 )
@@ -431,18 +573,21 @@ class Pdk(BaseModel):
     ) -> CrossSection:
         """Returns cross_section from a cross_section spec.
 
+        Factory results are cached on (factory, kwargs), so repeated specs
+        return the same frozen CrossSection instance.
+
         Args:
             cross_section: CrossSection, CrossSectionFactory, Transition, string or dict.
             kwargs: settings to override.
         """
         if callable(cross_section):
-            return cross_section(**kwargs)
+            return _get_cross_section_cached(cross_section, kwargs)
         elif isinstance(cross_section, str):
             if cross_section not in self.cross_sections:
                 cross_sections = list(self.cross_sections.keys())
                 raise ValueError(f"{cross_section!r} not in {cross_sections}")
             xs = self.cross_sections[cross_section]
-            return xs(**kwargs)
+            return _get_cross_section_cached(xs, kwargs)
         elif isinstance(cross_section, dict):
             xs_name = cross_section.get("cross_section", None)
             settings = cross_section.get("settings", {})
@@ -587,7 +732,7 @@ class Pdk(BaseModel):
             (
                 key
                 for key, value in self.cross_sections.items()
-                if value() == cross_section
+                if _get_cross_section_cached(value, {}) == cross_section
             ),
             None,
         )
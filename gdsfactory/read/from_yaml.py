@@ -49,21 +49,25 @@ routes:
 
 from __future__ import annotations
 
+import hashlib
+import os
 import pathlib
 import re
 import warnings
-from collections.abc import Callable
-from copy import deepcopy
+from collections.abc import Callable, Hashable, Iterator
+from contextlib import contextmanager
 from functools import partial
-from typing import IO, TYPE_CHECKING, Any, Literal, Protocol, cast
+from typing import IO, TYPE_CHECKING, Any, Literal, NamedTuple, Protocol, cast
 
 import kfactory as kf
 import networkx as nx
 import yaml
+from cachetools import LRUCache
 
 from gdsfactory import typings
 from gdsfactory.add_pins import add_instance_label
 from gdsfactory.component import Component, ComponentReference
+from gdsfactory.config import CONF
 from gdsfactory.schematic import (
     Bundle,
     GridArray,
@@ -154,6 +158,11 @@ valid_route_keys = [
 ]
 # Recognized keys within a YAML route definition
 
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+# validated netlists keyed on (path, mtime, size) or the YAML text hash
+netlist_cache: LRUCache[Hashable, Netlist] = LRUCache(maxsize=CONF.netlist_cache_size)
+
 
 def _get_anchor_point_from_name(
     ref: ComponentReference, anchor_name: str
@@ -805,9 +814,8 @@ def from_yaml(
     routing_strategies = routing_strategies or {}
 
     c = Component()
-    dct = _load_yaml_str(yaml_str)
     pdk = get_active_pdk()
-    net = Netlist.model_validate(dct)
+    net = _get_netlist(yaml_str)
     g = _get_dependency_graph(net)
     refs = _get_references(c, pdk, net.instances)
     _place_and_connect(g, refs, net.connections, net.placements)
@@ -818,25 +826,80 @@ def from_yaml(
     return c
 
 
+def _load_yaml(text: str) -> Any:
+    """Parses YAML with the C loader, falling back to FullLoader for python tags."""
+    try:
+        return yaml.load(text, Loader=YamlLoader)
+    except yaml.constructor.ConstructorError:
+        return yaml.load(text, Loader=yaml.FullLoader)
+
+
 def _load_yaml_str(yaml_str: Any) -> dict[str, Any]:
     dct: dict[str, Any] = {}
     if isinstance(yaml_str, dict):
-        dct = deepcopy(yaml_str)
+        dct = yaml_str
     elif isinstance(yaml_str, Netlist):
-        dct = deepcopy(yaml_str.model_dump())
+        dct = yaml_str.model_dump()
     elif (isinstance(yaml_str, str) and "\n" in yaml_str) or isinstance(yaml_str, IO):
-        dct = yaml.load(yaml_str, Loader=yaml.FullLoader)
-    elif isinstance(yaml_str, str):
-        with open(yaml_str) as f:
-            dct = yaml.load(f, Loader=yaml.FullLoader)
-    elif isinstance(yaml_str, pathlib.Path):
-        with open(yaml_str) as f:
-            dct = yaml.load(f, Loader=yaml.FullLoader)
+        dct = _load_yaml(yaml_str if isinstance(yaml_str, str) else yaml_str.read())
+    elif isinstance(yaml_str, str | pathlib.Path):
+        dct = _load_yaml(pathlib.Path(yaml_str).read_text())
     else:
         raise ValueError("Invalid format for 'yaml_str'.")
     return dct
 
 
+def _get_netlist(yaml_str: Any) -> Netlist:
+    """Returns the validated Netlist for a YAML string, file, dict or Netlist.
+
+    Netlists parsed from files and strings are cached in netlist_cache, keyed on
+    the file path, modification time and size, or on the hash of the string, and
+    on the active PDK cells. The returned Netlist can be shared, so it must not be
+    modified. Dicts are validated without a deep copy.
+    """
+    from gdsfactory.pdk import get_active_pdk
+
+    if isinstance(yaml_str, Netlist):
+        return yaml_str
+    if isinstance(yaml_str, dict):
+        # Instance validation updates the instance dicts, which are the only copies needed
+        instances = yaml_str.get("instances") or {}
+        return Netlist.model_validate(
+            {
+                **yaml_str,
+                "instances": {
+                    name: dict(inst) if isinstance(inst, dict) else inst
+                    for name, inst in instances.items()
+                },
+            }
+        )
+    text: str | None = None
+    key: Hashable
+    if isinstance(yaml_str, IO):
+        text = yaml_str.read()
+    elif isinstance(yaml_str, str) and "\n" in yaml_str:
+        text = yaml_str
+    elif isinstance(yaml_str, str | pathlib.Path):
+        filepath = pathlib.Path(yaml_str).resolve()
+        stat = os.stat(filepath)
+        key = (str(filepath), stat.st_mtime_ns, stat.st_size)
+    else:
+        raise ValueError("Invalid format for 'yaml_str'.")
+    if text is not None:
+        key = hashlib.sha256(text.encode()).hexdigest()
+
+    # instance settings and info are validated against the cells of the active PDK
+    pdk = get_active_pdk()
+    key = (key, id(pdk), pdk.get_cell_registry().version)
+    net = netlist_cache.get(key)
+    if net is None:
+        dct = _load_yaml(text) if text is not None else _load_yaml_str(yaml_str)
+        net = Netlist.model_validate(dct)
+        netlist_cache[key] = net
+    # instance and route settings are passed on to user factories, which may mutate them
+    return net.model_copy(deep=True)
+
+
 def _get_dependency_graph(net: Netlist) -> nx.DiGraph:
     g = nx.DiGraph()
     allowed_keys = {"x", "y", "xmin", "ymin", "xmax", "ymax"}
@@ -892,12 +955,32 @@ def _get_dependency_graph(net: Netlist) -> nx.DiGraph:
     return g
 
 
+def _freeze(value: Any) -> Hashable:
+    """Returns a hashable version of a settings value, including its type."""
+    if isinstance(value, dict):
+        return tuple(sorted((k, _freeze(v)) for k, v in value.items()))
+    if isinstance(value, list | tuple):
+        return type(value), tuple(_freeze(v) for v in value)
+    hash(value)
+    return type(value), value
+
+
 def _get_references(
     c: Component, pdk: "Pdk", instances: dict[str, NetlistInstance]
 ) -> dict[str, ComponentReference]:
     refs: dict[str, ComponentReference] = {}
+    # instances with the same component and settings share one cell
+    components: dict[Hashable, Component] = {}
     for name, inst in instances.items():
-        comp = pdk.get_component(component=inst.component, settings=inst.settings)
+        try:
+            key: Hashable = (inst.component, _freeze(inst.settings))
+        except TypeError:
+            key = None
+        comp = components.get(key) if key is not None else None
+        if comp is None:
+            comp = pdk.get_component(component=inst.component, settings=inst.settings)
+            if key is not None:
+                components[key] = comp
         if isinstance(inst.array, OrthogonalGridArray):
             ref = c.add_ref(
                 comp,
@@ -927,24 +1010,72 @@ def _get_references(
     return refs
 
 
-def _place_and_connect(
+class _Connection(NamedTuple):
+    """Connection of port p1 of instance i1 to port p2 of instance i2.
+
+    ia and ib are the array indices, None for instances that are not arrays.
+    """
+
+    i1: str
+    ia1: int | None
+    ib1: int | None
+    p1: str
+    i2: str
+    ia2: int | None
+    ib2: int | None
+    p2: str
+
+
+class _PlacementStep(NamedTuple):
+    name: str
+    placement: Placement | None
+    connection: _Connection | None
+
+
+@contextmanager
+def _deferred_bbox_update(refs: dict[str, ComponentReference]) -> Iterator[None]:
+    """Defers bounding box updates of the cell containing refs.
+
+    Moving an instance or adding a shape invalidates the bounding box of its
+    parent cell, which KLayout recomputes from all its instances on the next
+    bounding box query. Inside this context instance bounding boxes only use
+    their child cells, so placing n instances takes O(n) instead of O(n^2).
+    """
+    if not refs:
+        yield
+        return
+    layout = next(iter(refs.values())).instance.parent_cell.layout()
+    layout.update()
+    layout.start_changes()
+    try:
+        yield
+    finally:
+        layout.end_changes()
+
+
+def _get_placement_plan(
     g: nx.DiGraph,
     refs: dict[str, ComponentReference],
     connections: dict[str, str],
     placements: dict[str, Placement],
-) -> None:
+) -> list[_PlacementStep]:
+    """Returns the placements and connections in dependency order.
+
+    Resolves the graph traversal, parses the array indices and checks the
+    instance names once, before any instance is moved.
+    """
     directed_connections = _get_directed_connections(connections)
+    plan: list[_PlacementStep] = []
 
     for root in _graph_roots(g):
         pl = placements.get(root)
         if pl is not None:
-            _update_reference_by_placement(refs, root, pl)
+            plan.append(_PlacementStep(root, pl, None))
         for i2, i1 in nx.dfs_edges(g, root):
             ports = directed_connections.get(i1, {}).get(i2, None)
             pl = placements.get(i1)
-            if pl is not None:
-                _update_reference_by_placement(refs, i1, pl)
-            if ports is not None:  # no elif!
+            connection = None
+            if ports is not None:
                 p1, p2 = ports
                 i2name, i2a, i2b = _parse_maybe_arrayed_instance(i2)
                 i1name, i1a, i1b = _parse_maybe_arrayed_instance(i1)
@@ -952,29 +1083,42 @@ def _place_and_connect(
                 for i in [i1name, i2name]:
                     if i not in refs:
                         raise ValueError(f"{i!r} not in {list(refs)}")
+                connection = _Connection(i1name, i1a, i1b, p1, i2name, i2a, i2b, p2)
+            if pl is not None or connection is not None:
+                plan.append(_PlacementStep(i1, pl, connection))
+    return plan
+
+
+def _place_and_connect(
+    g: nx.DiGraph,
+    refs: dict[str, ComponentReference],
+    connections: dict[str, str],
+    placements: dict[str, Placement],
+) -> None:
+    plan = _get_placement_plan(g, refs, connections, placements)
+    if not plan:
+        return
+
+    with _deferred_bbox_update(refs):
+        for name, pl, connection in plan:
+            if pl is not None:
+                _update_reference_by_placement(refs, name, pl)
+            if connection is not None:
+                _connect(refs, connection)
+
 
-                if i1a is not None and i1b is not None:
-                    port1 = refs[i1name].ports[p1, i1a, i1b]
-                    if i2a is not None and i2b is not None:
-                        refs[i1name].connect(port1, refs[i2name].ports[p2, i2a, i2b])
-                    else:
-                        if i2 not in refs:
-                            raise ValueError(f"{i2!r} not in {list(refs)}")
-                        refs[i1name].connect(port1, other=refs[i2], other_port_name=p2)
-
-                else:
-                    if i2a is not None and i2b is not None:
-                        if i1 not in refs:
-                            raise ValueError(f"{i1!r} not in {list(refs)}")
-                        refs[i1].connect(
-                            p1, other=refs[i2name], other_port_name=(p2, i2a, i2b)
-                        )
-                    else:
-                        if i1 not in refs:
-                            raise ValueError(f"{i1!r} not in {list(refs)}")
-                        if i2 not in refs:
-                            raise ValueError(f"{i2!r} not in {list(refs)}")
-                        refs[i1].connect(p1, other=refs[i2], other_port_name=p2)
+def _connect(refs: dict[str, ComponentReference], connection: _Connection) -> None:
+    i1, ia1, ib1, p1, i2, ia2, ib2, p2 = connection
+    if ia1 is not None and ib1 is not None:
+        port1 = refs[i1].ports[p1, ia1, ib1]
+        if ia2 is not None and ib2 is not None:
+            refs[i1].connect(port1, refs[i2].ports[p2, ia2, ib2])
+        else:
+            refs[i1].connect(port1, other=refs[i2], other_port_name=p2)
+    elif ia2 is not None and ib2 is not None:
+        refs[i1].connect(p1, other=refs[i2], other_port_name=(p2, ia2, ib2))
+    else:
+        refs[i1].connect(p1, other=refs[i2], other_port_name=p2)
 
 
 def _add_routes(
@@ -1057,8 +1201,9 @@ def _add_labels(
     refs: dict[str, ComponentReference],
     label_instance_function: LabelInstanceFunction,
 ) -> Component:
-    for name, ref in refs.items():
-        label_instance_function(component=c, instance_name=name, reference=ref)
+    with _deferred_bbox_update(refs):
+        for name, ref in refs.items():
+            label_instance_function(component=c, instance_name=name, reference=ref)
     return c
 
 
@@ -2079,6 +2224,45 @@ connections:
   b1,o1: s1,o2
 """
 
+
+def _demo_from_yaml_large(n: int = 10_000) -> None:
+    """Times parsing, validating and building a netlist with n instances.
+
+    The netlist has rows of 100 straights of 7 different lengths connected end
+    to end, with each row placed below the previous one.
+    """
+    import time
+
+    instances = {
+        f"s{i}": {"component": "straight", "settings": {"length": 1 + i % 7}}
+        for i in range(n)
+    }
+    connections = {f"s{i},o1": f"s{i - 1},o2" for i in range(1, n) if i % 100}
+    placements = {
+        f"s{i}": {"x": 0, "y": f"s{i - 100},o1", "dy": -10} for i in range(100, n, 100)
+    }
+    yaml_str = yaml.safe_dump(
+        dict(
+            name=f"large_{n}",
+            instances=instances,
+            connections=connections,
+            placements=placements,
+        )
+    )
+
+    t0 = time.perf_counter()
+    net = _get_netlist(yaml_str)
+    t1 = time.perf_counter()
+    c = from_yaml(net)
+    t2 = time.perf_counter()
+    c = from_yaml(yaml_str, name=f"large_{n}_cached")
+    t3 = time.perf_counter()
+    print(
+        f"{n} instances: parse+validate {t1 - t0:.2f}s, build {t2 - t1:.2f}s, "
+        f"from_yaml with cached netlist {t3 - t2:.2f}s, {len(c.insts)} instances"
+    )
+
+
 if __name__ == "__main__":
     c = from_yaml(sample_array)
     # c = from_yaml(sample_width_missmatch)
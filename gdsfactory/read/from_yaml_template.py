@@ -8,7 +8,7 @@ import yaml
 from kfactory import cell
 
 from gdsfactory.component import Component
-from gdsfactory.read.from_yaml import from_yaml
+from gdsfactory.read.from_yaml import YamlLoader, from_yaml
 from gdsfactory.typings import RoutingStrategies
 
 if TYPE_CHECKING:
@@ -63,7 +63,9 @@ def _split_yaml_definition(subpic_yaml: _YamlDefinition) -> tuple[str, dict[str,
             subpic_text = f.readlines()
     main_file, default_settings_string = split_default_settings_from_yaml(subpic_text)
     if default_settings_string:
-        default_settings = yaml.safe_load(default_settings_string)["default_settings"]
+        default_settings = yaml.load(default_settings_string, Loader=YamlLoader)[
+            "default_settings"
+        ]
     else:
         default_settings = {}
     return main_file, default_settings
@@ -1,10 +1,10 @@
 from __future__ import annotations
 
+import heapq
 from collections.abc import Sequence
-from typing import Any, cast
+from typing import Any
 
 import klayout.dbcore as kdb
-import networkx as nx
 import numpy as np
 import numpy.typing as npt
 from klayout.dbcore import DPoint
@@ -60,14 +60,115 @@ def _parse_bbox_to_array(bbox: kdb.DBox | kdb.Box) -> npt.NDArray[np.floating[An
     return np.array(bbox_values, dtype=np.float64)
 
 
+def _nearest_index(
+    axis: npt.NDArray[np.floating[Any]], values: npt.NDArray[np.floating[Any]]
+) -> npt.NDArray[np.intp]:
+    """Returns the index of the closest axis value for each value.
+
+    Same as np.abs(axis - value).argmin() per value, using a binary search.
+
+    Args:
+        axis: sorted grid coordinates.
+        values: coordinates to look up.
+    """
+    if len(axis) < 2:
+        return np.zeros(len(values), dtype=np.intp)
+    index = np.clip(np.searchsorted(axis, values), 1, len(axis) - 1)
+    lower = np.abs(axis[index - 1] - values) <= np.abs(axis[index] - values)
+    return index - lower
+
+
+def _paint_boxes(
+    shape: tuple[int, int],
+    xmin: npt.NDArray[np.intp],
+    xmax: npt.NDArray[np.intp],
+    ymin: npt.NDArray[np.intp],
+    ymax: npt.NDArray[np.intp],
+) -> npt.NDArray[np.bool_]:
+    """Returns a grid with grid[xmin:xmax, ymin:ymax] set for every box.
+
+    All boxes are painted at once through a 2D difference array.
+
+    Args:
+        shape: grid shape.
+        xmin: first x index of each box.
+        xmax: x index past the end of each box.
+        ymin: first y index of each box.
+        ymax: y index past the end of each box.
+    """
+    valid = (xmax > xmin) & (ymax > ymin)
+    xmin, xmax, ymin, ymax = xmin[valid], xmax[valid], ymin[valid], ymax[valid]
+    diff = np.zeros((shape[0] + 1, shape[1] + 1), dtype=np.int32)
+    np.add.at(diff, (xmin, ymin), 1)
+    np.add.at(diff, (xmax, ymin), -1)
+    np.add.at(diff, (xmin, ymax), -1)
+    np.add.at(diff, (xmax, ymax), 1)
+    return diff.cumsum(axis=0).cumsum(axis=1)[: shape[0], : shape[1]] > 0
+
+
+def _rasterize_region(
+    region: kdb.Region,
+    x: npt.NDArray[np.floating[Any]],
+    y: npt.NDArray[np.floating[Any]],
+    dbu: float,
+) -> npt.NDArray[np.bool_]:
+    """Returns a grid with the cells whose center lies inside the region.
+
+    Scanline fill: each non-horizontal edge is intersected with the rows it spans,
+    crossings are sorted per row and filled pairwise (even-odd on the merged region).
+
+    Args:
+        region: obstacles in dbu.
+        x: grid x coordinates in um.
+        y: grid y coordinates in um.
+        dbu: database unit in um.
+    """
+    shape = (len(x), len(y))
+    edges = np.array(
+        [(e.p1.x, e.p1.y, e.p2.x, e.p2.y) for e in region.merged().edges().each()],
+        dtype=np.float64,
+    ).reshape(-1, 4)
+    edges *= dbu
+    edges = edges[edges[:, 1] != edges[:, 3]]
+    if not len(edges) or min(shape) < 2:
+        return np.zeros(shape, dtype=np.bool_)
+
+    xc = x + (x[1] - x[0]) / 2
+    yc = y + (y[1] - y[0]) / 2
+    x1, y1, x2, y2 = edges.T
+
+    # rows with y1 <= yc < y2 (half open so shared vertices count once)
+    row_start = np.searchsorted(yc, np.minimum(y1, y2), side="left")
+    row_end = np.searchsorted(yc, np.maximum(y1, y2), side="left")
+    counts = row_end - row_start
+    edge_index = np.repeat(np.arange(len(edges)), counts)
+    rows = np.repeat(row_start, counts) + (
+        np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    )
+    t = (yc[rows] - y1[edge_index]) / (y2[edge_index] - y1[edge_index])
+    crossings = x1[edge_index] + t * (x2[edge_index] - x1[edge_index])
+
+    order = np.lexsort((crossings, rows))
+    rows = rows[order][0::2]
+    crossings = crossings[order]
+    col_start = np.searchsorted(xc, crossings[0::2], side="left")
+    col_end = np.searchsorted(xc, crossings[1::2], side="left")
+
+    diff = np.zeros((shape[0] + 1, shape[1]), dtype=np.int32)
+    np.add.at(diff, (col_start, rows), 1)
+    np.add.at(diff, (col_end, rows), -1)
+    return diff.cumsum(axis=0)[: shape[0]] > 0
+
+
 def _generate_grid(
     c: Component,
     resolution: float = 0.5,
     avoid_layers: Sequence[LayerSpec] | None = None,
     distance: float = 1,
+    exact: bool = False,
 ) -> tuple[
     npt.NDArray[np.floating[Any]],
-    npt.NDArray[np.integer[Any]],
+    npt.NDArray[np.floating[Any]],
     npt.NDArray[np.floating[Any]],
 ]:
     """Generate discretization grid that the algorithm will step through.
@@ -77,6 +178,8 @@ def _generate_grid(
         resolution: Discretization resolution in um.
         avoid_layers: List of layers to avoid.
         distance: Distance from obstacles in um.
+        exact: if True, rasterizes the polygons of avoid_layers sized by distance.
+            Otherwise blocks the bounding box of each polygon (or instance).
     """
     bbox_int = _parse_bbox_to_array(c.dbbox())
     bbox = bbox_int
@@ -86,41 +189,41 @@ def _generate_grid(
     _b1 = float(bbox[0][1]) - resolution
     _b2 = float(bbox[1][1]) + resolution
 
-    _a = np.linspace(_a1, _a2, int((_a2 - _a1) / resolution), endpoint=True)
-
-    _b = np.linspace(_b1, _b2, int((_b2 - _b1) / resolution), endpoint=True)
-
-    x, y = np.meshgrid(_a, _b)  # discretize component space
-    x, y = x[0], y[:, 0]  # weed out copies
-    assert isinstance(x, np.ndarray)
-    assert isinstance(y, np.ndarray)
-    grid = np.zeros(
-        (len(x), len(y))
-    )  # mapping from gdsfactory's x-, y- coordinate to grid vertex
+    x = np.linspace(_a1, _a2, int((_a2 - _a1) / resolution), endpoint=True)
+    y = np.linspace(_b1, _b2, int((_b2 - _b1) / resolution), endpoint=True)
+    # mapping from gdsfactory's x-, y- coordinate to grid vertex
+    shape = (len(x), len(y))
 
     # assign 1 for obstacles
-    if avoid_layers is None:
-        for inst in c.insts:
-            bbox_array = _parse_bbox_to_array(inst.dbbox())
-            xmin = np.abs(x - bbox_array[0][0] + distance).argmin()
-            xmax = np.abs(x - bbox_array[1][0] - distance).argmin()
-            ymin = np.abs(y - bbox_array[0][1] + distance).argmin()
-            ymax = np.abs(y - bbox_array[1][1] - distance).argmin()
-            grid[xmin:xmax, ymin:ymax] = 1
+    if exact and avoid_layers is not None:
+        region = kdb.Region()
+        for layer in avoid_layers:
+            region += c.get_region(layer)
+        region = region.sized(c.kcl.to_dbu(distance))
+        grid = _rasterize_region(region, x, y, c.kcl.dbu)
     else:
-        all_refs = _extract_all_bbox(c, avoid_layers)
-        for layer in all_refs:
-            for polygons in layer.values():
-                for polygon in polygons:
-                    bbox_array = _parse_bbox_to_array(polygon.bbox())
-                    bbox_array_float = bbox_array / 1000
-                    xmin = np.abs(x - bbox_array_float[0][0] + distance).argmin()
-                    xmax = np.abs(x - bbox_array_float[1][0] - distance).argmin()
-                    ymin = np.abs(y - bbox_array_float[0][1] + distance).argmin()
-                    ymax = np.abs(y - bbox_array_float[1][1] - distance).argmin()
-                    grid[xmin:xmax, ymin:ymax] = 1
-
-    return np.round(grid, 3), np.round(x, 3), np.round(y, 3)
+        if avoid_layers is None:
+            bboxes = [inst.dbbox() for inst in c.insts]
+        else:
+            dbu = c.kcl.dbu
+            bboxes = [
+                polygon.bbox().to_dtype(dbu)
+                for layer in _extract_all_bbox(c, avoid_layers)
+                for polygons in layer.values()
+                for polygon in polygons
+            ]
+        boxes = np.array(
+            [(b.left, b.bottom, b.right, b.top) for b in bboxes], dtype=np.float64
+        ).reshape(-1, 4)
+        grid = _paint_boxes(
+            shape,
+            _nearest_index(x, boxes[:, 0] - distance),
+            _nearest_index(x, boxes[:, 2] + distance),
+            _nearest_index(y, boxes[:, 1] - distance),
+            _nearest_index(y, boxes[:, 3] + distance),
+        )
+
+    return grid.astype(np.float64), np.round(x, 3), np.round(y, 3)
 
 
 def simplify_path(waypoints: Coordinates, tolerance: float) -> list[Coordinate]:
@@ -138,6 +241,214 @@ def simplify_path(waypoints: Coordinates, tolerance: float) -> list[Coordinate]:
     return list(simplified_line.coords)
 
 
+_DIRECTIONS = ((1, 0), (0, 1), (-1, 0), (0, -1))
+
+
+def get_astar_grid(
+    component: Component,
+    resolution: float = 1,
+    avoid_layers: Sequence[LayerSpec] | None = None,
+    distance: float = 8,
+    exact: bool = False,
+    cache: dict[
+        tuple[Any, ...],
+        tuple[
+            npt.NDArray[np.floating[Any]],
+            npt.NDArray[np.floating[Any]],
+            npt.NDArray[np.floating[Any]],
+        ],
+    ]
+    | None = None,
+) -> tuple[
+    npt.NDArray[np.floating[Any]],
+    npt.NDArray[np.floating[Any]],
+    npt.NDArray[np.floating[Any]],
+]:
+    """Returns the obstacle grid and its x, y coordinates for route_astar.
+
+    Build it once and pass it to several route_astar calls on the same component.
+    Each route marks its own grid cells as obstacles, so later routes avoid it.
+
+    Args:
+        component: Component to route through.
+        resolution: Discretization resolution in um.
+        avoid_layers: List of layers to avoid.
+        distance: Distance from obstacles in um.
+        exact: if True, rasterizes the polygons of avoid_layers sized by distance.
+        cache: optional dict to reuse obstacle maps across calls.
+            Keyed on component name, layers, resolution, distance and exact.
+            Only reuse it while the components it was filled from are unchanged.
+    """
+    key = (
+        component.name,
+        tuple(str(layer) for layer in avoid_layers or ()),
+        avoid_layers is None,
+        resolution,
+        distance,
+        exact,
+    )
+    if cache is not None and key in cache:
+        grid, x, y = cache[key]
+        return grid.copy(), x, y
+
+    grid, x, y = _generate_grid(component, resolution, avoid_layers, distance, exact)
+    if cache is not None:
+        cache[key] = grid.copy(), x, y
+    return grid, x, y
+
+
+def _check_grid(
+    grid: tuple[
+        npt.NDArray[np.floating[Any]],
+        npt.NDArray[np.floating[Any]],
+        npt.NDArray[np.floating[Any]],
+    ],
+    resolution: float,
+    ports: Sequence[Port],
+) -> None:
+    """Raises ValueError if grid was not built with resolution or misses a port.
+
+    Args:
+        grid: obstacle grid and its x, y coordinates from get_astar_grid.
+        resolution: Discretization resolution in um.
+        ports: ports to route between.
+    """
+    obstacles, x, y = grid
+    if obstacles.shape != (len(x), len(y)):
+        raise ValueError(
+            f"grid shape {obstacles.shape} does not match its coordinates "
+            f"{(len(x), len(y))}"
+        )
+    for axis in (x, y):
+        n = len(axis)
+        if n < 2:
+            continue
+        # _generate_grid spreads int(span / resolution) points over the span
+        step = (axis[-1] - axis[0]) / (n - 1)
+        if not n / (n - 1) - 1e-3 <= step / resolution <= (n + 1) / (n - 1) + 1e-3:
+            raise ValueError(
+                f"grid step {step:.3f} um does not match {resolution=}. "
+                "Build the grid with get_astar_grid and the same resolution."
+            )
+    for port in ports:
+        if not (x[0] <= port.x <= x[-1] and y[0] <= port.y <= y[-1]):
+            raise ValueError(
+                f"Port {port.name!r} at {port.center} is outside the grid. "
+                "Build the grid with get_astar_grid from the routed component."
+            )
+
+
+def _find_nearest_free_node(
+    grid: npt.NDArray[np.floating[Any]],
+    node: tuple[int, int],
+    window: int = 16,
+) -> tuple[int, int]:
+    """Returns node if it is a free grid cell, else the closest free cell.
+
+    Searches a window around node first and the full grid only if the window
+    has no free cell closer than its half width.
+
+    Args:
+        grid: obstacle grid, 1 for obstacles.
+        node: grid indices (i, j), may lie outside the grid.
+        window: half width of the local search window in grid cells.
+    """
+    i, j = node
+    nx, ny = grid.shape
+    if 0 <= i < nx and 0 <= j < ny and grid[i, j] != 1:
+        return node
+
+    i0, i1 = (min(max(k, 0), nx) for k in (i - window, i + window + 1))
+    j0, j1 = (min(max(k, 0), ny) for k in (j - window, j + window + 1))
+    local = np.argwhere(grid[i0:i1, j0:j1] != 1)
+    if len(local):
+        local += (i0, j0)
+        distances = np.square(local - np.array(node)).sum(axis=1)
+        k = distances.argmin()
+        # every cell outside the window is further than window away
+        if distances[k] <= window**2:
+            return int(local[k, 0]), int(local[k, 1])
+
+    free = np.argwhere(grid != 1)
+    if not len(free):
+        raise ValueError("No free grid cells to route through.")
+    nearest = free[np.square(free - np.array(node)).sum(axis=1).argmin()]
+    return int(nearest[0]), int(nearest[1])
+
+
+def _astar_heuristic(i: int, j: int, ei: int, ej: int, bend_penalty: float) -> float:
+    """Manhattan distance plus one bend when the end is not in line."""
+    di = abs(i - ei)
+    dj = abs(j - ej)
+    return di + dj + bend_penalty if di and dj else di + dj
+
+
+def _astar(
+    grid: npt.NDArray[np.floating[Any]],
+    start_node: tuple[int, int],
+    end_node: tuple[int, int],
+    bend_penalty: float = 1,
+) -> list[tuple[int, int]]:
+    """Returns the grid cells of the cheapest 4-connected path from start to end.
+
+    Runs A* directly on the obstacle grid with a binary heap.
+    Each step costs 1 and each change of direction adds bend_penalty.
+
+    Args:
+        grid: obstacle grid, 1 for obstacles.
+        start_node: start grid indices (i, j).
+        end_node: end grid indices (i, j).
+        bend_penalty: extra cost per bend in grid steps.
+    """
+    nx, ny = grid.shape
+    blocked = np.ascontiguousarray(grid == 1).tobytes()
+    ei, ej = end_node
+    si, sj = start_node
+
+    # states are (i, j, direction of arrival) stored flat at (i * ny + j) * 4 + d
+    g_cost = np.full(nx * ny * 4, np.inf)
+    parents = np.full(nx * ny * 4, -1, dtype=np.int64)
+    # the start node can leave in any direction without a bend
+    start = (si * ny + sj) * 4
+    g_cost[start : start + 4] = 0
+    h = _astar_heuristic(si, sj, ei, ej, bend_penalty)
+    # ties on f are broken towards larger g (deeper nodes) to expand fewer cells
+    heap: list[tuple[float, float, int, int, int]] = [
+        (h, 0, si, sj, d) for d in range(4)
+    ]
+
+    while heap:
+        _, neg_g, i, j, d = heapq.heappop(heap)
+        g = -neg_g
+        state = (i * ny + j) * 4 + d
+        if i == ei and j == ej:
+            path = [(i, j)]
+            state = int(parents[state])
+            while state >= 0:
+                cell = state // 4
+                path.append((cell // ny, cell % ny))
+                state = int(parents[state])
+            return path[::-1]
+
+        if g > g_cost[state]:
+            continue
+
+        for direction, (di, dj) in enumerate(_DIRECTIONS):
+            ni = i + di
+            nj = j + dj
+            if ni < 0 or nj < 0 or ni >= nx or nj >= ny or blocked[ni * ny + nj]:
+                continue
+            ng = g + 1 if d == direction else g + 1 + bend_penalty
+            next_state = (ni * ny + nj) * 4 + direction
+            if ng < g_cost[next_state]:
+                g_cost[next_state] = ng
+                parents[next_state] = state
+                f = ng + _astar_heuristic(ni, nj, ei, ej, bend_penalty)
+                heapq.heappush(heap, (f, -ng, ni, nj, direction))
+
+    raise ValueError(f"No path found between grid nodes {start_node} and {end_node}")
+
+
 def route_astar(
     component: Component,
     port1: Port,
@@ -147,9 +458,17 @@ def route_astar(
     distance: float = 8,
     cross_section: CrossSectionSpec = "strip",
     bend: ComponentSpec = "wire_corner",
+    bend_penalty: float = 1,
+    exact: bool = False,
+    grid: tuple[
+        npt.NDArray[np.floating[Any]],
+        npt.NDArray[np.floating[Any]],
+        npt.NDArray[np.floating[Any]],
+    ]
+    | None = None,
     **kwargs: Any,
 ) -> Route:
-    """Bidirectional routing function using NetworkX. Finds a route between two ports avoiding obstacles.
+    """A* routing function on an obstacle grid. Finds a route between two ports avoiding obstacles.
 
     Args:
         component: Component the route and ports belong to.
@@ -160,18 +479,24 @@ def route_astar(
         distance: Distance from obstacles in um.
         cross_section: Cross-section specification.
         bend: Component to use for bends. Use wire_corner for Manhattan routing or bend_euler for Euler routing.
+        bend_penalty: extra cost of each bend, in grid steps.
+        exact: if True, avoids the polygons of avoid_layers sized by distance.
+            Otherwise avoids the bounding box of each polygon.
+        grid: optional obstacle grid from get_astar_grid, reused across routes.
+            Build it with the same resolution. avoid_layers, distance and exact are ignored.
+            The grid arrays are updated in place: the cells of this route are marked
+            as obstacles, so later routes on the same grid avoid it.
+            Pass a copy to keep the grid unchanged.
         kwargs: cross-section settings.
     """
     cross_section = gf.get_cross_section(cross_section, **kwargs)
-    grid, x, y = _generate_grid(component, resolution, avoid_layers, distance)
-    G_ = nx.grid_2d_graph(len(x), len(y))
-    G = cast(nx.Graph, G_)
-
-    # Remove nodes representing obstacles
-    for i in range(len(x)):
-        for j in range(len(y)):
-            if grid[i, j] == 1:
-                G.remove_node((i, j))
+    if grid is None:
+        grid = _generate_grid(component, resolution, avoid_layers, distance, exact)
+        reuse_grid = False
+    else:
+        _check_grid(grid, resolution, (port1, port2))
+        reuse_grid = True
+    obstacles, x, y = grid
 
     # Unit conversion
     port1x = port1.x
@@ -190,16 +515,15 @@ def route_astar(
     )
 
     # Find the closest valid nodes
-    start_node = min(
-        G.nodes,
-        key=lambda node: np.linalg.norm(np.array(node) - np.array(start_node)),  # type: ignore[arg-type, return-value]
-    )
-    end_node = min(
-        G.nodes,
-        key=lambda node: np.linalg.norm(np.array(node) - np.array(end_node)),  # type: ignore[arg-type, return-value]
-    )
+    start_node = _find_nearest_free_node(obstacles, start_node)
+    end_node = _find_nearest_free_node(obstacles, end_node)
+
+    path = _astar(obstacles, start_node, end_node, bend_penalty=bend_penalty)
 
-    path = nx.astar_path(G, start_node, end_node)  # Find shortest path
+    if reuse_grid:
+        # later routes on the same grid avoid this one
+        for i, j in path:
+            obstacles[i, j] = 1
 
     # Convert path to waypoints
     waypoints = [(x[i] + resolution / 2, y[j] + resolution / 2) for i, j in path]
@@ -192,23 +192,46 @@ class LogicalLayer(AbstractLayer):
         """
         return hash(self.layer)
 
-    def get_shapes(self, component: "Component") -> kf.kdb.Region:
+    def get_shapes(
+        self,
+        component: "Component",
+        cache: dict[tuple[Any, ...], kf.kdb.Region] | None = None,
+    ) -> kf.kdb.Region:
         """Return the shapes of the component argument corresponding to this layer.
 
         Arguments:
             component: Component from which to extract shapes on this layer.
+            cache: optional dict to share regions between calls on the same component.
+                Each GDS layer is flattened once and each layer expression evaluated once.
 
         Returns:
             kf.kdb.Region: A region of polygons on this layer.
         """
+        region = self._get_shapes(component, cache)
+        # the cached region is shared, so callers get a copy they can modify
+        return region if cache is None else region.dup()
+
+    def _get_shapes(
+        self,
+        component: "Component",
+        cache: dict[tuple[Any, ...], kf.kdb.Region] | None,
+    ) -> kf.kdb.Region:
+        """Returns the shapes of this layer, shared with cache."""
         from gdsfactory.pdk import get_layer
 
-        polygons_per_layer = component.get_polygons()
+        key = _get_shapes_key(self)
+        if cache is not None and key in cache:
+            return cache[key]
+
         layer_index = get_layer(self.layer)
-        polygons = (
-            polygons_per_layer[layer_index] if layer_index in polygons_per_layer else []
-        )
-        region = kf.kdb.Region(polygons)
+        layer_key = (layer_index,)
+        if cache is not None and layer_key in cache:
+            region = cache[layer_key]
+        else:
+            region = kf.kdb.Region(component.begin_shapes_rec(layer_index))
+            if cache is not None:
+                cache[layer_key] = region
+
         if not (
             all(v == 0 for v in self.sizings_xoffsets)
             and all(v == 0 for v in self.sizings_yoffsets)
@@ -217,6 +240,8 @@ class LogicalLayer(AbstractLayer):
                 self.sizings_xoffsets, self.sizings_yoffsets, self.sizings_modes
             ):
                 region = region.sized(xoffset, yoffset, mode)
+        if cache is not None:
+            cache[key] = region
         return region
 
     def __repr__(self) -> str:
@@ -275,19 +300,39 @@ class DerivedLayer(AbstractLayer):
         else:
             return self.operation
 
-    def get_shapes(self, component: "Component") -> kf.kdb.Region:
+    def get_shapes(
+        self,
+        component: "Component",
+        cache: dict[tuple[Any, ...], kf.kdb.Region] | None = None,
+    ) -> kf.kdb.Region:
         """Return the shapes of the component argument corresponding to this layer.
 
         Arguments:
             component: Component from which to extract shapes on this layer.
+            cache: optional dict to share regions between calls on the same component.
+                Each GDS layer is flattened once and each layer expression evaluated once.
 
         Returns:
             kf.kdb.Region: A region of polygons on this layer.
         """
+        region = self._get_shapes(component, cache)
+        # the cached region is shared, so callers get a copy they can modify
+        return region if cache is None else region.dup()
+
+    def _get_shapes(
+        self,
+        component: "Component",
+        cache: dict[tuple[Any, ...], kf.kdb.Region] | None,
+    ) -> kf.kdb.Region:
+        """Returns the shapes of this layer, shared with cache."""
         from gdsfactory.component import boolean_operations
 
-        r1 = self.layer1.get_shapes(component)
-        r2 = self.layer2.get_shapes(component)
+        key = _get_shapes_key(self)
+        if cache is not None and key in cache:
+            return cache[key]
+
+        r1 = self.layer1._get_shapes(component, cache)
+        r2 = self.layer2._get_shapes(component, cache)
         region = boolean_operations[self.operation](r1, r2)
         if not (
             all(v == 0 for v in self.sizings_xoffsets)
@@ -297,6 +342,8 @@ class DerivedLayer(AbstractLayer):
                 self.sizings_xoffsets, self.sizings_yoffsets, self.sizings_modes
             ):
                 region = region.sized(xoffset, yoffset, mode)
+        if cache is not None:
+            cache[key] = region
         return region
 
     def __repr__(self) -> str:
@@ -306,6 +353,32 @@ class DerivedLayer(AbstractLayer):
     __str__ = __repr__
 
 
+def _get_shapes_key(layer: LogicalLayer | DerivedLayer) -> tuple[Any, ...]:
+    """Returns a key identifying the shapes of a layer expression, including sizings.
+
+    Unlike hash(layer), operands and sizings of the whole expression are part of the key.
+
+    Args:
+        layer: LogicalLayer or DerivedLayer.
+    """
+    from gdsfactory.pdk import get_layer
+
+    sizings = (
+        tuple(layer.sizings_xoffsets),
+        tuple(layer.sizings_yoffsets),
+        tuple(layer.sizings_modes),
+    )
+    if isinstance(layer, LogicalLayer):
+        return (get_layer(layer.layer), *sizings)
+    operation = layer.symbol_to_keyword.get(layer.operation, layer.operation)
+    return (
+        operation,
+        _get_shapes_key(layer.layer1),
+        _get_shapes_key(layer.layer2),
+        *sizings,
+    )
+
+
 BroadLayer: TypeAlias = (
     LogicalLayer | DerivedLayer | int | str | tuple[int, int] | LayerEnum
 )
@@ -389,12 +462,16 @@ class LayerStack(BaseModel):
 
     Parameters:
         layers: dict of layer_levels.
+        tile_size: if set, derived layers are evaluated in tiles of this size (um) in parallel.
+        threads: number of threads for tiled evaluation. Defaults to the number of cores.
     """
 
     layers: dict[str, LayerLevel] = Field(
         default_factory=dict,
         description="dict of layer_levels",
     )
+    tile_size: float | None = None
+    threads: int | None = None
 
     def model_copy(
         self, *, update: Mapping[str, Any] | None = None, deep: bool = False
@@ -631,7 +708,9 @@ class LayerStack(BaseModel):
     def filtered(self, layers: list[str]) -> LayerStack:
         """Returns filtered layerstack, given layer specs."""
         return LayerStack(
-            layers={k: self.layers[k] for k in layers if k in self.layers}
+            layers={k: self.layers[k] for k in layers if k in self.layers},
+            tile_size=self.tile_size,
+            threads=self.threads,
         )
 
     def z_offset(self, dz: float) -> LayerStack:
@@ -652,19 +731,29 @@ class LayerStack(BaseModel):
 
 
 def get_component_with_derived_layers(
-    component: "Component", layer_stack: LayerStack
+    component: "Component",
+    layer_stack: LayerStack,
+    cache: dict[tuple[Any, ...], kf.kdb.Region] | None = None,
 ) -> "Component":
     """Returns a component with derived layers.
 
+    Each GDS layer of component is flattened once and shared subexpressions
+    of the derived layers are evaluated once.
+
     Args:
         component: Component to get derived layers for.
         layer_stack: Layer stack to get derived layers from.
+        cache: optional dict of regions to share with other calls on the same component.
     """
     from gdsfactory.component import Component
     from gdsfactory.pdk import get_layer
 
+    if cache is None:
+        cache = {}
     component_derived = Component()
 
+    derived_layer_indexes: list[int] = []
+    layers: list[LogicalLayer | DerivedLayer] = []
     for level in layer_stack.layers.values():
         if level.derived_layer is None:
             if isinstance(level.layer, LogicalLayer):
@@ -675,14 +764,238 @@ def get_component_with_derived_layers(
                 )
         else:
             derived_layer_index = get_layer(level.derived_layer.layer)
-        if isinstance(level.layer, AbstractLayer):
-            shapes = level.layer.get_shapes(component=component)
-            component_derived.shapes(derived_layer_index).insert(shapes)
+        if isinstance(level.layer, LogicalLayer | DerivedLayer):
+            derived_layer_indexes.append(derived_layer_index)
+            layers.append(level.layer)
+
+    if layer_stack.tile_size:
+        shapes_per_layer = get_shapes_tiled(
+            component=component,
+            layers=layers,
+            tile_size=layer_stack.tile_size,
+            threads=layer_stack.threads,
+        )
+    else:
+        shapes_per_layer = [
+            layer.get_shapes(component=component, cache=cache) for layer in layers
+        ]
+
+    for derived_layer_index, shapes in zip(derived_layer_indexes, shapes_per_layer):
+        component_derived.shapes(derived_layer_index).insert(shapes)
 
     component_derived.add_ports(component.ports)
     return component_derived
 
 
+def _get_max_sizing(layer: LogicalLayer | DerivedLayer) -> int:
+    """Returns the largest accumulated sizing offset (dbu) of a layer expression."""
+    sizing = sum(
+        max(abs(xoffset), abs(yoffset))
+        for xoffset, yoffset in zip(layer.sizings_xoffsets, layer.sizings_yoffsets)
+    )
+    if isinstance(layer, DerivedLayer):
+        sizing += max(_get_max_sizing(layer.layer1), _get_max_sizing(layer.layer2))
+    return sizing
+
+
+def _get_tiled_expression(
+    layer: LogicalLayer | DerivedLayer,
+    inputs: dict[int, str],
+    variables: dict[tuple[Any, ...], str],
+    statements: list[str],
+) -> str:
+    """Adds the statements evaluating a layer expression to a tile script.
+
+    Returns the name of the script variable holding the result.
+    Shared subexpressions are assigned to a variable once.
+
+    Args:
+        layer: LogicalLayer or DerivedLayer.
+        inputs: GDS layer index to input name, filled in.
+        variables: layer key to variable name, filled in.
+        statements: script statements, filled in.
+    """
+    from gdsfactory.pdk import get_layer
+
+    key = _get_shapes_key(layer)
+    if key in variables:
+        return variables[key]
+
+    if isinstance(layer, LogicalLayer):
+        layer_index = get_layer(layer.layer)
+        expression = inputs.setdefault(layer_index, f"l{layer_index}")
+    else:
+        expression1 = _get_tiled_expression(layer.layer1, inputs, variables, statements)
+        expression2 = _get_tiled_expression(layer.layer2, inputs, variables, statements)
+        expression = f"({expression1} {layer.get_symbol()} {expression2})"
+
+    if not (
+        all(v == 0 for v in layer.sizings_xoffsets)
+        and all(v == 0 for v in layer.sizings_yoffsets)
+    ):
+        for xoffset, yoffset, mode in zip(
+            layer.sizings_xoffsets, layer.sizings_yoffsets, layer.sizings_modes
+        ):
+            expression = f"{expression}.sized({xoffset}, {yoffset}, {mode})"
+
+    variable = f"s{len(variables)}"
+    statements.append(f"var {variable} = {expression}")
+    variables[key] = variable
+    return variable
+
+
+def get_shapes_tiled(
+    component: "Component",
+    layers: Sequence[LogicalLayer | DerivedLayer],
+    tile_size: float,
+    threads: int | None = None,
+) -> list[kf.kdb.Region]:
+    """Returns the shapes of each layer expression, evaluated tile by tile.
+
+    Uses a KLayout TilingProcessor: the expressions are evaluated per tile on
+    several threads, with a tile border equal to the largest sizing offset,
+    and the per-tile results are merged back together.
+    Memory stays bounded by the tile size.
+
+    Args:
+        component: Component from which to extract shapes.
+        layers: LogicalLayer or DerivedLayer expressions to evaluate.
+        tile_size: tile width and height in um.
+        threads: number of threads. Defaults to the number of cores.
+    """
+    import os
+
+    dbu = component.kcl.dbu
+    inputs: dict[int, str] = {}
+    variables: dict[tuple[Any, ...], str] = {}
+    statements: list[str] = []
+    outputs = [
+        _get_tiled_expression(layer, inputs, variables, statements) for layer in layers
+    ]
+    border = (max((_get_max_sizing(layer) for layer in layers), default=0) + 1) * dbu
+
+    tp = kf.kdb.TilingProcessor()
+    tp.dbu = dbu
+    tp.tile_size(tile_size, tile_size)
+    tp.tile_border(border, border)
+    tp.threads = threads or os.cpu_count() or 1
+
+    for layer_index, name in inputs.items():
+        tp.input(name, component.begin_shapes_rec(layer_index))
+
+    regions = [kf.kdb.Region() for _ in layers]
+    for i, (region, variable) in enumerate(zip(regions, outputs)):
+        tp.output(f"o{i}", region)
+        statements.append(f"_output(o{i}, {variable})")
+
+    if layers:
+        tp.queue("; ".join(statements))
+        tp.execute("Derived layers")
+
+    for region in regions:
+        region.merge()
+    return regions
+
+
+def _get_logical_layers(layer: LogicalLayer | DerivedLayer) -> list[LogicalLayer]:
+    """Returns the GDS layers of a layer expression."""
+    if isinstance(layer, LogicalLayer):
+        return [layer]
+    return _get_logical_layers(layer.layer1) + _get_logical_layers(layer.layer2)
+
+
+def get_shapes_hierarchical(
+    component: "Component",
+    layers: Sequence[LogicalLayer | DerivedLayer],
+    dss: kf.kdb.DeepShapeStore,
+) -> list[kf.kdb.Region]:
+    """Returns the shapes of each layer expression as deep regions.
+
+    Booleans and sizings are evaluated per cell, so the regions keep the
+    hierarchy of the component. Use Region.insert_into to write them into a layout.
+
+    Args:
+        component: Component to get the shapes from.
+        layers: layer expressions to evaluate.
+        dss: shape store holding the regions. Must outlive them.
+    """
+    from gdsfactory.pdk import get_layer
+
+    cache: dict[tuple[Any, ...], kf.kdb.Region] = {}
+    for layer in layers:
+        for logical_layer in _get_logical_layers(layer):
+            layer_index = get_layer(logical_layer.layer)
+            if (layer_index,) not in cache:
+                cache[(layer_index,)] = kf.kdb.Region(
+                    component.begin_shapes_rec(layer_index), dss
+                )
+    return [layer.get_shapes(component, cache=cache) for layer in layers]
+
+
+def get_layout_with_derived_layers(
+    component: "Component", layer_stack: LayerStack
+) -> kf.kdb.Layout:
+    """Returns a new layout with derived layers, keeping the hierarchy of component.
+
+    Like get_component_with_derived_layers, each level is written to its derived layer,
+    but the layer expressions are evaluated with get_shapes_hierarchical instead of
+    on the flattened component. The top cell of the layout corresponds to component.
+
+    If layer_stack.tile_size is set, the expressions are evaluated with
+    get_shapes_tiled instead, and the derived layers are written flat into the
+    top cell. layer_stack.threads sets the threads of either evaluation.
+
+    Args:
+        component: Component to get derived layers for.
+        layer_stack: Layer stack to get derived layers from.
+    """
+    from gdsfactory.pdk import get_layer
+
+    targets: list[int] = []
+    layers: list[LogicalLayer | DerivedLayer] = []
+    for level in layer_stack.layers.values():
+        if level.derived_layer is None:
+            if not isinstance(level.layer, LogicalLayer):
+                raise ValueError(
+                    "If derived_layer is not provided, the LayerLevel layer must be a LogicalLayer"
+                )
+            derived_layer_index = get_layer(level.layer.layer)
+        else:
+            derived_layer_index = get_layer(level.derived_layer.layer)
+        if isinstance(level.layer, LogicalLayer | DerivedLayer):
+            targets.append(derived_layer_index)
+            layers.append(level.layer)
+
+    # the deep regions live in dss, so it must outlive them
+    dss = kf.kdb.DeepShapeStore()
+    if layer_stack.tile_size:
+        shapes_per_layer = get_shapes_tiled(
+            component=component,
+            layers=layers,
+            tile_size=layer_stack.tile_size,
+            threads=layer_stack.threads,
+        )
+    else:
+        if layer_stack.threads:
+            dss.threads = layer_stack.threads
+        shapes_per_layer = get_shapes_hierarchical(component, layers, dss)
+
+    regions: dict[int, kf.kdb.Region] = {}
+    for derived_layer_index, shapes in zip(targets, shapes_per_layer):
+        if derived_layer_index in regions:
+            shapes = regions[derived_layer_index] + shapes
+        regions[derived_layer_index] = shapes
+
+    layout = kf.kdb.Layout()
+    layout.dbu = component.kcl.dbu
+    top_cell = layout.create_cell(component.name)
+    for derived_layer_index, region in regions.items():
+        info = component.kcl.layout.get_info(derived_layer_index)
+        layer_index = layout.layer(info.layer, info.datatype)
+        region.insert_into(layout, top_cell.cell_index(), layer_index)
+    return layout
+
+
 if __name__ == "__main__":
     # For now, make regular layers trivial DerivedLayers
     # This might be automatable during LayerStack instantiation, or we could modify the Layer object in LayerMap too
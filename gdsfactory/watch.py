@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import ast
+import hashlib
 import logging
 import os
 import pathlib
@@ -29,6 +31,7 @@ from watchdog.observers import Observer
 
 from gdsfactory.component import Component
 from gdsfactory.config import cwd
+from gdsfactory.get_factories import get_cells_from_dict
 from gdsfactory.pdk import Pdk, get_active_pdk
 from gdsfactory.read.from_yaml_template import cell_from_yaml_template
 from gdsfactory.typings import ComponentFactory, ComponentSpec, PathType
@@ -39,6 +42,26 @@ _DeletedEvent: TypeAlias = DirDeletedEvent | FileDeletedEvent
 _ModifiedEvent: TypeAlias = DirModifiedEvent | FileModifiedEvent
 
 
+def get_source_hashes(source: str) -> dict[str, str]:
+    """Returns a hash of each top-level function in a Python source.
+
+    The hashes ignore comments, formatting and line numbers. The key "<module>"
+    hashes the remaining top-level statements (imports, constants, classes).
+
+    Args:
+        source: Python source code.
+    """
+    hashes: dict[str, str] = {}
+    module = []
+    for node in ast.parse(source).body:
+        if isinstance(node, ast.FunctionDef | ast.AsyncFunctionDef):
+            hashes[node.name] = hashlib.sha256(ast.dump(node).encode()).hexdigest()
+        else:
+            module.append(ast.dump(node))
+    hashes["<module>"] = hashlib.sha256("\n".join(module).encode()).hexdigest()
+    return hashes
+
+
 class FileWatcher(FileSystemEventHandler):
     """Captures *.py or *.pic.yml file change events."""
 
@@ -48,6 +71,7 @@ class FileWatcher(FileSystemEventHandler):
         run_main: bool = False,
         run_cells: bool = True,
         logger: logging.Logger | None = None,
+        debounce: float = 0.2,
     ) -> None:
         """Initialize the YAML event handler.
 
@@ -56,12 +80,14 @@ class FileWatcher(FileSystemEventHandler):
             run_main: if True, will execute the main function of the file.
             run_cells: if True, will execute the cells of the file.
             logger: the logger to use.
+            debounce: seconds without new events on a file before it is rebuilt.
         """
         super().__init__()
 
         self.logger = logger or logging.root
         self.run_cells = run_cells
         self.run_main = run_main
+        self.debounce = debounce
 
         pdk = get_active_pdk()
         pdk.register_cells_yaml(dirpath=path, update=True)
@@ -70,10 +96,29 @@ class FileWatcher(FileSystemEventHandler):
         self.path = path
         self.stopping = threading.Event()
 
+        # files waiting for the debounce time, with the time of their last event
+        self.pending: dict[str, float] = {}
+        self.pending_lock = threading.Lock()
+
+        # output cells by name: factory, source file, GDS path, the names of the
+        # cells in their hierarchy and their last build time in seconds
+        self.cell_factories: dict[str, ComponentFactory] = {}
+        self.cell_files: dict[str, str] = {}
+        self.cell_gdspaths: dict[str, pathlib.Path] = {}
+        self.cell_dependencies: dict[str, set[str]] = {}
+        self.build_times: dict[str, float] = {}
+        # source hash of each cell function by file
+        self.source_hashes: dict[str, dict[str, str]] = {}
+        # names of the cells made by the cell functions of each file
+        self.file_cells: dict[str, set[str]] = {}
+        self._gds_dirpath: pathlib.Path | None = None
+
     def start(self) -> None:
         self.observer.schedule(self, self.path, recursive=True)
         self.thread = threading.Thread(target=self.run, daemon=True)
         self.thread.start()
+        self.worker = threading.Thread(target=self.run_pending, daemon=True)
+        self.worker.start()
 
     def run(self) -> None:
         while not self.stopping.is_set():
@@ -86,6 +131,39 @@ class FileWatcher(FileSystemEventHandler):
     def stop(self) -> None:
         self.stopping.set()
         self.thread.join()
+        self.worker.join()
+
+    def schedule(self, src_path: str) -> None:
+        """Queues a file for rebuild once it has no new events for `debounce` seconds."""
+        with self.pending_lock:
+            self.pending[src_path] = time.monotonic()
+
+    def run_pending(self) -> None:
+        """Processes the queued files in the background until the watcher stops."""
+        while not self.stopping.wait(min(self.debounce, 0.05) or 0.05):
+            self.process_pending()
+
+    def process_pending(self, now: float | None = None) -> list[str]:
+        """Rebuilds the queued files with no new events for `debounce` seconds.
+
+        Args:
+            now: current time.monotonic(). Defaults to the current time.
+
+        Returns:
+            The rebuilt files.
+        """
+        now = time.monotonic() if now is None else now
+        with self.pending_lock:
+            ready = [
+                path
+                for path, last_event in self.pending.items()
+                if now - last_event >= self.debounce
+            ]
+            for path in ready:
+                del self.pending[path]
+        for path in ready:
+            self.get_component(path)
+        return ready
 
     def update_cell(self, src_path: PathType, update: bool = False) -> ComponentFactory:
         """Parses a YAML file to a cell function and registers into active pdk.
@@ -120,7 +198,7 @@ class FileWatcher(FileSystemEventHandler):
         if what == "file" and dest_path.endswith(".pic.yml"):
             self.logger.info("Moved %s: %s", what, dest_path)
             self.update_cell(dest_path)
-            self.get_component(dest_path)
+            self.schedule(dest_path)
 
     def on_created(self, event: _CreatedEvent) -> None:
         super().on_created(event)
@@ -131,7 +209,7 @@ class FileWatcher(FileSystemEventHandler):
             ".py"
         ):
             self.logger.info("Created %s: %s", what, src_path)
-            self.get_component(src_path)
+            self.schedule(src_path)
 
     def on_deleted(self, event: _DeletedEvent) -> None:
         super().on_deleted(event)
@@ -161,47 +239,68 @@ class FileWatcher(FileSystemEventHandler):
             src_path.endswith(".pic.yml") or src_path.endswith(".py")
         ):
             self.logger.info("Modified %s: %s", what, src_path)
-            self.get_component(src_path)
+            self.schedule(src_path)
         else:
             print(f"Ignored {what}: {src_path}")
 
+    def get_gds_dirpath(self) -> pathlib.Path:
+        """Returns build/gds in the git repository root or the current directory."""
+        if self._gds_dirpath is None:
+            import git
+            import git.repo as gr
+
+            try:
+                repo = gr.Repo(".", search_parent_directories=True)
+                dirpath = repo.working_tree_dir
+            except git.InvalidGitRepositoryError:
+                dirpath = cwd
+            if dirpath is None:
+                dirpath = cwd
+            self._gds_dirpath = pathlib.Path(dirpath) / "build/gds"
+        self._gds_dirpath.mkdir(parents=True, exist_ok=True)
+        return self._gds_dirpath
+
     def get_component(self, filepath: PathType) -> Component | None:
-        import git
-        import git.repo as gr
+        """Rebuilds the cells affected by a changed .py or .pic.yml file.
 
-        from gdsfactory.get_factories import get_cells_from_dict
+        Only the cell functions whose source changed are invalidated, together
+        with the output cells that contain them.
 
-        try:
-            repo = gr.Repo(".", search_parent_directories=True)
-            dirpath = repo.working_tree_dir
-        except git.InvalidGitRepositoryError:
-            dirpath = cwd
-        if dirpath is None:
-            dirpath = cwd
+        Args:
+            filepath: the changed file.
+        """
         try:
             filepath = pathlib.Path(filepath)
-            dirpath = pathlib.Path(dirpath) / "build/gds"
-            dirpath.mkdir(parents=True, exist_ok=True)
+            dirpath = self.get_gds_dirpath()
 
             if filepath.exists():
                 if str(filepath).endswith(".pic.yml"):
                     return self.get_component_yaml(filepath, dirpath)
                 elif str(filepath).endswith(".py"):
+                    source = filepath.read_text()
+                    changed = self.update_source_hashes(
+                        filepath, get_source_hashes(source)
+                    )
                     context = dict(locals(), **globals())
                     if self.run_main:
                         context.update(__name__="__main__")
 
                     # Read the content of the file and execute it within the updated context
-                    exec(filepath.read_text(), context, context)
+                    exec(source, context, context)
 
                     if self.run_cells:
                         cells = get_cells_from_dict(context)
-                        # Process each cell and write it to a GDS file
                         for name, cell in cells.items():
-                            c = cell()
-                            gdspath = dirpath / f"{name}.gds"
-                            c.write_gds(gdspath)
-                            kf.show(gdspath)
+                            self.cell_factories[name] = cell
+                            self.cell_files[name] = str(filepath)
+                            self.cell_gdspaths[name] = dirpath / f"{name}.gds"
+                        invalidated = self.invalidate(filepath, changed)
+                        dirty = {
+                            name
+                            for name in cells
+                            if name in changed or name not in self.cell_dependencies
+                        }
+                        self.rebuild(dirty | self.get_dependents(invalidated))
 
                 else:
                     print(f"Changed file {filepath} ignored (not .pic.yml or .py)")
@@ -213,15 +312,140 @@ class FileWatcher(FileSystemEventHandler):
 
     def get_component_yaml(self, filepath: PathType, dirpath: PathType) -> Component:
         """Parses a YAML file to a cell function and registers into active pdk."""
-        cell_func = self.update_cell(filepath, update=True)
         filepath_path = pathlib.Path(filepath)
-        c = cell_func()
-        gdspath = pathlib.Path(dirpath) / str(
-            filepath_path.relative_to(self.path)
-        ).replace(".pic.yml", ".gds")
-        c.write_gds(gdspath)
-        kf.show(gdspath)
-        return c
+        cell_name = filepath_path.stem.split(".")[0]
+        source_hash = hashlib.sha256(filepath_path.read_bytes()).hexdigest()
+        changed = self.update_source_hashes(filepath_path, {cell_name: source_hash})
+
+        if changed or cell_name not in self.cell_factories:
+            self.cell_factories[cell_name] = self.update_cell(filepath, update=True)
+            self.cell_files[cell_name] = str(filepath_path)
+            self.cell_gdspaths[cell_name] = pathlib.Path(dirpath) / str(
+                filepath_path.relative_to(self.path)
+            ).replace(".pic.yml", ".gds")
+        invalidated = self.invalidate(filepath_path, changed)
+        dirty = changed | self.get_dependents(invalidated)
+        if cell_name not in self.cell_dependencies:
+            dirty.add(cell_name)
+        components = self.rebuild(dirty)
+        return components.get(cell_name) or self.cell_factories[cell_name]()
+
+    def update_source_hashes(
+        self, filepath: pathlib.Path, hashes: dict[str, str]
+    ) -> set[str]:
+        """Stores the source hashes of a file and returns the changed function names.
+
+        A change in module-level code marks every function of the file as changed.
+        """
+        old_hashes = self.source_hashes.get(str(filepath), {})
+        self.source_hashes[str(filepath)] = hashes
+        changed = {name for name, h in hashes.items() if old_hashes.get(name) != h}
+        if not old_hashes:
+            return set()
+        if "<module>" in changed:
+            changed |= set(hashes)
+        changed.discard("<module>")
+        return changed
+
+    def get_dependents(self, cell_names: set[str]) -> set[str]:
+        """Returns the output cells whose hierarchy contains any of the cells."""
+        return {
+            name
+            for name, dependencies in self.cell_dependencies.items()
+            if dependencies & cell_names
+        }
+
+    def get_source_files(self, function_name: str, filepath: str | None) -> list[str]:
+        """Returns the watched files that define a cell function.
+
+        The file of the output cell being built takes precedence, so a function
+        defined there is not attributed to other files with the same function name.
+        """
+        if filepath is not None and function_name in self.source_hashes.get(
+            filepath, {}
+        ):
+            return [filepath]
+        return [
+            path
+            for path, hashes in self.source_hashes.items()
+            if function_name in hashes
+        ]
+
+    def invalidate(self, filepath: PathType, function_names: set[str]) -> set[str]:
+        """Deletes the cells made by cell functions of a file and the cells containing them.
+
+        Only cells made by the functions of that file are deleted, not cells of
+        functions with the same name from other modules. The layout cache returns
+        cells by name, so without this a changed function would return its
+        previous cell. Returns the names of the deleted cells.
+
+        Args:
+            filepath: file that defines the cell functions.
+            function_names: names of the changed cell functions.
+        """
+        file_cells = self.file_cells.get(str(filepath), set())
+        if not function_names or not file_cells:
+            return set()
+        kcl = kf.kcl
+        cell_indexes = {
+            ci
+            for ci, tkcell in kcl.tkcells.items()
+            if tkcell.function_name in function_names and kcl[ci].name in file_cells
+        }
+        cell_indexes |= {
+            caller for ci in cell_indexes for caller in kcl[ci].caller_cells()
+        }
+        cell_names = {kcl[ci].name for ci in cell_indexes}
+        if cell_indexes:
+            kcl.delete_cells(sorted(cell_indexes))
+            for names in self.file_cells.values():
+                names -= cell_names
+            self.logger.info(
+                "Invalidated %d cells of %s", len(cell_indexes), sorted(function_names)
+            )
+        return cell_names
+
+    def rebuild(self, names: set[str]) -> dict[str, Component]:
+        """Builds the output cells, writes their GDS and records their dependencies."""
+        components: dict[str, Component] = {}
+        t0 = time.perf_counter()
+        for name in sorted(names):
+            if name not in self.cell_factories:
+                continue
+            existing = set(kf.kcl.tkcells)
+            try:
+                t1 = time.perf_counter()
+                c = self.cell_factories[name]()
+                self.build_times[name] = time.perf_counter() - t1
+            except Exception as e:
+                traceback.print_exc(file=sys.stdout)
+                print(e)
+                continue
+            kcl = c.kcl
+            cell_indexes = [*c.called_cells(), c.cell_index()]
+            self.cell_dependencies[name] = {kcl[ci].name for ci in cell_indexes}
+            filepath = self.cell_files.get(name)
+            for ci in cell_indexes:
+                function_name = kcl[ci].function_name
+                if ci in existing or function_name is None:
+                    continue
+                for path in self.get_source_files(function_name, filepath):
+                    self.file_cells.setdefault(path, set()).add(kcl[ci].name)
+
+            gdspath = self.cell_gdspaths[name]
+            gdspath.parent.mkdir(parents=True, exist_ok=True)
+            c.write_gds(gdspath)
+            kf.show(gdspath)
+            components[name] = c
+            self.logger.info("Built %s in %.3fs", name, self.build_times[name])
+        if components:
+            self.logger.info(
+                "Rebuilt %d of %d cells in %.3fs",
+                len(components),
+                len(self.cell_factories),
+                time.perf_counter() - t0,
+            )
+        return components
 
 
 def watch(
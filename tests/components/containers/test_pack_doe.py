@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+from collections.abc import Callable
+
+import klayout.db as kdb
 import pytest
 
 import gdsfactory as gf
@@ -34,6 +37,26 @@ def test_generate_doe_with_function() -> None:
     assert len(settings_list) == 4
 
 
+def test_generate_doe_parallel() -> None:
+    doe = "mmi1x2"
+    settings = dict(length_mmi=(3.5, 4.5, 5.5), width_mmi=(4.25, 4.25, 4.25))
+    component_list, settings_list = generate_doe(
+        doe=doe, settings=settings, n_workers=2, function="extend_ports"
+    )
+    assert len(component_list) == 3
+
+    for component, variant_settings in zip(component_list, settings_list):
+        mmi = gf.get_component(doe, **variant_settings)
+        expected = gf.get_cell("extend_ports")(mmi)
+        assert component.name == expected.name
+        assert component.cell_index() == expected.cell_index()
+        assert component.settings == expected.settings
+        assert [p.name for p in component.ports] == [p.name for p in expected.ports]
+
+    names = [c.name for c in gf.kcl.each_cell()]
+    assert len(names) == len(set(names))
+
+
 def test_pack_doe_grid_with_function() -> None:
     doe = "mmi1x2"
     settings = dict(length_mmi=(2.5, 100), width_mmi=(4, 10))
@@ -53,6 +76,19 @@ def test_pack_doe() -> None:
     assert len(component.info["doe_settings"]) == 2
 
 
+@pytest.mark.parametrize("pack", [pack_doe, pack_doe_grid])
+def test_pack_doe_parallel(pack: Callable[..., gf.Component]) -> None:
+    settings = dict(length_mmi=(2, 100), width_mmi=(4, 10))
+    serial = pack(doe="mmi1x2", settings=settings, n_workers=1)
+    parallel = pack(doe="mmi1x2", settings=settings, n_workers=2)
+    assert parallel.info["doe_names"] == serial.info["doe_names"]
+    assert parallel.info["doe_settings"] == serial.info["doe_settings"]
+    for layer_index in serial.kcl.layer_indexes():
+        region_serial = kdb.Region(serial.begin_shapes_rec(layer_index))
+        region_parallel = kdb.Region(parallel.begin_shapes_rec(layer_index))
+        assert (region_serial ^ region_parallel).is_empty()
+
+
 def test_pack_doe_grid() -> None:
     doe = "mmi1x2"
     settings = dict(length_mmi=(2.5, 100), width_mmi=(4, 10))
@@ -60,6 +60,34 @@ def test_missing_zmin_or_thickness() -> None:
         to_3d(c, layer_stack=layer_stack)
 
 
+def test_merged_mesh_per_level() -> None:
+    c = gf.Component()
+    c.add_ref(
+        gf.components.rectangle(size=(4, 2), layer=(1, 0)),
+        columns=3,
+        rows=2,
+        column_pitch=10,
+        row_pitch=10,
+    )
+    c << gf.components.ring(radius=5, width=1, layer=(1, 0))
+    scene = to_3d(c, layer_stack=get_layer_stack())
+    assert list(scene.geometry) == ["substrate"]
+    mesh = scene.geometry["substrate"]
+    assert mesh.is_watertight
+    assert mesh.volume == pytest.approx(c.area(layer=(1, 0)), rel=1e-6)
+
+
+def test_instance_cells() -> None:
+    c = gf.Component()
+    c.add_ref(gf.components.pad(), columns=3, rows=2, column_pitch=150, row_pitch=150)
+    ref = c << gf.components.straight()
+    ref.rotate(90)
+    scene = to_3d(c, instance_cells=True)
+    assert len(scene.geometry) == 2
+    assert len(scene.graph.nodes_geometry) == 7
+    assert scene.bounds == pytest.approx(to_3d(c).bounds)
+
+
 if __name__ == "__main__":
     # test_valid_component()
     # test_no_polygons_defined()
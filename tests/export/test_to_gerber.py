@@ -0,0 +1,64 @@
+import pathlib
+
+import pytest
+
+import gdsfactory as gf
+from gdsfactory.export.to_gerber import GerberLayer, GerberOptions, to_gerber
+
+LAYERMAP = {
+    (1, 0): GerberLayer(
+        name="F Cu", function=["Copper", "L1", "Top"], polarity="Positive"
+    ),
+    (2, 0): GerberLayer(
+        name="B_Cu", function=["Copper", "L2", "Bot"], polarity="Positive"
+    ),
+}
+
+
+def get_pads() -> gf.Component:
+    c = gf.Component()
+    pad = gf.components.pad(size=(50, 50), layer=(1, 0))
+    c.add_ref(pad, columns=3, rows=4, column_pitch=100, row_pitch=100)
+    c.add_ref(gf.components.text("A", size=100, layer=(1, 0))).dmovey(-500)
+    return c
+
+
+def test_to_gerber(tmp_path: pathlib.Path) -> None:
+    c = get_pads()
+    to_gerber(c, tmp_path, LAYERMAP)
+    lines = (tmp_path / "F_Cu.gbr").read_text().splitlines()
+    assert lines[0] == "%TF.FileFunction,Copper,L1,Top*%"
+    assert lines[-1] == "M02*"
+    assert sum(line.startswith("%AM") for line in lines) == 1
+    assert sum(line.endswith("D03*") for line in lines) == 12
+    assert lines.count("G36*") == 1
+
+    region = lines[lines.index("G36*") + 1 : lines.index("G37*")]
+    assert region[0].replace("D02", "D01") == region[-1]
+
+    empty = (tmp_path / "B_Cu.gbr").read_text().splitlines()
+    assert "G36*" not in empty and empty[-1] == "M02*"
+
+
+def test_to_gerber_regions(tmp_path: pathlib.Path) -> None:
+    c = get_pads()
+    to_gerber(c, tmp_path, LAYERMAP, options=GerberOptions(flash_min_count=None))
+    lines = (tmp_path / "F_Cu.gbr").read_text().splitlines()
+    assert lines.count("G36*") == 13
+    assert not any(line.endswith("D03*") for line in lines)
+
+    with pytest.raises(ValueError):
+        to_gerber(c, tmp_path, LAYERMAP, options=GerberOptions(resolution=1e-2))
+
+
+def test_to_gerber_large_polygons(tmp_path: pathlib.Path) -> None:
+    """Repeated polygons above the outline macro vertex limit are not flashed."""
+    c = gf.Component()
+    circle = gf.components.circle(radius=100, angle_resolution=0.05, layer=(1, 0))
+    c.add_ref(circle, columns=2, column_pitch=300)
+    to_gerber(c, tmp_path, LAYERMAP)
+    lines = (tmp_path / "F_Cu.gbr").read_text().splitlines()
+    assert not any(line.startswith("%AM") for line in lines)
+    assert lines.count("G36*") == 2
+    region = lines[lines.index("G36*") + 1 : lines.index("G37*")]
+    assert len(region) > 5000
@@ -1,3 +1,5 @@
+import pathlib
+
 import numpy as np
 import pytest
 
@@ -43,6 +45,33 @@ def test_to_np_with_bend_circular() -> None:
     assert img is not None
 
 
+def test_to_np_area() -> None:
+    c = straight(length=10, width=0.5)
+    img = to_np(c, nm_per_pixel=20, pad_width=0)
+    assert img.shape == (500, 25)
+    assert img.sum() == 500 * 25
+
+
+def test_to_np_tiles(tmp_path: pathlib.Path) -> None:
+    c = bend_circular()
+    img = to_np(c, nm_per_pixel=20)
+    assert np.array_equal(to_np(c, nm_per_pixel=20, tile_size=37), img)
+
+    img_memmap = to_np(
+        c, nm_per_pixel=20, dtype=np.uint8, filepath=tmp_path / "bend.npy"
+    )
+    assert isinstance(img_memmap, np.memmap)
+    assert np.array_equal(img_memmap, img.astype(np.uint8))
+
+
+def test_to_np_supersample() -> None:
+    c = bend_circular()
+    img = to_np(c, nm_per_pixel=20, supersample=4, dtype=np.float32, pad_width=0)
+    assert img.dtype == np.float32
+    assert np.any((img > 0) & (img < 1))
+    assert np.isclose(img.sum() * 0.02**2, c.area((1, 0)), rtol=1e-3)
+
+
 if __name__ == "__main__":
     pytest.main(
         [
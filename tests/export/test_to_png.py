@@ -0,0 +1,26 @@
+import pathlib
+import struct
+
+from gdsfactory.components import mzi, straight
+from gdsfactory.export.to_png import plot_many, to_png
+
+
+def test_to_png() -> None:
+    png = to_png(straight(), width=200, height=100)
+    assert png.startswith(b"\x89PNG")
+    width, height = struct.unpack(">II", png[16:24])
+    assert (width, height) == (200, 100)
+
+    # renders do not keep the cells of previous renders
+    assert to_png(mzi(), width=200, height=100) != png
+    assert to_png(straight(), width=200, height=100) == png
+
+
+def test_plot_many(tmp_path: pathlib.Path) -> None:
+    components = [straight(), mzi()]
+    images = plot_many(components, dirpath=tmp_path, width=200, height=100)
+    assert images == [
+        to_png(c, width=200, height=100, show_ruler=False) for c in components
+    ]
+    for component, image in zip(components, images):
+        assert (tmp_path / f"{component.name}.png").read_bytes() == image
@@ -1,11 +1,91 @@
+import math
 import re
+import xml.etree.ElementTree as ET
 from pathlib import Path
 
+import klayout.db as kdb
+
 import gdsfactory as gf
 from gdsfactory.config import GDSDIR_TEMP
 from gdsfactory.export.to_svg import to_svg
 from gdsfactory.typings import Layer
 
+_SVG = "{http://www.w3.org/2000/svg}"
+_XLINK_HREF = "{http://www.w3.org/1999/xlink}href"
+
+
+def _path_to_region(d: str) -> kdb.Region:
+    """Returns the region of SVG path data written by to_svg, in dbu."""
+    region = kdb.Region()
+    tokens = re.findall(r"[Mhvlz]|-?\d+", d)
+    points: list[kdb.Point] = []
+    x = y = 0
+    i = 0
+    while i < len(tokens):
+        command = tokens[i]
+        if command == "M":
+            x, y = int(tokens[i + 1]), int(tokens[i + 2])
+            points = [kdb.Point(x, y)]
+            i += 3
+        elif command == "h":
+            x += int(tokens[i + 1])
+            points.append(kdb.Point(x, y))
+            i += 2
+        elif command == "v":
+            y += int(tokens[i + 1])
+            points.append(kdb.Point(x, y))
+            i += 2
+        elif command == "l":
+            x += int(tokens[i + 1])
+            y += int(tokens[i + 2])
+            points.append(kdb.Point(x, y))
+            i += 3
+        else:
+            # holes are separate rings inside their hull
+            region ^= kdb.Region(kdb.Polygon(points))
+            i += 1
+    return region
+
+
+def _get_trans(use: ET.Element) -> kdb.ICplxTrans:
+    """Returns the transformation of a <use> element written by to_svg."""
+    if "transform" not in use.attrib:
+        return kdb.ICplxTrans(int(use.get("x", 0)), int(use.get("y", 0)))
+    a, b, c, d, e, f = map(float, use.attrib["transform"][7:-1].split())
+    return kdb.ICplxTrans(
+        math.hypot(a, b),
+        math.degrees(math.atan2(b, a)),
+        a * d - b * c < 0,
+        kdb.Vector(round(e), round(f)),
+    )
+
+
+def _svg_to_regions(svg: str) -> dict[str, kdb.Region]:
+    """Returns the region of each layer group of an SVG written by to_svg, in dbu."""
+    root = ET.fromstring(svg)
+    defs = {
+        element.attrib["id"]: element
+        for element in root.iter()
+        if "id" in element.attrib
+    }
+
+    def get_region(element: ET.Element) -> kdb.Region:
+        if element.tag == f"{_SVG}path":
+            return _path_to_region(element.attrib["d"])
+        if element.tag == f"{_SVG}use":
+            cell = defs[element.attrib[_XLINK_HREF][1:]]
+            return get_region(cell).transformed(_get_trans(element))
+        region = kdb.Region()
+        for child in element:
+            region += get_region(child)
+        return region.merged()
+
+    return {
+        element.attrib["id"]: get_region(element)
+        for element in root.iter(f"{_SVG}g")
+        if element.attrib.get("id", "").startswith("layer")
+    }
+
 
 def test_to_svg() -> None:
     """Test the to_svg function to ensure it correctly generates an SVG file from a Component."""
@@ -58,3 +138,31 @@ def test_to_svg() -> None:
     # Extract the path data
     path_match = re.search(r'd="([^"]+)"', svg_content)
     assert path_match is not None, "SVG <path> element does not contain 'd' attribute."
+
+
+def test_to_svg_hierarchical(tmp_path: Path) -> None:
+    pad = gf.c.pad(size=(50, 50), layer="M3")
+    c = gf.Component()
+    c.add_ref(pad, columns=10, rows=10, column_pitch=100, row_pitch=100)
+    c.add_ref(pad).drotate(45).dmovex(-200)
+    ring = gf.c.ring(radius=20, width=2, layer="M3")
+    c.add_ref(ring).dmovey(-200)
+    c.add_ref(ring).dmirror_y().drotate(30).dmove((-200, -200))
+
+    svg_hierarchical = tmp_path / "hierarchical.svg"
+    svg_flat = tmp_path / "flat.svg"
+    to_svg(c, filename=str(svg_hierarchical))
+    to_svg(c, filename=str(svg_flat), hierarchical=False)
+
+    svg_content = svg_hierarchical.read_text()
+    assert svg_content.count("<defs>") == 1
+    assert svg_content.count("<use") == 104
+    assert svg_content.count("matrix(0.707106781187 0.707106781187") == 1
+    assert svg_flat.read_text().count("<use") == 0
+
+    regions_hierarchical = _svg_to_regions(svg_content)
+    regions_flat = _svg_to_regions(svg_flat.read_text())
+    assert regions_hierarchical.keys() == regions_flat.keys()
+    for layer_id, region in regions_hierarchical.items():
+        assert not region.is_empty()
+        assert (region ^ regions_flat[layer_id]).is_empty(), layer_id
@@ -1,11 +1,21 @@
 from __future__ import annotations
 
+import os
+import pathlib
+from typing import Any
+
 import numpy as np
 import pytest
+import yaml
 from pytest_regressions.data_regression import DataRegressionFixture
 
 from gdsfactory.difftest import difftest
-from gdsfactory.read.from_yaml import from_yaml, sample_mmis
+from gdsfactory.read.from_yaml import (
+    _get_netlist,
+    from_yaml,
+    netlist_cache,
+    sample_mmis,
+)
 
 sample_connections = """
 name: sample_connections
@@ -377,6 +387,60 @@ def test_docstring_sample() -> None:
     c.delete()
 
 
+def test_netlist_cache(tmp_path: pathlib.Path) -> None:
+    netlist_cache.clear()
+    assert _get_netlist(sample_mmis) == _get_netlist(sample_mmis)
+    assert len(netlist_cache) == 1
+
+    filepath = tmp_path / "sample.pic.yml"
+    filepath.write_text(sample_mmis)
+    net = _get_netlist(filepath)
+    assert _get_netlist(str(filepath)) == net
+    assert len(netlist_cache) == 2
+
+    filepath.write_text(sample_connections)
+    os.utime(filepath, ns=(0, 0))
+    assert _get_netlist(filepath).name == "sample_connections"
+
+    dct = yaml.safe_load(sample_connections)
+    from_yaml(dct)
+    assert dct == yaml.safe_load(sample_connections)
+
+
+def test_netlist_cache_returns_copies() -> None:
+    netlist_cache.clear()
+    net = _get_netlist(sample_mmis)
+    settings = dict(net.instances["mmi_long"].settings)
+    net.instances["mmi_long"].settings["length_mmi"] = 1
+    del net.instances["mmi_short"]
+
+    net = _get_netlist(sample_mmis)
+    assert net.instances["mmi_long"].settings == settings
+    assert "mmi_short" in net.instances
+
+
+def test_from_yaml_shared_components(monkeypatch: pytest.MonkeyPatch) -> None:
+    from gdsfactory.pdk import Pdk
+
+    calls: list[str] = []
+    get_component = Pdk.get_component
+
+    def counting_get_component(self: Pdk, *args: Any, **kwargs: Any) -> Any:
+        calls.append(kwargs.get("component", args[0] if args else None))
+        return get_component(self, *args, **kwargs)
+
+    instances = {f"wg{i}": {"component": "straight"} for i in range(20)}
+    dct = {
+        "instances": instances,
+        "connections": {f"wg{i},o1": f"wg{i - 1},o2" for i in range(1, 20)},
+    }
+    net = _get_netlist(yaml.safe_dump(dct))
+    monkeypatch.setattr(Pdk, "get_component", counting_get_component)
+    c = from_yaml(net)
+    assert calls == ["straight"]
+    assert c.insts["wg19"].ports["o2"].x == 20 * c.insts["wg0"].ports["o2"].x
+
+
 yaml_fail = """
 name: yaml_fail
 instances:
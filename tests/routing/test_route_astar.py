@@ -0,0 +1,215 @@
+import importlib
+from itertools import pairwise
+from typing import Any
+
+import klayout.db as kdb
+import numpy as np
+import pytest
+
+import gdsfactory as gf
+from gdsfactory.routing.route_astar import (
+    _astar,
+    _find_nearest_free_node,
+    get_astar_grid,
+    route_astar,
+)
+from gdsfactory.typings import Port
+
+
+def _get_obstacle_course() -> tuple[gf.Component, Port, Port, kdb.Region]:
+    """Returns a component with two metal wires, their ports and the obstacles."""
+    c = gf.Component()
+    cross_section = gf.get_cross_section("metal_routing")
+    w = gf.components.straight(cross_section=cross_section)
+    left = c << w
+    right = c << w
+    right.rotate(90)
+    right.move((168, 63))
+
+    obstacle = gf.components.rectangle(size=(250, 3), layer="M3")
+    obstacle1 = c << obstacle
+    obstacle2 = c << obstacle
+    obstacle3 = c << obstacle
+    obstacle4 = c << obstacle
+    obstacle4.rotate(90)
+    obstacle1.ymin = 50
+    obstacle1.xmin = -10
+    obstacle2.xmin = 35
+    obstacle3.ymin = 42
+    obstacle3.xmin = 72.23
+    obstacle4.xmin = 200
+    obstacle4.ymin = 55
+    obstacles = kdb.Region(
+        [ref.ibbox() for ref in (obstacle1, obstacle2, obstacle3, obstacle4)]
+    )
+    return c, left.ports["e1"], right.ports["e2"], obstacles
+
+
+@gf.cell
+def sample_route_astar_electrical(
+    reuse_grid: bool = False, exact: bool = False
+) -> gf.Component:
+    """Routes two metal wires around rectangular obstacles."""
+    c, port1, port2, _ = _get_obstacle_course()
+    grid = (
+        get_astar_grid(c, resolution=10, avoid_layers=("M3",), distance=12, exact=exact)
+        if reuse_grid
+        else None
+    )
+    route_astar(
+        component=c,
+        port1=port1,
+        port2=port2,
+        cross_section="metal_routing",
+        resolution=10,
+        distance=12,
+        avoid_layers=("M3",),
+        bend=gf.components.wire_corner,
+        exact=exact,
+        grid=grid,
+    )
+    return c
+
+
+def _count_bends(path: list[tuple[int, int]]) -> int:
+    steps = [(i2 - i1, j2 - j1) for (i1, j1), (i2, j2) in pairwise(path)]
+    return sum(step1 != step2 for step1, step2 in pairwise(steps))
+
+
+def test_route_astar() -> None:
+    sample_route_astar_electrical()
+
+
+def test_route_astar_reuse_grid() -> None:
+    c1 = sample_route_astar_electrical()
+    c2 = sample_route_astar_electrical(reuse_grid=True)
+    assert len(c1.insts) == len(c2.insts)
+
+
+def test_route_astar_exact() -> None:
+    sample_route_astar_electrical(exact=True)
+
+
+@pytest.mark.parametrize("reuse_grid", [False, True])
+def test_route_astar_avoids_obstacles(reuse_grid: bool) -> None:
+    c, port1, port2, obstacles = _get_obstacle_course()
+    grid = get_astar_grid(c, resolution=10, avoid_layers=("M3",), distance=12)
+    route = route_astar(
+        component=c,
+        port1=port1,
+        port2=port2,
+        cross_section="metal_routing",
+        resolution=10,
+        distance=12,
+        avoid_layers=("M3",),
+        bend=gf.components.wire_corner,
+        grid=grid if reuse_grid else None,
+    )
+    edges = kdb.Edges([kdb.Edge(p1, p2) for p1, p2 in pairwise(route.backbone)])
+    assert obstacles.interacting(edges).is_empty()
+
+
+def test_route_astar_grid_marks_route() -> None:
+    c, port1, port2, _ = _get_obstacle_course()
+    grid = get_astar_grid(c, resolution=10, avoid_layers=("M3",), distance=12)
+    n_obstacles = grid[0].sum()
+    route_astar(
+        component=c,
+        port1=port1,
+        port2=port2,
+        cross_section="metal_routing",
+        resolution=10,
+        bend=gf.components.wire_corner,
+        grid=grid,
+    )
+    assert grid[0].sum() > n_obstacles
+
+
+def test_route_astar_grid_resolution_mismatch() -> None:
+    c, port1, port2, _ = _get_obstacle_course()
+    grid = get_astar_grid(c, resolution=10, avoid_layers=("M3",), distance=12)
+    with pytest.raises(ValueError, match="resolution"):
+        route_astar(
+            component=c,
+            port1=port1,
+            port2=port2,
+            cross_section="metal_routing",
+            resolution=5,
+            grid=grid,
+        )
+
+
+def test_astar_bend_penalty() -> None:
+    """Bend penalty picks the path with fewer bends among equally short ones."""
+    grid = np.zeros((21, 21))
+    grid[5, 0:15] = 1
+    grid[10, 6:21] = 1
+    grid[15, 0:15] = 1
+    path = _astar(grid, (0, 0), (20, 0), bend_penalty=0)
+    path_penalty = _astar(grid, (0, 0), (20, 0), bend_penalty=1)
+    assert len(path_penalty) == len(path)
+    assert _count_bends(path_penalty) < _count_bends(path)
+    assert all(grid[i, j] == 0 for i, j in path_penalty)
+
+
+@pytest.mark.parametrize(
+    "node", [(3, 3), (10, 10), (-50, 4), (60, 60), (25, -7), (0, 39)]
+)
+def test_find_nearest_free_node(node: tuple[int, int]) -> None:
+    """The windowed search returns the same cell as a full grid search."""
+    grid = np.ones((30, 40))
+    grid[0, 0] = 0
+    grid[20:22, 5:9] = 0
+    free = np.argwhere(grid != 1)
+    nearest = free[np.square(free - np.array(node)).sum(axis=1).argmin()]
+    expected = int(nearest[0]), int(nearest[1])
+    assert _find_nearest_free_node(grid, node, window=4) == expected
+
+
+def test_get_astar_grid_exact() -> None:
+    """Exact rasterization keeps the hole of a ring free."""
+    c = gf.Component()
+    c << gf.components.ring(radius=20, width=2, layer="M3")
+    kwargs = dict(component=c, resolution=1, avoid_layers=("M3",), distance=1)
+    grid_bbox, x, y = get_astar_grid(**kwargs)  # type: ignore[arg-type]
+    grid_exact, x_exact, y_exact = get_astar_grid(exact=True, **kwargs)  # type: ignore[arg-type]
+    np.testing.assert_array_equal(x, x_exact)
+    np.testing.assert_array_equal(y, y_exact)
+
+    center = np.abs(x).argmin(), np.abs(y).argmin()
+    assert grid_bbox[center] == 1
+    assert grid_exact[center] == 0
+    assert grid_exact[np.abs(x - 20).argmin(), center[1]] == 1
+    assert grid_exact.sum() < grid_bbox.sum()
+    assert np.all(grid_bbox[grid_exact == 1] == 1)
+
+
+def test_get_astar_grid_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    # gdsfactory.routing.route_astar is shadowed by the function of the same name
+    route_astar_module = importlib.import_module("gdsfactory.routing.route_astar")
+    c, *_ = _get_obstacle_course()
+    calls: list[bool] = []
+    generate_grid = route_astar_module._generate_grid
+
+    def _generate_grid(*args: Any, **kwargs: Any) -> Any:
+        calls.append(True)
+        return generate_grid(*args, **kwargs)
+
+    monkeypatch.setattr(route_astar_module, "_generate_grid", _generate_grid)
+    cache: dict[tuple[Any, ...], Any] = {}
+    grid1, x1, y1 = get_astar_grid(c, resolution=10, avoid_layers=("M3",), cache=cache)
+    grid1[:] = 1
+    grid2, x2, y2 = get_astar_grid(c, resolution=10, avoid_layers=("M3",), cache=cache)
+    assert len(calls) == 1
+    assert len(cache) == 1
+    assert x2 is x1 and y2 is y1
+    assert not np.all(grid2 == 1), "cached grids are returned as copies"
+
+    get_astar_grid(c, resolution=10, avoid_layers=("M3",), exact=True, cache=cache)
+    assert len(calls) == 2
+    assert len(cache) == 2
+
+
+if __name__ == "__main__":
+    c = sample_route_astar_electrical()
+    c.show()
@@ -1,9 +1,15 @@
+from typing import Any
+
+import kfactory as kf
 import pytest
 
 import gdsfactory as gf
 from gdsfactory.generic_tech import LAYER, LAYER_STACK
-from gdsfactory.technology import LayerLevel
-from gdsfactory.technology.layer_stack import LogicalLayer
+from gdsfactory.technology import LayerLevel, LayerStack
+from gdsfactory.technology.layer_stack import (
+    LogicalLayer,
+    get_layout_with_derived_layers,
+)
 
 nm = 1e-3
 
@@ -47,3 +53,94 @@ def test_layer_level() -> None:
         layer_ = gf.get_layer(level_layer.layer)
         assert isinstance(layer_, int)
         assert int(layer_) == 1, int(layer_)
+
+
+def test_get_shapes_cache() -> None:
+    c = gf.components.straight()
+    wg = LogicalLayer(layer=LAYER.WG)
+    derived = wg.sized(100) - wg
+    cache: dict[tuple[Any, ...], kf.kdb.Region] = {}
+
+    region = derived.get_shapes(c, cache=cache)
+    assert (region ^ derived.get_shapes(c)).is_empty()
+    assert (region ^ derived.get_shapes(c, cache=cache)).is_empty()
+    assert (
+        wg.get_shapes(c, cache=cache).area()
+        < wg.sized(100).get_shapes(c, cache=cache).area()
+    )
+
+
+def test_get_shapes_cache_returns_copies() -> None:
+    c = gf.components.straight()
+    wg = LogicalLayer(layer=LAYER.WG)
+    derived = wg.sized(100) - wg
+    cache: dict[tuple[Any, ...], kf.kdb.Region] = {}
+
+    area = wg.get_shapes(c, cache=cache).area()
+    derived_area = derived.get_shapes(c, cache=cache).area()
+    for layer in (wg, derived):
+        region = layer.get_shapes(c, cache=cache)
+        region += kf.kdb.Region(kf.kdb.Box(0, 10_000, 1000, 11_000))
+        region.size(1000)
+    assert wg.get_shapes(c, cache=cache).area() == area
+    assert derived.get_shapes(c, cache=cache).area() == derived_area
+
+
+def test_get_component_with_derived_layers_tiled() -> None:
+    c = gf.components.mzi()
+    wg = LogicalLayer(layer=LAYER.WG)
+    layer_stack = LayerStack(
+        layers={
+            "clad": LayerLevel(
+                layer=wg.sized(300) - wg,
+                derived_layer=LogicalLayer(layer=LAYER.M1),
+                thickness=1,
+                zmin=0,
+            ),
+        }
+    )
+    c1 = layer_stack.get_component_with_derived_layers(c)
+    layer_stack.tile_size = 20
+    c2 = layer_stack.get_component_with_derived_layers(c)
+
+    layer_index = gf.get_layer(LAYER.M1)
+    r1 = kf.kdb.Region(c1.begin_shapes_rec(layer_index))
+    r2 = kf.kdb.Region(c2.begin_shapes_rec(layer_index))
+    assert not r1.is_empty()
+    # tile boundaries may only add slivers from snapping all-angle edges
+    assert (r1 ^ r2).sized(-1).is_empty()
+
+
+def test_get_layout_with_derived_layers_tiled() -> None:
+    c = gf.Component()
+    c.add_ref(gf.components.mzi(), columns=2, rows=1, column_pitch=200)
+    wg = LogicalLayer(layer=LAYER.WG)
+    layer_stack = LayerStack(
+        layers={
+            "clad": LayerLevel(
+                layer=wg.sized(300) - wg,
+                derived_layer=LogicalLayer(layer=LAYER.M1),
+                thickness=1,
+                zmin=0,
+            ),
+        }
+    )
+    layout1 = get_layout_with_derived_layers(c, layer_stack)
+    layer_stack.tile_size = 20
+    layout2 = get_layout_with_derived_layers(c, layer_stack)
+
+    layer_index1 = layout1.find_layer(*LAYER.M1)
+    layer_index2 = layout2.find_layer(*LAYER.M1)
+    top_cell1 = layout1.top_cell()
+    top_cell2 = layout2.top_cell()
+    # the hierarchical evaluation keeps the cells, the tiled one is flat
+    assert top_cell1.shapes(layer_index1).is_empty()
+    assert top_cell1.child_cells() > 0
+    assert not top_cell2.shapes(layer_index2).is_empty()
+    assert top_cell2.child_cells() == 0
+
+    r1 = kf.kdb.Region(top_cell1.begin_shapes_rec(layer_index1))
+    r2 = kf.kdb.Region(top_cell2.begin_shapes_rec(layer_index2))
+    assert not r1.is_empty()
+    # tile boundaries may only add slivers from snapping all-angle edges
+    assert (r1 ^ r2).sized(-1).is_empty()
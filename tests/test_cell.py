@@ -1,5 +1,16 @@
+import inspect
+import pathlib
+from typing import Any
+
+import pytest
+
 import gdsfactory as gf
 from gdsfactory import partial
+from gdsfactory.cell_cache import CachedCellFunction, _get_source_hash, cell_cache
+
+
+def _is_cached(func: Any) -> bool:
+    return isinstance(func, CachedCellFunction)
 
 
 @gf.cell
@@ -28,5 +39,88 @@ def test_partial() -> None:
     assert b1.base is b2.base
 
 
+n_builds = 0
+
+
+@gf.cell(persistent_cache=True)
+def cached_ring_array(n: int = 3, label: str = "x") -> gf.Component:
+    global n_builds
+    n_builds += 1
+    c = gf.Component()
+    for i in range(n):
+        ring = c << gf.components.ring_single(radius=5 + i)
+        ring.dmovex(30 * i)
+    c.add_ports(ring.ports)
+    c.info["label"] = label
+    return c
+
+
+def test_persistent_cache(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cell_cache, "dirpath", tmp_path)
+    cell_cache.clear()
+
+    c1 = cached_ring_array(n=4, label="ring")
+    ports1 = [(p.name, p.trans, p.width) for p in c1.ports]
+    area1 = c1.area(layer="WG")
+    name1 = c1.name
+    assert n_builds == 1
+    assert cell_cache.info().entries == 1
+
+    c1.delete()
+    c2 = cached_ring_array(n=4, label="ring")
+    assert n_builds == 1
+    assert cell_cache.info().hits == 1
+    assert c2.name == name1
+    assert c2.info["label"] == "ring"
+    assert c2.settings.model_dump() == {"n": 4, "label": "ring"}
+    assert [(p.name, p.trans, p.width) for p in c2.ports] == ports1
+    assert c2.area(layer="WG") == area1
+
+    cell_cache.clear(maxsize=0)
+    cached_ring_array(n=2)
+    assert n_builds == 2
+    assert cell_cache.info().entries == 0
+    cell_cache.clear(maxsize=gf.CONF.cell_cache_maxsize)
+
+
+def test_persistent_cache_skips_unlocked_children(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cell_cache, "dirpath", tmp_path)
+    child = gf.Component()
+    child.add_polygon([(0, 0), (1, 0), (1, 1)], layer=(1, 0))
+    c = gf.Component()
+    c << child
+    assert not cell_cache.save("unlocked_child", c)
+    assert cell_cache.info().entries == 0
+
+    c = gf.Component()
+    c << gf.components.straight()
+    assert cell_cache.save("locked_child", c)
+    assert cell_cache.info().entries == 1
+
+
+def test_persistent_cache_key_includes_called_cells(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    func = inspect.unwrap(cached_ring_array)
+    key = cell_cache.get_key(func, {"n": 4})
+    monkeypatch.setattr(gf.components, "ring_single", gf.components.ring_double)
+    _get_source_hash.cache_clear()
+    assert cell_cache.get_key(func, {"n": 4}) != key
+    monkeypatch.undo()
+    _get_source_hash.cache_clear()
+    assert cell_cache.get_key(func, {"n": 4}) == key
+
+
+def test_persistent_cache_disabled() -> None:
+    assert not isinstance(inspect.unwrap(inner, stop=_is_cached), CachedCellFunction)
+    assert isinstance(
+        inspect.unwrap(cached_ring_array, stop=_is_cached), CachedCellFunction
+    )
+
+
 if __name__ == "__main__":
     test_partial()
@@ -1,3 +1,6 @@
+import numpy as np
+import pytest
+
 import gdsfactory as gf
 from gdsfactory.generic_tech import LAYER
 
@@ -19,6 +22,85 @@ def test_get_polygons() -> None:
     assert key == "WG"
 
 
+def test_get_layer_indexes() -> None:
+    c = gf.Component()
+    c << gf.c.rectangle(size=(10, 10), layer=(1, 0))
+    assert gf.functions.get_layer_indexes(c) == [LAYER.WG]
+
+    c.add_polygon([(0, 0), (1, 0), (1, 1)], layer=(2, 0))
+    assert gf.functions.get_layers(c) == [(1, 0), (2, 0)]
+
+    p = c.get_polygons(layers=("WG", "SLAB150", "M1"), by="name")
+    assert list(p) == ["WG", "SLAB150", "M1"]
+    assert len(p["WG"]) == 1 and p["M1"] == []
+
+
+def test_get_layer_indexes_cache() -> None:
+    c = gf.Component()
+    c.add_polygon([(0, 0), (1, 0), (1, 1)], layer=(1, 0))
+    c.lock()
+    layer_indexes = gf.functions.get_layer_indexes(c)
+    assert layer_indexes == [LAYER.WG]
+
+    cache = gf.functions._layer_indexes_cache[c.kcl.layout]
+    assert cache[c.cell_index()] == (c.name, c.kdb_cell.bbox(), layer_indexes)
+    assert cache.maxsize == gf.functions._LAYER_INDEXES_CACHE_MAXSIZE
+
+
+def test_get_polygons_buffers() -> None:
+    c = gf.Component()
+    ring = gf.kdb.DPolygon(gf.kdb.DBox(0, 0, 10, 10))
+    ring.insert_hole(gf.kdb.DBox(2, 2, 4, 4))
+    c.add_polygon(ring, layer=(1, 0))
+    c.add_polygon([(20, 0), (30, 0), (25, 5)], layer=(1, 0))
+
+    buffer = gf.functions.get_polygons_buffers(c, by="tuple", holes=True)[(1, 0)]
+    assert len(buffer) == 2
+    assert buffer.offsets.tolist() == [0, 4, 8, 11]
+    assert buffer.polygon_offsets.tolist() == [0, 2, 3]
+    assert buffer.rings()[1].tolist() == [[2, 2], [4, 2], [4, 4], [2, 4]]
+
+    buffer = gf.functions.get_polygons_buffers(c, by="tuple", in_dbu=True)[(1, 0)]
+    assert buffer.points.dtype == "int64"
+    assert buffer.offsets.tolist() == [0, 10, 13]
+
+    points = c.get_polygons_points(by="tuple", scale=2)[(1, 0)]
+    assert points[1].tolist() == [[40, 0], [50, 10], [60, 0]]
+
+
+@pytest.mark.parametrize("holes", [False, True])
+def test_get_polygons_buffers_text_fallback(
+    monkeypatch: pytest.MonkeyPatch, holes: bool
+) -> None:
+    """Klayout versions without Polygon.to_bytes parse the polygon strings."""
+    c = gf.Component()
+    ring = gf.kdb.DPolygon(gf.kdb.DBox(0, 0, 10, 10))
+    ring.insert_hole(gf.kdb.DBox(2, 2, 4, 4))
+    c.add_polygon(ring, layer=(1, 0))
+    c << gf.components.grating_coupler_elliptical()
+
+    buffers = gf.functions.get_polygons_buffers(c, holes=holes, in_dbu=True)
+    monkeypatch.setattr(gf.functions, "_HAS_POLYGON_TO_BYTES", False)
+    buffers_text = gf.functions.get_polygons_buffers(c, holes=holes, in_dbu=True)
+
+    assert buffers.keys() == buffers_text.keys()
+    for layer, buffer in buffers.items():
+        np.testing.assert_array_equal(buffer.points, buffers_text[layer].points)
+        np.testing.assert_array_equal(buffer.offsets, buffers_text[layer].offsets)
+
+
+@pytest.mark.skipif(
+    not gf.functions._HAS_POLYGON_TO_BYTES, reason="requires Polygon.to_bytes"
+)
+def test_get_polygons_buffers_unknown_bytes_layout(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A Polygon.to_bytes layout other than the known one raises instead of misreading."""
+    monkeypatch.setattr(gf.functions, "_POLYGON_BYTES_VERSION", 2)
+    with pytest.raises(ValueError, match="Polygon.to_bytes"):
+        gf.functions.get_polygons_buffers(gf.components.straight())
+
+
 def test_trim() -> None:
     layer = (1, 0)
     c1 = gf.c.rectangle(size=(11, 11), centered=True, layer=layer).dup()
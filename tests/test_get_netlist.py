@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import numpy as np
 import pytest
 
 import gdsfactory as gf
+from gdsfactory.get_netlist import _get_port_table, _group_ports_by_xy
 
 
 def test_netlist_simple() -> None:
@@ -290,5 +292,71 @@ def test_get_netlist_transformed() -> None:
     assert extracted_port_pair == expected_port_pair
 
 
+def test_group_ports_by_xy() -> None:
+    xy = np.array([[0, 0], [5, 0], [0, 0], [5, 0], [7, 7]], dtype=np.int64)
+    assert _group_ports_by_xy(xy) == [[0, 2], [1, 3], [4]]
+    assert _group_ports_by_xy(np.empty((0, 2), dtype=np.int64)) == []
+
+
+def test_get_port_table() -> None:
+    c = gf.Component()
+    i1 = c.add_ref(gf.components.straight(length=10, width=0.5), "i1")
+    i2 = c.add_ref(gf.components.straight(length=10, width=0.5), "i2")
+    i2.rotate(35)
+    ports = {
+        f"{inst.name},{port.name}": port for inst in (i1, i2) for port in inst.ports
+    }
+    port_names = list(ports)
+    xy, angles, widths, is_complex = _get_port_table(port_names, ports)
+    assert xy[:2].tolist() == [[0, 0], [10_000, 0]]
+    assert angles[:2].tolist() == [2, 0]
+    assert widths.tolist() == [500] * 4
+    assert is_complex.tolist() == [False, False, True, True]
+
+
+def test_get_netlist_coincident_optical_and_electrical_ports() -> None:
+    """Ports of different types at the same xy are not connected."""
+    c = gf.Component()
+    i1 = c.add_ref(gf.components.straight(), "i1")
+    i2 = c.add_ref(gf.components.straight(), "i2")
+    i2.connect("o1", i1.ports["o2"])
+    w = c.add_ref(gf.components.wire_straight(), "w")
+    w.dmovex(i1.ports["o2"].dx - w.ports["e1"].dx)
+    assert w.ports["e1"].center == i1.ports["o2"].center
+
+    netlist = c.get_netlist()
+    assert list(netlist["nets"]) == [{"p1": "i1,o2", "p2": "i2,o1"}]
+    assert "multiple_connections" not in netlist.get("warnings", {}).get("optical", {})
+    unconnected = netlist["warnings"]["electrical"]["unconnected_ports"][0]["ports"]
+    assert "w,e1" in unconnected
+
+
+def test_get_netlist_width_mismatch_at_same_xy() -> None:
+    c = gf.Component()
+    i1 = c.add_ref(gf.components.straight(width=1), "i1")
+    i2 = c.add_ref(gf.components.straight(width=2), "i2")
+    i2.connect("o1", i1.ports["o2"], allow_width_mismatch=True)
+    with pytest.warns(UserWarning):
+        netlist = c.get_netlist()
+    assert list(netlist["nets"]) == [{"p1": "i1,o2", "p2": "i2,o1"}]
+    width_mismatch = netlist["warnings"]["optical"]["width_mismatch"]
+    assert list(width_mismatch[0]["ports"]) == ["i1,o2", "i2,o1"]
+
+
+def test_get_netlist_orientation_mismatch_at_same_xy() -> None:
+    """Ports that touch but face the same direction are flagged."""
+    c = gf.Component()
+    i1 = c.add_ref(gf.components.straight(length=10), "i1")
+    i2 = c.add_ref(gf.components.straight(length=10), "i2")
+    i2.rotate(180)
+    i2.dmovex(10)
+    assert i2.ports["o1"].center == i1.ports["o2"].center
+    assert i2.ports["o1"].orientation == i1.ports["o2"].orientation
+    with pytest.warns(UserWarning):
+        netlist = c.get_netlist()
+    assert {"p1": "i1,o2", "p2": "i2,o1"} in netlist["nets"]
+    assert "orientation_mismatch" in netlist["warnings"]["optical"]
+
+
 if __name__ == "__main__":
     test_get_netlist_rotated()
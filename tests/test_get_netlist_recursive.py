@@ -3,8 +3,16 @@
 We use the `get_missing_models` function in `sax` to extract that it is representing our netlist component correctly.
 """
 
+from typing import Any
+
+from kfactory import DKCell
+
 import gdsfactory as gf
-from gdsfactory.get_netlist import get_netlist_recursive
+from gdsfactory.get_netlist import (
+    get_instance_name_from_alias,
+    get_netlist,
+    get_netlist_recursive,
+)
 
 
 def test_no_effect_on_original_components() -> None:
@@ -43,3 +51,41 @@ def test_n_netlists() -> None:
     assert len(netlists) == 2
     assert "hcomponent_top" in netlists
     assert "hcomponent_l2" in netlists
+
+
+def test_netlist_cache() -> None:
+    c = hcomponent_top()
+    cache: dict[tuple[str, ...], dict[str, Any]] = {}
+    calls: list[str] = []
+
+    def get_netlist_func(component: DKCell, **kwargs: Any) -> dict[str, Any]:
+        calls.append(component.name)
+        return get_netlist(component, **kwargs)
+
+    netlists = get_netlist_recursive(c, get_netlist_func=get_netlist_func, cache=cache)
+    assert len(cache) == 3
+    assert sorted(calls) == ["hcomponent_l2", "hcomponent_top"]
+
+    cached = get_netlist_recursive(c, get_netlist_func=get_netlist_func, cache=cache)
+    assert len(calls) == 2, "cached netlists are not extracted again"
+    assert cached == netlists
+    assert get_netlist_recursive(c) == netlists
+
+    cached["hcomponent_top"]["instances"].clear()
+    cached = get_netlist_recursive(c, get_netlist_func=get_netlist_func, cache=cache)
+    assert cached == netlists, "cached netlists are returned as copies"
+
+
+def test_netlist_cache_key() -> None:
+    c = hcomponent_top()
+    cache: dict[tuple[str, ...], dict[str, Any]] = {}
+    netlists = get_netlist_recursive(c, cache=cache)
+
+    def get_instance_name(ref: Any) -> str:
+        return f"renamed_{get_instance_name_from_alias(ref)}"
+
+    renamed = get_netlist_recursive(c, get_instance_name=get_instance_name, cache=cache)
+    assert len(cache) == 6
+    assert renamed != netlists
+    assert "renamed_hcomponent_l2_0_0" in renamed["hcomponent_top"]["instances"]
+    assert "renamed_hcomponent_l2_0_0" not in netlists["hcomponent_top"]["instances"]
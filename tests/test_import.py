@@ -0,0 +1,87 @@
+"""Import-time regression tests."""
+
+import subprocess
+import sys
+
+import gdsfactory as gf
+
+# gdsfactory's own import time as a fraction of kfactory's import time, which
+# scales both with the speed of the machine. Lazy imports keep it near 0.25,
+# importing all subpackages eagerly takes about 1.3.
+IMPORT_TIME_RATIO = 0.75
+# heavy or optional modules that `import gdsfactory` must not import
+LAZY_MODULES = (
+    "gdsfactory.components",
+    "gdsfactory.containers",
+    "gdsfactory.export",
+    "gdsfactory.read",
+    "gdsfactory.routing",
+    "graphviz",
+    "matplotlib",
+    "networkx",
+    "scipy",
+    "shapely",
+    "trimesh",
+)
+
+
+def get_imported_modules(module: str = "gdsfactory") -> set[str]:
+    """Returns the modules that `import module` adds on top of `import kfactory`.
+
+    Runs in a fresh interpreter, so modules imported by other tests do not count.
+    kfactory is imported first because gdsfactory cannot control its imports.
+    """
+    code = (
+        "import sys\n"
+        "import kfactory\n"
+        "before = set(sys.modules)\n"
+        f"import {module}\n"
+        "print('\\n'.join(set(sys.modules) - before))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return set(result.stdout.split())
+
+
+def get_import_times(module: str = "gdsfactory") -> dict[str, int]:
+    """Returns the cumulative import time in us of each module from `python -X importtime`."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times: dict[str, int] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_time() -> None:
+    times = get_import_times()
+    kfactory_time = times["kfactory"]
+    import_time = times["gdsfactory"] - kfactory_time
+    assert import_time < IMPORT_TIME_RATIO * kfactory_time, (
+        f"import gdsfactory took {import_time * 1e-6:.2f}s on top of kfactory, "
+        f"more than {IMPORT_TIME_RATIO} x {kfactory_time * 1e-6:.2f}s for kfactory"
+    )
+
+
+def test_lazy_imports() -> None:
+    modules = get_imported_modules()
+    lazy_modules = [
+        module
+        for module in LAZY_MODULES
+        if any(name == module or name.startswith(f"{module}.") for name in modules)
+    ]
+    assert not lazy_modules, f"{lazy_modules} imported by `import gdsfactory`"
+
+
+def test_lazy_attributes() -> None:
+    assert gf.c is gf.components
+    assert gf.import_gds is gf.read.import_gds
+    assert "routing" in dir(gf)
@@ -46,6 +46,31 @@ def test_pack_with_settings() -> None:
     assert components_packed_list[0]
 
 
+def test_pack_skyline() -> None:
+    """Skyline packer places every component without overlaps."""
+    rng = np.random.default_rng(0)
+    component_list = [
+        gf.components.rectangle(size=tuple(size), port_type=None)
+        for size in rng.integers(1, 20, size=(50, 2))
+    ]
+    components_packed_list = gf.pack(
+        component_list, spacing=1, packer="skyline", time_budget=1
+    )
+    assert len(components_packed_list) == 1
+
+    boxes = [inst.dbbox() for inst in components_packed_list[0].insts]
+    assert len(boxes) == 50
+    for i, box in enumerate(boxes):
+        for other in boxes[i + 1 :]:
+            assert not box.overlaps(other)
+
+    components_packed_list = gf.pack(
+        component_list, spacing=1, max_size=(60, 60), packer="skyline"
+    )
+    assert len(components_packed_list) > 1
+    assert sum(len(c.insts) for c in components_packed_list) == 50
+
+
 if __name__ == "__main__":
     test_pack()
     test_pack_with_settings()
@@ -12,7 +12,7 @@ import gdsfactory as gf
 from gdsfactory.component import Component
 from gdsfactory.difftest import difftest
 from gdsfactory.generic_tech import LAYER
-from gdsfactory.path import Path, _parabolic_transition
+from gdsfactory.path import Path, _extrude, _parabolic_transition, _to_dpolygon
 
 
 def test_path_zero_length() -> None:
@@ -451,6 +451,25 @@ def test_path_smooth() -> None:
     assert np.isclose(c.area((1, 0)), 3404.6317885)
 
 
+@pytest.mark.parametrize("has_from_bytes", [True, False])
+def test_extrude_to_dpolygon(
+    has_from_bytes: bool, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Extruded polygons match DPolygon built from DPoints, also when self-intersecting."""
+    monkeypatch.setattr(gf.path, "_HAS_DPOLYGON_FROM_BYTES", has_from_bytes)
+    p = gf.path.euler(radius=1, angle=180) + gf.path.straight(length=5)
+    p += gf.path.arc(radius=0.5, angle=270)
+    rng = np.random.default_rng(0)
+    polygons = [rng.random((20, 2)), rng.integers(0, 3, (20, 2)).astype(float)]
+    for cross_section in ("strip", "pn", "rib_heater_doped_via_stack"):
+        extrusion = _extrude(p, gf.get_cross_section(cross_section), simplify=None)
+        polygons += [points for points, _ in extrusion.polygons]
+
+    for points in polygons:
+        expected = kdb.DPolygon([kdb.DPoint(x, y) for x, y in points.tolist()])
+        assert _to_dpolygon(points) == expected
+
+
 def test_path_angle() -> None:
     p = gf.path.euler(
         radius=5,
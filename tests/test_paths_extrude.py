@@ -162,6 +162,81 @@ def test_extrude_component_along_path() -> None:
     assert c
 
 
+def test_along_path_array() -> None:
+    via = gf.c.rectangle(size=(1, 1), centered=True)
+    p = gf.path.straight(length=100, npoints=20)
+    p += gf.path.arc(10)
+    c = gf.path.along_path(p, component=via, spacing=5, padding=2)
+
+    straight_refs = [ref for ref in c.insts if ref.instance.is_regular_array()]
+    assert len(straight_refs) == 1
+    assert straight_refs[0].instance.na == 20
+    assert straight_refs[0].instance.a == gf.kdb.Vector(5000, 0)
+
+    n_copies = sum(ref.instance.size() for ref in c.insts)
+    assert n_copies == (p.length() - 4) // 5 + 1
+    assert round(c.area(layer=(1, 0))) == n_copies
+
+
+def test_extrude_mixed_sections() -> None:
+    """Plain sections share one tangent frame, sections with insets or functions do not."""
+    p = gf.path.euler(radius=10, npoints=200)
+    s0 = gf.Section(width=0.5, offset=0, layer="WG", port_names=("o1", "o2"))
+    s1 = gf.Section(width=1, offset=2, layer="M1")
+    s2 = gf.Section(width=0.5, offset=-2, layer="SLAB90", insets=(1, 2))
+    s3 = gf.Section(width=0.5, offset=0, layer="M2", offset_function=lambda t: 3 * t)
+    c = gf.path.extrude(p, cross_section=gf.CrossSection(sections=(s0, s1, s2, s3)))
+
+    for section in (s0, s1):
+        points = np.concatenate(
+            [
+                p.centerpoint_offset_curve(
+                    p.points,
+                    offset_distance=section.offset + section.width / 2,
+                    start_angle=p.start_angle,
+                    end_angle=p.end_angle,
+                ),
+                p.centerpoint_offset_curve(
+                    p.points,
+                    offset_distance=section.offset - section.width / 2,
+                    start_angle=p.start_angle,
+                    end_angle=p.end_angle,
+                )[::-1],
+            ]
+        )
+        expected = gf.Component()
+        expected.add_polygon(points, layer=section.layer)
+        assert c.area(section.layer) == expected.area(section.layer)
+
+    assert c.area("SLAB90") > 0
+    assert c.area("M2") > 0
+
+
+def test_extrude_cache() -> None:
+    gf.path.extrude_cache.clear()
+    p = gf.path.euler(radius=10)
+    c1 = gf.path.extrude(p, cross_section="pn")
+    c2 = gf.path.extrude(p, cross_section="pn")
+    info = gf.path.extrude_cache.info()
+    assert info.hits == 1 and info.misses == 1 and info.currsize == 1
+    assert c1 is not c2
+    assert c1.area("WG") == c2.area("WG")
+    for port1, port2 in zip(c1.ports, c2.ports, strict=True):
+        assert port1.name == port2.name
+        assert port1.trans == port2.trans
+        assert port1.width == port2.width
+
+    s = gf.Section(width=1, layer="WG", width_function=lambda t: 1 + t)
+    gf.path.extrude(p, cross_section=gf.CrossSection(sections=(s,)))
+    info = gf.path.extrude_cache.info()
+    assert info.hits == 1 and info.misses == 1 and info.currsize == 1
+
+    gf.path.extrude_cache.clear(maxsize=0)
+    gf.path.extrude(p, cross_section="pn")
+    assert gf.path.extrude_cache.info().currsize == 0
+    gf.path.extrude_cache.clear(maxsize=gf.CONF.extrude_cache_size)
+
+
 def test_extrude_cross_section_list_of_sections() -> None:
     s = gf.Section(width=0.5, offset=0.5, layer="WG")
     xs = gf.CrossSection(sections=(s,))
@@ -14,6 +14,17 @@ def test_get_cross_section() -> None:
     assert xs.sections[0].width == 1
 
 
+def test_get_cross_section_interned() -> None:
+    xs = gf.get_cross_section("strip", width=1)
+    assert xs is gf.get_cross_section("strip", width=1)
+    assert xs is not gf.get_cross_section("strip", width=2)
+    assert gf.get_cross_section("strip", bbox_layers=["WG"]).bbox_layers == ["WG"]
+
+    xs2 = xs.model_copy(update={"radius": 20})
+    assert xs.hash != xs2.hash
+    assert xs2.hash == xs.copy(radius=20).hash
+
+
 def test_get_layer() -> None:
     assert gf.get_layer(1) == LAYER.WG
     assert gf.get_layer((1, 0)) == LAYER.WG
@@ -35,3 +46,42 @@ def test_container_cell_conflict_raises_error() -> None:
 
     with pytest.raises(ValueError, match=".* overlapping cell names .*add_pads_top.*"):
         pdk.get_component("add_pads_top")
+
+
+def test_cell_registry() -> None:
+    pdk = gf.Pdk(
+        name="test_registry",
+        layers=LAYER,
+        cells={"straight": gf.components.straight},
+        containers={"add_pads_top": gf.containers.add_pads_top},
+    )
+    registry = pdk.get_cell_registry()
+    assert registry is pdk.get_cell_registry()
+    assert list(registry) == ["add_pads_top", "straight"]
+    assert registry["add_pads_top"] is gf.containers.add_pads_top
+
+    pdk.register_cells(straight_heater=gf.components.straight_heater_metal)
+    assert pdk.get_cell_registry() is not registry
+    assert pdk.get_cell("straight_heater") is gf.components.straight_heater_metal
+    assert pdk.get_cell_registry().suggest("straigth") == [
+        "straight",
+        "straight_heater",
+    ]
+
+    pdk.register_cells(
+        coupler_ring=gf.components.coupler_ring,
+        ring_single=gf.components.ring_single,
+    )
+    registry = pdk.get_cell_registry()
+    assert registry.suggest("ring_sin") == ["ring_single"]
+    assert registry.suggest("rin_single") == ["coupler_ring", "ring_single"]
+    assert registry.suggest("coupler_rin") == ["coupler_ring"]
+    pdk.remove_cell("coupler_ring")
+    pdk.remove_cell("ring_single")
+
+    pdk.cells["bend"] = gf.components.bend_euler
+    assert "bend" in pdk.get_cell_registry()
+
+    pdk.remove_cell("straight_heater")
+    with pytest.raises(ValueError, match="Did you mean \\['straight'\\]"):
+        pdk.get_component("straight_heater")
@@ -342,5 +342,122 @@ def test_watch() -> None:
         watch(path=tmp_dir, pre_run=True, logger=mock_logger, run_embed=False)
 
 
+def test_get_component_incremental(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(gf.watch.kf, "show", lambda *args, **kwargs: None)
+    watcher = FileWatcher(path=str(tmp_path), logger=MagicMock(spec=logging.Logger))
+    watcher._gds_dirpath = tmp_path / "gds"
+
+    py_path = tmp_path / "cells.py"
+    py_content = """
+import gdsfactory as gf
+from gdsfactory.component import Component
+
+@gf.cell
+def watched_pad(size: float = 10) -> Component:
+    return gf.components.rectangle(size=(size, {pad_width}))
+
+def watched_top_pads() -> Component:
+    c = Component()
+    c << watched_pad()
+    return c
+
+def watched_top_straight() -> Component:
+    return gf.components.straight(length=12.5)
+"""
+    py_path.write_text(py_content.format(pad_width=10))
+    watcher.get_component(py_path)
+    assert watcher.cell_dependencies["watched_top_pads"] >= {"watched_pad_S10"}
+    assert set(watcher.build_times) == {
+        "watched_pad",
+        "watched_top_pads",
+        "watched_top_straight",
+    }
+
+    watcher.build_times.clear()
+    py_path.write_text(py_content.format(pad_width=20) + "\n# comment")
+    watcher.get_component(py_path)
+    assert set(watcher.build_times) == {"watched_pad", "watched_top_pads"}
+    c = watcher.cell_factories["watched_top_pads"]()
+    assert c.area("WG") == 200
+
+    watcher.build_times.clear()
+    py_path.write_text(py_content.format(pad_width=20))
+    watcher.get_component(py_path)
+    assert not watcher.build_times
+
+
+def test_invalidate_scoped_to_file(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(gf.watch.kf, "show", lambda *args, **kwargs: None)
+    watcher = FileWatcher(path=str(tmp_path), logger=MagicMock(spec=logging.Logger))
+    watcher._gds_dirpath = tmp_path / "gds"
+
+    a_path = tmp_path / "a.py"
+    a_content = """
+import gdsfactory as gf
+from gdsfactory.component import Component
+
+@gf.cell
+def watched_shared_pad(size: float = 11) -> Component:
+    return gf.components.rectangle(size=(size, {pad_width}))
+
+def watched_a_top() -> Component:
+    c = Component()
+    c << watched_shared_pad()
+    return c
+"""
+    b_path = tmp_path / "b.py"
+    b_path.write_text("""
+import gdsfactory as gf
+from gdsfactory.component import Component
+
+@gf.cell
+def watched_shared_pad(size: float = 5) -> Component:
+    return gf.components.circle(radius=size)
+
+def watched_b_top() -> Component:
+    c = Component()
+    c << watched_shared_pad()
+    return c
+""")
+    a_path.write_text(a_content.format(pad_width=10))
+    watcher.get_component(a_path)
+    watcher.get_component(b_path)
+    b_top = watcher.cell_factories["watched_b_top"]()
+    b_pad_name = b_top.insts[0].cell.name
+
+    watcher.build_times.clear()
+    a_path.write_text(a_content.format(pad_width=20))
+    watcher.get_component(a_path)
+    assert "watched_a_top" in watcher.build_times
+    assert "watched_b_top" not in watcher.build_times
+    assert not b_top.destroyed()
+    assert gf.kcl.layout_cell(b_pad_name) is not None
+    assert watcher.cell_factories["watched_a_top"]().area("WG") == 220
+
+
+def test_debounce(monkeypatch: pytest.MonkeyPatch) -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        watcher = FileWatcher(path=tmp_dir, debounce=0.25)
+        calls: list[str] = []
+        monkeypatch.setattr(watcher, "get_component", calls.append)
+
+        watcher.schedule("cells.py")
+        first_event = watcher.pending["cells.py"]
+        watcher.schedule("cells.py")
+        assert watcher.pending["cells.py"] >= first_event
+
+        watcher.pending = {"cells.py": 10.0, "top.pic.yml": 10.25}
+        assert watcher.process_pending(now=10.125) == []
+        assert not calls
+        assert watcher.process_pending(now=10.25) == ["cells.py"]
+        assert watcher.process_pending(now=10.5) == ["top.pic.yml"]
+        assert calls == ["cells.py", "top.pic.yml"]
+        assert not watcher.pending
+
+
 if __name__ == "__main__":
     test_on_moved()